@@ -1,12 +1,20 @@
-from fastapi import FastAPI, Query, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 import re
+import hmac
+import json
+import asyncio
 from datetime import date as _date
 import os
 
 from app.hybrid_search import HybridSearchEngine, clean_query, today_str
-from app.kg_client import KGClient
+from app.kg_client import AsyncKGClient
+from app.query_metrics import metrics
+from app.pagination import AMENDMENT_PAGE_MAX, AMENDMENT_STREAM_CHUNK, decode_cursor
+from app.temporal_store import TemporalStatuteStore
 
 from app.case_law_engine import CaseLawSearchEngine
 from app.case_law_api import router as case_law_router
@@ -18,15 +26,68 @@ app.include_router(case_law_router)
 
 engine = HybridSearchEngine()
 case_law_engine = CaseLawSearchEngine()
-kg: Optional[KGClient] = None
+kg: Optional[AsyncKGClient] = None
+store: Optional[TemporalStatuteStore] = None
+
+# /statute, /timeline and /amendments are answered from the in-memory store;
+# Neo4j is only queried for acts/sections/versions the store does not know
+TEMPORAL_STORE_ENABLED = os.getenv("TEMPORAL_STORE_ENABLED", "true").lower() == "true"
+NEO4J_FALLBACK = os.getenv("NEO4J_FALLBACK", "true").lower() == "true"
+
+# /admin/* needs this value in X-Admin-Token; unset, only local callers are allowed
+ADMIN_TOKEN = os.getenv("LAWSTATKG_ADMIN_TOKEN", "")
 
 DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 
+# serializes temporal store rebuilds triggered from /admin
+_store_reload_lock = asyncio.Lock()
+
 
 def clean_param(x: str) -> str:
     return (x or "").replace("\n", " ").replace("\r", " ").strip()
 
 
+def parse_date_param(date: str) -> str:
+    date_param = clean_param(date).lower()
+
+    if date_param == "today":
+        return _date.today().isoformat()
+    if not DATE_RE.match(date_param):
+        raise HTTPException(status_code=400, detail="Invalid date. Use 'today' or YYYY-MM-DD")
+    return date_param
+
+
+def require_admin(request: Request, x_admin_token: Optional[str] = Header(None)):
+    if ADMIN_TOKEN:
+        if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+            raise HTTPException(status_code=403, detail="Admin token required")
+    elif not request.client or request.client.host not in ("127.0.0.1", "::1", "localhost"):
+        raise HTTPException(status_code=403, detail="Admin routes are local-only unless LAWSTATKG_ADMIN_TOKEN is set")
+
+
+def require_source():
+    if not (store and store.ready) and not kg:
+        raise HTTPException(status_code=500, detail="KGClient not initialized")
+
+
+def load_temporal_store() -> TemporalStatuteStore:
+    s = TemporalStatuteStore()
+    s.load()
+    return s
+
+
+BATCH_MAX = int(os.getenv("TIMELINE_BATCH_MAX", "500"))
+
+
+class TimelineBatchRequest(BaseModel):
+    act_id: str = Field(..., min_length=1)
+    section_nos: List[str] = Field(..., min_length=1, max_length=BATCH_MAX)
+
+
+class ChangeBatchRequest(BaseModel):
+    after_version_ids: List[str] = Field(..., min_length=1, max_length=BATCH_MAX)
+
+
 class SearchRequest(BaseModel):
     query: str = Field(..., min_length=1)
     jurisdiction: Optional[str] = None
@@ -39,34 +100,52 @@ class SearchRequest(BaseModel):
 
 
 @app.on_event("startup")
-def startup():
+async def startup_kg():
     global kg
-    kg = KGClient()
+    if NEO4J_FALLBACK or not TEMPORAL_STORE_ENABLED:
+        kg = AsyncKGClient()
 
+
+@app.on_event("startup")
+def startup():
+    global store
     allow_build = os.getenv("ALLOW_BUILD_ON_STARTUP", "false").lower() == "true"
     engine.load(allow_build=allow_build)
 
     # load separate case-law artifacts
     case_law_engine.load()
 
+    if TEMPORAL_STORE_ENABLED:
+        store = load_temporal_store()
+
 
 @app.on_event("shutdown")
-def shutdown():
+async def shutdown():
     global kg
     if kg:
-        kg.close()
+        await kg.close()
 
 
 @app.get("/health")
-def health():
+async def health():
     return {
         "status": "ok",
-        "neo4j": kg.ping() if kg else False,
+        "neo4j": await kg.ping() if kg else False,
+        "statute_cache": kg.statute_cache.stats() if kg else None,
+        "temporal_store": store.stats() if store else None,
         "search_loaded": engine.ready,
         "case_law_search_loaded": case_law_engine.ready,
     }
 
 
+@app.get("/admin/query-metrics", dependencies=[Depends(require_admin)])
+async def query_metrics(reset: bool = Query(False)):
+    snapshot = metrics.snapshot()
+    if reset:
+        metrics.reset()
+    return snapshot
+
+
 @app.post("/Lawsearch")
 def law_search(req: SearchRequest):
     q = clean_query(req.query)
@@ -86,55 +165,178 @@ def law_search(req: SearchRequest):
 
 
 @app.get("/statute/{act_id}")
-def statute(act_id: str, date: str = Query("today")):
-    if not kg:
-        raise HTTPException(status_code=500, detail="KGClient not initialized")
+async def statute(act_id: str, date: str = Query("today")):
+    require_source()
 
     act_id = clean_param(act_id)
-    date_param = clean_param(date).lower()
+    as_of = parse_date_param(date)
 
-    if date_param == "today":
-        as_of = _date.today().isoformat()
-    else:
-        if not DATE_RE.match(date_param):
-            raise HTTPException(status_code=400, detail="Invalid date. Use 'today' or YYYY-MM-DD")
-        as_of = date_param
+    if store and store.ready and (store.has_act(act_id) or not kg):
+        return store.get_statute_as_of(act_id=act_id, as_of_date=as_of)
+
+    return await kg.get_statute_as_of(act_id=act_id, as_of_date=as_of)
 
-    return kg.get_statute_as_of(act_id=act_id, as_of_date=as_of)
+
+@app.post("/admin/statute-cache/invalidate", dependencies=[Depends(require_admin)])
+async def invalidate_statute_cache(
+    act_id: Optional[List[str]] = Query(None),
+    reload: bool = Query(False),
+):
+    """
+    Drop cached statute intervals for the given acts (all acts when none is
+    given). reload=true also rebuilds the in-memory temporal store from disk,
+    once per call, so a bulk load should send all its act_ids together.
+    """
+    global store
+    require_source()
+
+    act_ids = [clean_param(a) for a in act_id or [] if clean_param(a)]
+    removed = 0
+    if kg:
+        if act_ids:
+            removed = sum(kg.statute_cache.invalidate(a) for a in act_ids)
+        else:
+            removed = kg.statute_cache.invalidate(None)
+
+    reloaded = False
+    if reload and TEMPORAL_STORE_ENABLED:
+        # amendments.json may have changed too; rebuild off the event loop and swap
+        async with _store_reload_lock:
+            store = await run_in_threadpool(load_temporal_store)
+        reloaded = True
+
+    return {"invalidated": removed, "act_ids": act_ids, "store_reloaded": reloaded}
 
 
 @app.get("/timeline/{act_id}/{section_no}")
-def timeline(act_id: str, section_no: str):
-    if not kg:
-        raise HTTPException(status_code=500, detail="KGClient not initialized")
+async def timeline(act_id: str, section_no: str):
+    require_source()
 
     act_id = clean_param(act_id)
     section_no = clean_param(section_no)
 
-    return kg.get_section_timeline(act_id=act_id, section_no=section_no)
+    if store and store.ready:
+        data = store.get_section_timeline(act_id=act_id, section_no=section_no)
+        if "error" not in data or not kg:
+            return data
+
+    return await kg.get_section_timeline(act_id=act_id, section_no=section_no)
 
 
 @app.get("/timeline/change/{after_version_id}")
-def timeline_change(after_version_id: str):
-    if not kg:
-        raise HTTPException(status_code=500, detail="KGClient not initialized")
+async def timeline_change(after_version_id: str):
+    require_source()
 
     after_version_id = clean_param(after_version_id)
-    return kg.get_change_detail(after_version_id=after_version_id)
 
+    if store and store.ready:
+        data = store.get_change_detail(after_version_id=after_version_id)
+        if "error" not in data or not kg:
+            return data
 
-@app.get("/amendments")
-def amendments(date: str = Query("today")):
-    if not kg:
-        raise HTTPException(status_code=500, detail="KGClient not initialized")
+    return await kg.get_change_detail(after_version_id=after_version_id)
 
-    date_param = clean_param(date).lower()
 
-    if date_param == "today":
-        as_of = _date.today().isoformat()
-    else:
-        if not DATE_RE.match(date_param):
-            raise HTTPException(status_code=400, detail="Invalid date. Use 'today' or YYYY-MM-DD")
-        as_of = date_param
+@app.post("/timeline/batch")
+async def timeline_batch(req: TimelineBatchRequest):
+    require_source()
+
+    act_id = clean_param(req.act_id)
+    section_nos = [clean_param(n) for n in req.section_nos]
+
+    if store and store.ready:
+        data = store.get_section_timelines(act_id=act_id, section_nos=section_nos)
+        missing = [n for n, t in data["timelines"].items() if "error" in t]
+        if not missing or not kg:
+            return data
+
+        # one Neo4j round trip for whatever the store does not know
+        fallback = await kg.get_section_timelines(act_id=act_id, section_nos=missing)
+        data["timelines"].update(fallback.get("timelines", {}))
+        return data
+
+    return await kg.get_section_timelines(act_id=act_id, section_nos=section_nos)
+
+
+@app.post("/timeline/change/batch")
+async def timeline_change_batch(req: ChangeBatchRequest):
+    require_source()
+
+    after_version_ids = [clean_param(v) for v in req.after_version_ids]
+
+    if store and store.ready:
+        data = store.get_change_details(after_version_ids=after_version_ids)
+        missing = [v for v, c in data["changes"].items() if "error" in c]
+        if not missing or not kg:
+            return data
+
+        fallback = await kg.get_change_details(after_version_ids=missing)
+        data["changes"].update(fallback.get("changes", {}))
+        return data
+
+    return await kg.get_change_details(after_version_ids=after_version_ids)
+
+
+async def _amendments_page(as_of: str, limit: Optional[int], cursor, **filters):
+    if store and store.ready:
+        return store.get_amendments_page(as_of_date=as_of, limit=limit, cursor=cursor, **filters)
+    return await kg.get_amendments_page(as_of_date=as_of, limit=limit, cursor=cursor, **filters)
+
+
+async def _stream_amendments(as_of: str, limit: Optional[int], cursor, **filters):
+    sent = 0
+    while True:
+        chunk = AMENDMENT_STREAM_CHUNK if not limit else min(AMENDMENT_STREAM_CHUNK, limit - sent)
+        page = await _amendments_page(as_of, chunk, cursor, **filters)
+        if "error" in page:
+            yield json.dumps(page, ensure_ascii=False) + "\n"
+            return
+
+        for am in page["amendments"]:
+            yield json.dumps(am, ensure_ascii=False) + "\n"
+        sent += page["count"]
+
+        if not page["next_cursor"] or (limit and sent >= limit):
+            return
+        cursor = decode_cursor(page["next_cursor"])
+
+
+@app.get("/amendments")
+async def amendments(
+    date: str = Query("today"),
+    limit: Optional[int] = Query(None, ge=1, le=AMENDMENT_PAGE_MAX),
+    cursor: Optional[str] = Query(None),
+    act_id: Optional[str] = Query(None),
+    jurisdiction: Optional[str] = Query(None),
+    date_from: Optional[str] = Query(None),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    full_list: bool = Query(False, alias="all", description="Legacy unpaginated list of every amendment up to date"),
+):
+    require_source()
+
+    as_of = parse_date_param(date)
+    filters = {
+        "act_id": clean_param(act_id) if act_id else None,
+        "jurisdiction": clean_param(jurisdiction) if jurisdiction else None,
+        "date_from": parse_date_param(date_from) if date_from else None,
+    }
 
-    return kg.get_amendments_by_date(as_of_date=as_of)
\ No newline at end of file
+    try:
+        cursor_key = decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if format == "ndjson":
+        return StreamingResponse(
+            _stream_amendments(as_of, limit, cursor_key, **filters),
+            media_type="application/x-ndjson",
+        )
+
+    # the old full-list response only on explicit opt-in; the full history
+    # is otherwise walked with next_cursor (or streamed as NDJSON)
+    if full_list and not limit and not cursor and not any(filters.values()):
+        if store and store.ready:
+            return store.get_amendments_by_date(as_of_date=as_of)
+        return await kg.get_amendments_by_date(as_of_date=as_of)
+
+    return await _amendments_page(as_of, limit or AMENDMENT_PAGE_MAX, cursor_key, **filters)
@@ -1,6 +1,9 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Query
-from app.case_pdf import pdf_to_text
-from app.case_law_pipeline import retrieve_case_law_from_case
+from app.case_pdf import CHUNKED_MAX_WORDS, pdf_to_text
+from app.case_law_pipeline import (
+    retrieve_case_law_from_case,
+    retrieve_case_law_chunked,
+)
 
 router = APIRouter()
 
@@ -8,15 +11,26 @@ router = APIRouter()
 @router.post("/case-law/retrieve")
 async def retrieve_case_law(
     file: UploadFile = File(...),
-    top_k: int = Query(5, ge=1, le=20)
+    top_k: int = Query(5, ge=1, le=20),
+    smart_pages: bool = Query(False),
+    mode: str = Query("truncate", pattern="^(truncate|chunked)$"),
+    aggregate: str = Query("max", pattern="^(max|mean)$")
 ):
     if file.content_type != "application/pdf":
         raise HTTPException(status_code=400, detail="Upload a PDF file")
 
     pdf_bytes = await file.read()
-    text = pdf_to_text(pdf_bytes)
 
     from app.api import case_law_engine
+
+    if mode == "chunked":
+        # passages tile the extracted text; extraction itself stays bounded
+        text = pdf_to_text(pdf_bytes, max_words=CHUNKED_MAX_WORDS, smart=smart_pages)
+        result = retrieve_case_law_chunked(case_law_engine, text, top_k=top_k, aggregate=aggregate)
+        result["extraction_capped"] = len(text.split()) >= CHUNKED_MAX_WORDS
+        return result
+
+    text = pdf_to_text(pdf_bytes, smart=smart_pages)
     return retrieve_case_law_from_case(case_law_engine, text, top_k=top_k)
 
 
@@ -9,6 +9,8 @@ import numpy as np
 from rank_bm25 import BM25Okapi
 from sentence_transformers import SentenceTransformer
 
+from app.doc_store import DocStore
+
 
 _TOKEN_RE = re.compile(r"[A-Za-z0-9']+")
 
@@ -47,12 +49,18 @@ class CaseLawSearchEngine:
         self.model = None
 
     def load(self):
-        with open(self.artifact_dir / "docs.json", "r", encoding="utf-8") as f:
-            self.docs = json.load(f)
+        # columnar store when present (case text read only for returned hits)
+        store_path = self.artifact_dir / "docs.cols"
+        if DocStore.exists(store_path):
+            self.docs = DocStore(store_path)
+            case_ids = self.docs.column("case_id").tolist()
+        else:
+            with open(self.artifact_dir / "docs.json", "r", encoding="utf-8") as f:
+                self.docs = json.load(f)
+            case_ids = [d.get("case_id") for d in self.docs]
 
-        self.doc_map = {
-            d["case_id"]: d for d in self.docs if d.get("case_id")
-        }
+        # case_id -> row
+        self.doc_map = {cid: i for i, cid in enumerate(case_ids) if cid}
 
         with open(self.artifact_dir / "bm25.pkl", "rb") as f:
             payload = pickle.load(f)
@@ -65,7 +73,14 @@ class CaseLawSearchEngine:
         self.ready = True
 
     def get_case_by_id(self, case_id: str) -> Optional[Dict[str, Any]]:
-        return self.doc_map.get(case_id)
+        i = self.doc_map.get(case_id)
+        return None if i is None else self.docs[i]
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Batch-encode texts into normalized embeddings (one model call)."""
+        if not texts:
+            return np.zeros((0, self.emb.shape[1]), dtype=np.float32)
+        return self.model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
 
     def search(
         self,
@@ -82,6 +97,54 @@ class CaseLawSearchEngine:
             raise RuntimeError("Case law engine not loaded")
 
         q = clean_query(query)
+        if not tokenize(q):
+            return []
+
+        q_emb = self.model.encode(q, convert_to_numpy=True, normalize_embeddings=True)
+        return self._search_encoded(
+            q, q_emb, top_k, bm25_candidates, alpha, beta, min_match_ratio, min_semantic_cosine
+        )
+
+    def search_many(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        bm25_candidates: int = 80,
+        alpha: float = 0.55,
+        beta: float = 0.45,
+        min_match_ratio: float = 0.50,
+        min_semantic_cosine: float = 0.30,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Same as search() for a list of queries, but all query embeddings are
+        computed in a single batched encode call.
+        """
+        if not self.ready:
+            raise RuntimeError("Case law engine not loaded")
+
+        cleaned = [clean_query(q) for q in queries]
+        live = [i for i, q in enumerate(cleaned) if tokenize(q)]
+        q_embs = self.encode([cleaned[i] for i in live])
+
+        out: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        for j, i in enumerate(live):
+            out[i] = self._search_encoded(
+                cleaned[i], q_embs[j], top_k, bm25_candidates, alpha, beta,
+                min_match_ratio, min_semantic_cosine
+            )
+        return out
+
+    def _search_encoded(
+        self,
+        q: str,
+        q_emb: np.ndarray,
+        top_k: int,
+        bm25_candidates: int,
+        alpha: float,
+        beta: float,
+        min_match_ratio: float,
+        min_semantic_cosine: float,
+    ) -> List[Dict[str, Any]]:
         q_tokens = tokenize(q)
         if not q_tokens:
             return []
@@ -106,7 +169,6 @@ class CaseLawSearchEngine:
 
         candidates = sorted(candidates, key=lambda i: float(bm25_scores[i]), reverse=True)[:bm25_candidates]
 
-        q_emb = self.model.encode(q, convert_to_numpy=True, normalize_embeddings=True)
         bm25_arr = np.array([float(bm25_scores[i]) for i in candidates], dtype=float)
         cosine = self.emb[candidates] @ q_emb
 
@@ -118,16 +180,17 @@ class CaseLawSearchEngine:
         sem01 = (cosine + 1.0) / 2.0
         final = alpha * bm25_norm + beta * sem01
 
-        out = []
-        for j, i in enumerate(candidates):
-            if cosine[j] < min_semantic_cosine:
-                continue
-            out.append({
-                "doc": self.docs[i],
+        # rank on the score arrays; only the returned rows are read from the doc store
+        rows = np.flatnonzero(cosine >= min_semantic_cosine)
+        rows = rows[np.argsort(-final[rows], kind="stable")][:top_k]
+
+        return [
+            {
+                "doc": self.docs[candidates[j]],
+                "doc_index": candidates[j],
                 "bm25": float(bm25_arr[j]),
                 "semantic_cosine": float(cosine[j]),
                 "score": float(final[j]),
-            })
-
-        out.sort(key=lambda x: x["score"], reverse=True)
-        return out[:top_k]
\ No newline at end of file
+            }
+            for j in rows
+        ]
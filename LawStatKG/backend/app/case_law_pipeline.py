@@ -1,7 +1,10 @@
+import os
 import re
 from collections import Counter, defaultdict
 from typing import Dict, Any, List
 
+import numpy as np
+
 from app.case_law_engine import tokenize, clean_query
 
 WORD_RE = re.compile(r"[A-Za-z][A-Za-z\-']{2,}")
@@ -34,6 +37,15 @@ TOPIC_KEYWORDS = {
     "decree_nisi": ["decree nisi", "nisi declaration", "nisi absolute", "make absolute", "decree absolute"],
 }
 
+# Chunked long-document mode: overlapping word windows tiling the whole
+# document. Up to MAX_PASSAGES windows (~13k words at the defaults) every
+# word is scored; past that the windows are spread evenly and the response
+# reports the coverage actually achieved
+PASSAGE_WORDS = int(os.getenv("CASE_LAW_PASSAGE_WORDS", "350"))
+PASSAGE_OVERLAP = int(os.getenv("CASE_LAW_PASSAGE_OVERLAP", "75"))
+MAX_PASSAGES = int(os.getenv("CASE_LAW_MAX_PASSAGES", "48"))
+MAX_CHUNK_QUERIES = int(os.getenv("CASE_LAW_MAX_CHUNK_QUERIES", "24"))
+
 # Strips procedural boilerplate noise from PDF text before keyword extraction
 _NOISE_RE = re.compile(
     r"(\[?Page\s*\d+\]?"              # [Page 1] or Page 1 (after bracket-strip)
@@ -124,8 +136,8 @@ def build_queries(case_text: str) -> List[str]:
     return out[:8]
 
 
-def support_score(case_text: str, doc: Dict[str, Any]) -> float:
-    blob = " ".join([
+def _doc_blob(doc: Dict[str, Any]) -> str:
+    return " ".join([
         doc.get("section_title") or "",
         doc.get("section_content") or "",
         doc.get("case_name") or "",
@@ -134,14 +146,42 @@ def support_score(case_text: str, doc: Dict[str, Any]) -> float:
         " ".join(doc.get("principle") or []),
         doc.get("topic") or "",
     ])
-    c = set(tokenize(case_text))
-    d = set(tokenize(blob))
+
+
+def _jaccard(c: set, d: set) -> float:
     if not c or not d:
         return 0.0
     intersection = len(c & d)
     return intersection / (len(c | d) + 1e-6)   # Jaccard: fair regardless of doc size
 
 
+def support_score(case_text: str, doc: Dict[str, Any]) -> float:
+    return _jaccard(set(tokenize(case_text)), set(tokenize(_doc_blob(doc))))
+
+
+def _format_hit(r: Dict[str, Any]) -> Dict[str, Any]:
+    d = r["doc"]
+    return {
+        "case_id": d.get("case_id"),
+        "case_name": d.get("case_name"),
+        "citation": d.get("citation"),
+        "topic": d.get("topic"),
+        "section_number": d.get("section_number"),
+        "section_title": d.get("section_title"),
+        "principle": d.get("principle"),
+        "held": d.get("held"),
+        "facts": d.get("facts"),
+        "relevant_laws": d.get("relevant_laws"),
+        "relevant_sections": d.get("relevant_sections"),
+        "court": d.get("court"),
+        "amending_law": d.get("amending_law"),
+        "confidence_score": round(r["final_score"], 3),
+        "support_score": round(r["support_score"], 3),
+        "query_hits": r["query_hits"],
+        "detail_url": f"/case-law/{d.get('case_id')}"
+    }
+
+
 def retrieve_case_law_from_case(engine, case_text: str, top_k: int = 5) -> Dict[str, Any]:
     case_text = normalize_text(case_text)
     queries = build_queries(case_text)
@@ -201,32 +241,198 @@ def retrieve_case_law_from_case(engine, case_text: str, top_k: int = 5) -> Dict[
 
     merged.sort(key=lambda x: x["final_score"], reverse=True)
 
+    out = [_format_hit(r) for r in merged[:top_k]]
+
+    return {
+        "queries_generated": queries,
+        "detected_topics": detected_topics,   # CHANGE: useful for debugging and evaluation
+        "results_count": len(out),
+        "relevant_case_laws": out
+    }
+
+
+def passage_starts(
+    n_words: int,
+    passage_words: int = PASSAGE_WORDS,
+    overlap: int = PASSAGE_OVERLAP,
+    max_passages: int = MAX_PASSAGES,
+) -> List[int]:
+    """
+    Word offsets of overlapping windows over an n_words text. When the text
+    needs more than max_passages windows, max_passages of them are spread
+    evenly from the first to the last, so the cap thins coverage instead of
+    cutting the document off after its opening pages.
+    """
+    if n_words <= 0:
+        return []
+
+    step = max(1, passage_words - overlap)
+    last = max(0, n_words - passage_words)
+    starts = list(range(0, last, step)) + [last]
+
+    if len(starts) > max_passages:
+        if max_passages <= 1:
+            starts = [0]
+        else:
+            starts = sorted({round(i * last / (max_passages - 1)) for i in range(max_passages)})
+    return starts
+
+
+def passage_coverage(n_words: int, starts: List[int], passage_words: int = PASSAGE_WORDS) -> float:
+    """Fraction of the text's words that fall inside at least one window."""
+    if n_words <= 0:
+        return 0.0
+    covered, end = 0, 0
+    for start in starts:
+        stop = min(n_words, start + passage_words)
+        covered += max(0, stop - max(start, end))
+        end = max(end, stop)
+    return covered / n_words
+
+
+def split_passages(
+    text: str,
+    passage_words: int = PASSAGE_WORDS,
+    overlap: int = PASSAGE_OVERLAP,
+    max_passages: int = MAX_PASSAGES,
+) -> List[str]:
+    """Overlapping word windows over the whole text (see passage_starts)."""
+    words = (text or "").split()
+    starts = passage_starts(len(words), passage_words, overlap, max_passages)
+    return [" ".join(words[start:start + passage_words]) for start in starts]
+
+
+def _interleave_queries(per_passage: List[List[str]], limit: int) -> List[str]:
+    # round-robin across passages so the whole document is represented
+    # even when the query cap is hit
+    seen = set()
+    out = []
+    depth = max((len(q) for q in per_passage), default=0)
+    for i in range(depth):
+        for queries in per_passage:
+            if i < len(queries) and queries[i] not in seen:
+                seen.add(queries[i])
+                out.append(queries[i])
+                if len(out) >= limit:
+                    return out
+    return out
+
+
+def retrieve_case_law_chunked(
+    engine,
+    case_text: str,
+    top_k: int = 5,
+    passage_words: int = PASSAGE_WORDS,
+    overlap: int = PASSAGE_OVERLAP,
+    max_passages: int = MAX_PASSAGES,
+    max_queries: int = MAX_CHUNK_QUERIES,
+    aggregate: str = "max",
+) -> Dict[str, Any]:
+    """
+    Long-document variant of retrieve_case_law_from_case.
+
+    The case text is split into overlapping passages; keywords, sections and
+    topics are extracted per passage, all passages and queries are encoded in
+    one batch each, and every candidate is scored against all passages at once
+    (max or mean cosine).
+    """
+    case_text = normalize_text(case_text)
+    words = case_text.split()
+    starts = passage_starts(len(words), passage_words, overlap, max_passages)
+    passages = [" ".join(words[start:start + passage_words]) for start in starts]
+    coverage = round(passage_coverage(len(words), starts, passage_words), 3)
+    if not passages:
+        return {
+            "queries_generated": [],
+            "detected_topics": [],
+            "passages_used": 0,
+            "coverage": coverage,
+            "results_count": 0,
+            "relevant_case_laws": []
+        }
+
+    queries = _interleave_queries([build_queries(p) for p in passages], max_queries)
+
+    detected_topics = []
+    for p in passages:
+        for t in detect_topics(p):
+            if t not in detected_topics:
+                detected_topics.append(t)
+
+    all_hits = engine.search_many(
+        queries,
+        top_k=15,
+        bm25_candidates=120,
+        alpha=0.55,
+        beta=0.45,
+        min_match_ratio=0.50,
+        min_semantic_cosine=0.35
+    )
+
+    bucket = defaultdict(lambda: {"best": None, "scores": [], "hits": 0})
+
+    for hit_list in all_hits:
+        for r in hit_list:
+            key = r["doc"]["case_id"]
+            bucket[key]["hits"] += 1
+            bucket[key]["scores"].append(r["score"])
+            if bucket[key]["best"] is None or r["score"] > bucket[key]["best"]["score"]:
+                bucket[key]["best"] = r
+
+    topic_set = {t.lower() for t in detected_topics}
+    entries = []
+    for v in bucket.values():
+        best = v["best"]
+        if not best:
+            continue
+        if topic_set:
+            doc_topic = (best["doc"].get("topic") or "").strip().lower()
+            if doc_topic not in topic_set:
+                continue
+        entries.append(v)
+
+    merged = []
+    if entries:
+        # (candidates x passages) cosine matrix in one matmul
+        passage_emb = engine.encode(passages)
+        cand_idx = np.array([v["best"]["doc_index"] for v in entries])
+        sims = engine.emb[cand_idx] @ passage_emb.T
+        passage_cos = sims.mean(axis=1) if aggregate == "mean" else sims.max(axis=1)
+        passage_sem01 = (passage_cos + 1.0) / 2.0
+
+        best_q = np.array([max(v["scores"]) for v in entries])
+        hits = np.array([min(v["hits"], len(passages)) for v in entries])
+
+        passage_tokens = [set(tokenize(p)) for p in passages]
+        doc_tokens = [set(tokenize(_doc_blob(v["best"]["doc"]))) for v in entries]
+        sup = np.array([max(_jaccard(pt, dt) for pt in passage_tokens) for dt in doc_tokens])
+
+        final = 0.5 * best_q + 0.5 * passage_sem01 + 0.10 * (hits - 1) + 0.45 * sup
+
+        for j, v in enumerate(entries):
+            best = v["best"]
+            best["final_score"] = float(final[j])
+            best["support_score"] = float(sup[j])
+            best["passage_cosine"] = float(passage_cos[j])
+            best["query_hits"] = int(v["hits"])
+            merged.append(best)
+
+    merged = [m for m in merged if m["final_score"] > 0.45]
+    merged.sort(key=lambda x: x["final_score"], reverse=True)
+
     out = []
     for r in merged[:top_k]:
-        d = r["doc"]
-        out.append({
-            "case_id": d.get("case_id"),
-            "case_name": d.get("case_name"),
-            "citation": d.get("citation"),
-            "topic": d.get("topic"),
-            "section_number": d.get("section_number"),
-            "section_title": d.get("section_title"),
-            "principle": d.get("principle"),
-            "held": d.get("held"),
-            "facts": d.get("facts"),
-            "relevant_laws": d.get("relevant_laws"),
-            "relevant_sections": d.get("relevant_sections"),
-            "court": d.get("court"),
-            "amending_law": d.get("amending_law"),
-            "confidence_score": round(r["final_score"], 3),
-            "support_score": round(r["support_score"], 3),
-            "query_hits": r["query_hits"],
-            "detail_url": f"/case-law/{d.get('case_id')}"
-        })
+        item = _format_hit(r)
+        item["passage_cosine"] = round(r["passage_cosine"], 3)
+        out.append(item)
 
     return {
         "queries_generated": queries,
-        "detected_topics": detected_topics,   # CHANGE: useful for debugging and evaluation
+        "detected_topics": detected_topics,
+        "passages_used": len(passages),
+        # share of the extracted words inside a scored passage (< 1.0 when sampled)
+        "coverage": coverage,
+        "aggregate": aggregate,
         "results_count": len(out),
         "relevant_case_laws": out
-    }
\ No newline at end of file
+    }
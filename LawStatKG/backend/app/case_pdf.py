@@ -1,13 +1,76 @@
+import os
+import re
+from typing import Iterator, List, Optional
+
 import fitz  # PyMuPDF
 
 
-def pdf_to_text(pdf_bytes: bytes) -> str:
+MAX_WORDS = int(os.getenv("CASE_PDF_MAX_WORDS", "2000"))
+# chunked retrieval reads far more of the document, but still a bounded amount
+CHUNKED_MAX_WORDS = int(os.getenv("CASE_PDF_CHUNKED_MAX_WORDS", "20000"))
+MAX_CHARS = int(os.getenv("CASE_PDF_MAX_CHARS", "0")) or None
+
+# smart page selection: always read the first pages (caption, parties, plaint),
+# then only later pages that look like they carry the prayer or the issues
+SMART_FIRST_PAGES = int(os.getenv("CASE_PDF_SMART_FIRST_PAGES", "3"))
+SMART_MAX_SCAN_PAGES = int(os.getenv("CASE_PDF_SMART_MAX_SCAN_PAGES", "60"))
+
+PAGE_KEYWORDS_RE = re.compile(
+    r"\b(pray|prays|prayer|wherefore|relief|issues?|points?\s+for\s+determination"
+    r"|questions?\s+of\s+law|held|decree)\b",
+    re.IGNORECASE
+)
+
+
+def _iter_page_texts(doc, smart: bool, first_pages: int, max_scan_pages: int) -> Iterator[str]:
+    for i, page in enumerate(doc):
+        if not smart:
+            yield page.get_text("text")
+            continue
+
+        if i >= max_scan_pages:
+            return
+
+        text = page.get_text("text")
+        if i < first_pages or PAGE_KEYWORDS_RE.search(text):
+            yield text
+
+
+def pdf_to_text(
+    pdf_bytes: bytes,
+    max_words: Optional[int] = MAX_WORDS,
+    max_chars: Optional[int] = MAX_CHARS,
+    smart: bool = False,
+    first_pages: int = SMART_FIRST_PAGES,
+    max_scan_pages: int = SMART_MAX_SCAN_PAGES,
+) -> str:
+    """
+    Extract at most `max_words` words (and `max_chars` characters, if set;
+    max_words=None reads the whole document). Pages are parsed lazily and
+    extraction stops as soon as the budget is reached, so long judgments
+    cost no more than short ones.
+
+    smart=True reads the first `first_pages` pages plus any later page that
+    mentions the prayer / issues, scanning at most `max_scan_pages` pages.
+    """
+    words: List[str] = []
+    chars = 0
+    full = False
+
     doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    parts = []
-    for page in doc:
-        parts.append(page.get_text("text"))
-    doc.close()
-    text = "\n".join(parts)
-
-    words = text.split()
-    return " ".join(words[:2000])
\ No newline at end of file
+    try:
+        for text in _iter_page_texts(doc, smart, first_pages, max_scan_pages):
+            for w in text.split():
+                cost = len(w) + (1 if words else 0)
+                if (max_words is not None and len(words) >= max_words) or (max_chars and chars + cost > max_chars):
+                    full = True
+                    break
+                words.append(w)
+                chars += cost
+
+            if full or (max_words is not None and len(words) >= max_words):
+                break
+    finally:
+        doc.close()
+
+    return " ".join(words)
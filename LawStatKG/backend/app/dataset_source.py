@@ -0,0 +1,203 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# title given to the CaseLawSource node by scripts/loadCaseLaw.py
+CASE_LAW_SOURCE_TITLE = "Civil Procedure Code Matrimonial Actions Case Law Corpus"
+
+
+def default_data_path(name: str) -> Path:
+    # repo layout keeps data/ next to backend/, the container copies it inside
+    for p in (BACKEND_DIR.parent / "data" / name, BACKEND_DIR / "data" / name):
+        if p.exists():
+            return p
+    return BACKEND_DIR.parent / "data" / name
+
+
+def _iter_json_array(f, chunk_chars: int = 1 << 16) -> Iterator[Any]:
+    """
+    Items of a top-level JSON array, decoded one at a time from a text
+    file, so only the current item and one read chunk are held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    eof = False
+
+    def read_more():
+        nonlocal buf, eof
+        chunk = f.read(chunk_chars)
+        if chunk:
+            buf += chunk
+        else:
+            eof = True
+
+    def skip_ws():
+        nonlocal buf
+        buf = buf.lstrip()
+        while not buf and not eof:
+            read_more()
+            buf = buf.lstrip()
+
+    skip_ws()
+    if not buf.startswith("["):
+        raise ValueError("expected a JSON array at the top level")
+    buf = buf[1:]
+
+    first = True
+    while True:
+        skip_ws()
+        if buf.startswith("]"):
+            return
+        if not first:
+            if not buf.startswith(","):
+                raise ValueError("expected ',' or ']' between array items")
+            buf = buf[1:]
+            skip_ws()
+        first = False
+
+        while True:
+            try:
+                item, end = decoder.raw_decode(buf)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                read_more()
+                continue
+            # complete only once the next delimiter is in view: a number cut
+            # at the chunk edge ("-1.5e") still decodes as a shorter one
+            rest = buf[end:].lstrip()
+            if not eof and (not rest or rest[0] not in ",]"):
+                read_more()
+                continue
+            break
+
+        buf = buf[end:]
+        yield item
+
+
+# -----------------------------
+# laws.json -> search sections
+# -----------------------------
+def iter_law_sections(path: Optional[Path] = None) -> Iterator[Dict[str, Any]]:
+    """
+    One dict per SectionVersion, in the shape HybridSearchEngine reads from
+    Neo4j, built from the same laws.json that LoadLawsNeo4j writes. Acts are
+    parsed one at a time, never the whole file at once.
+    """
+    with open(path or default_data_path("laws.json"), "r", encoding="utf-8") as f:
+        for act in _iter_json_array(f):
+            for sec in act.get("sections", []):
+                yield {
+                    "version_id": sec.get("version_id"),
+                    "act_id": act.get("act_id"),
+                    "law": act.get("law"),
+                    "act_title": act.get("title"),
+                    "jurisdiction": act.get("jurisdiction"),
+                    "section_no": str(sec.get("section_no") or "").strip(),
+                    "section_title": sec.get("title"),
+                    "text": sec.get("text") or "",
+                    "valid_from": sec.get("valid_from"),
+                    "valid_to": sec.get("valid_to"),
+                    "citations": sec.get("citations") or [],
+                    "amended_by": sec.get("amended_by") or [],
+                    "repealed_by": sec.get("repealed_by"),
+                    "current_status": sec.get("current_status") or "active",
+                }
+
+
+def load_law_sections(path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    # same order as the Neo4j query (ORDER BY a.act_id, sv.section_no)
+    return sorted(iter_law_sections(path), key=lambda s: (s["act_id"] or "", s["section_no"]))
+
+
+# -----------------------------
+# case-law corpus -> case docs
+# -----------------------------
+def norm_list(v):
+    if v is None:
+        return []
+    if isinstance(v, list):
+        return [str(x).strip() for x in v if str(x).strip()]
+    if isinstance(v, str):
+        return [v.strip()] if v.strip() else []
+    return [str(v).strip()]
+
+
+def make_case_id(prefix: str, case_name: str, citation: str) -> str:
+    raw = f"{prefix}|{case_name}|{citation}".encode("utf-8")
+    h = hashlib.md5(raw).hexdigest()[:12]
+    return f"{prefix}_{h}"
+
+
+def case_law_row(case_id: str, topic: str, case_item: Dict[str, Any]) -> Dict[str, Any]:
+    """CaseLaw node properties for one corpus item."""
+    relevant_sections = norm_list(case_item.get("relevant_sections"))
+    if case_item.get("relevant_section"):
+        relevant_sections.extend(norm_list(case_item.get("relevant_section")))
+
+    return {
+        "case_id": case_id,
+        "case_name": case_item.get("case_name"),
+        "citation": case_item.get("citation"),
+        "facts": case_item.get("facts", ""),
+        "held": norm_list(case_item.get("held")),
+        "principle": norm_list(case_item.get("principle")),
+        "topic": topic,
+        "court": case_item.get("court", ""),
+        "relevant_laws": norm_list(case_item.get("relevant_laws")),
+        "relevant_sections": relevant_sections,
+        "amending_law": case_item.get("amending_law", ""),
+    }
+
+
+def iter_case_law_docs(path: Path, source_title: str = CASE_LAW_SOURCE_TITLE) -> Iterator[Dict[str, Any]]:
+    """
+    Case-law docs in the shape build_case_law_artifacts reads from Neo4j:
+    section cases (with their section) first, then topic cases, each case_id
+    once.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    source_id = next(iter(raw.keys()))
+    data = raw[source_id]
+    base = {
+        "source_id": source_id,
+        "source_title": source_title,
+        "chapter": data.get("chapter", ""),
+    }
+
+    seen = set()
+    for sec in data.get("sections", []):
+        prefix = f"{source_id}_s{sec['section_number']}"
+        for case_item in sec.get("case_laws", []):
+            case_id = make_case_id(prefix, case_item.get("case_name", ""), case_item.get("citation", ""))
+            if case_id in seen:
+                continue
+            seen.add(case_id)
+            yield {
+                **base,
+                **case_law_row(case_id, case_item.get("topic", "General"), case_item),
+                "section_number": sec["section_number"],
+                "section_title": sec.get("title"),
+                "section_content": sec.get("content", ""),
+            }
+
+    for topic_name, items in data.get("case_laws_by_topic", {}).items():
+        prefix = f"{source_id}_topic_{topic_name}"
+        for case_item in items:
+            case_id = make_case_id(prefix, case_item.get("case_name", ""), case_item.get("citation", ""))
+            if case_id in seen:
+                continue
+            seen.add(case_id)
+            yield {
+                **base,
+                **case_law_row(case_id, topic_name, case_item),
+                "section_number": None,
+                "section_title": None,
+                "section_content": None,
+            }
@@ -0,0 +1,177 @@
+import os
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+# strings longer than this (in any row) go to a blob instead of a fixed-width column
+DOC_STORE_MAX_INLINE_CHARS = int(os.getenv("DOC_STORE_MAX_INLINE_CHARS", "64"))
+
+MANIFEST = "columns.json"
+
+
+def _field_kind(values: List[Any], max_inline: int) -> str:
+    present = [v for v in values if v is not None]
+    if any(not isinstance(v, str) for v in present):
+        return "json"
+    if any(len(v) > max_inline for v in present):
+        return "text"
+    return "str"
+
+
+def write_doc_store(docs: List[Dict[str, Any]], path: Path, max_inline: int = DOC_STORE_MAX_INLINE_CHARS):
+    """
+    Columnar layout of a list of flat dicts:
+      - short string fields -> <name>.npy (fixed-width unicode, memory-mappable)
+      - long strings / lists -> <name>.bin (UTF-8, memory-mapped) + <name>.offsets.npy
+      - <name>.null.npy marks rows where the value was None
+    Written to a temp directory and swapped in, so readers never see a half store.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    fields: List[str] = []
+    for d in docs:
+        for k in d:
+            if k not in fields:
+                fields.append(k)
+
+    kinds = {}
+    for name in fields:
+        values = [d.get(name) for d in docs]
+        kind = _field_kind(values, max_inline)
+        kinds[name] = kind
+
+        nulls = np.array([v is None for v in values], dtype=bool)
+        if nulls.any():
+            np.save(tmp / f"{name}.null.npy", nulls)
+
+        if kind == "str":
+            np.save(tmp / f"{name}.npy", np.array(["" if v is None else v for v in values], dtype=str))
+            continue
+
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        with open(tmp / f"{name}.bin", "wb") as f:
+            for i, v in enumerate(values):
+                if v is None:
+                    raw = b""
+                elif kind == "json":
+                    raw = json.dumps(v, ensure_ascii=False).encode("utf-8")
+                else:
+                    raw = v.encode("utf-8")
+                f.write(raw)
+                offsets[i + 1] = offsets[i] + len(raw)
+        np.save(tmp / f"{name}.offsets.npy", offsets)
+
+    with open(tmp / MANIFEST, "w", encoding="utf-8") as f:
+        json.dump({"count": len(docs), "fields": kinds}, f, indent=2)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+
+
+class DocStore:
+    """
+    Read side of write_doc_store. Short columns are memory-mapped NumPy
+    arrays usable for filtering; blob fields are sliced out of a mapped file
+    only when a row is materialized (get / __getitem__).
+    """
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path / MANIFEST, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        self.count: int = manifest["count"]
+        self.kinds: Dict[str, str] = manifest["fields"]
+        self.fields: List[str] = list(self.kinds)
+
+        self._columns: Dict[str, np.ndarray] = {}
+        self._nulls: Dict[str, np.ndarray] = {}
+        self._blobs: Dict[str, np.memmap] = {}
+        self._offsets: Dict[str, np.ndarray] = {}
+
+        for name, kind in self.kinds.items():
+            null_path = self.path / f"{name}.null.npy"
+            if null_path.exists():
+                self._nulls[name] = np.load(null_path, mmap_mode="r")
+            if kind == "str":
+                self._columns[name] = np.load(self.path / f"{name}.npy", mmap_mode="r")
+            else:
+                self._offsets[name] = np.load(self.path / f"{name}.offsets.npy", mmap_mode="r")
+                blob_path = self.path / f"{name}.bin"
+                # np.memmap refuses zero-length files
+                self._blobs[name] = (
+                    np.memmap(blob_path, dtype=np.uint8, mode="r")
+                    if blob_path.stat().st_size else np.zeros(0, dtype=np.uint8)
+                )
+
+    @staticmethod
+    def exists(path: Path) -> bool:
+        return (Path(path) / MANIFEST).exists()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Whole string field as a NumPy array ('' where the value was None).
+        Inline fields are returned as mapped; long-string fields are decoded
+        once and kept. A field no row had reads as all '', like .get() on
+        the JSON docs.
+        """
+        if name not in self._columns:
+            kind = self.kinds.get(name)
+            if kind is None:
+                self._columns[name] = np.full(self.count, "", dtype=str)
+                return self._columns[name]
+            if kind != "text":
+                raise TypeError(
+                    f"DocStore {self.path}: field {name!r} holds {kind} values, not strings; "
+                    f"read it per row with value()/get()"
+                )
+            offsets = self._offsets[name]
+            blob = self._blobs[name]
+            self._columns[name] = np.array(
+                [bytes(blob[offsets[i]:offsets[i + 1]]).decode("utf-8") for i in range(self.count)],
+                dtype=str,
+            )
+        return self._columns[name]
+
+    def value(self, i: int, name: str) -> Any:
+        # absent field: None, as .get() on the JSON docs
+        if name not in self.kinds:
+            return None
+        nulls = self._nulls.get(name)
+        if nulls is not None and nulls[i]:
+            return None
+        kind = self.kinds[name]
+        if name in self._columns:
+            return str(self._columns[name][i])
+        offsets = self._offsets[name]
+        raw = bytes(self._blobs[name][offsets[i]:offsets[i + 1]]).decode("utf-8")
+        return json.loads(raw) if kind == "json" else raw
+
+    def get(self, i: int) -> Dict[str, Any]:
+        return {name: self.value(i, name) for name in self.fields}
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        return self.get(i)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self.count):
+            yield self.get(i)
+
+
+def convert_json_artifact(json_path: Path, store_path: Optional[Path] = None) -> Path:
+    """sections.json -> sections.cols/ (or docs.json -> docs.cols/)."""
+    json_path = Path(json_path)
+    store_path = Path(store_path or json_path.with_suffix(".cols"))
+    with open(json_path, "r", encoding="utf-8") as f:
+        docs = json.load(f)
+    write_doc_store(docs, store_path)
+    return store_path
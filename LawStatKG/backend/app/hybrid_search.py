@@ -12,11 +12,18 @@ import numpy as np
 from rank_bm25 import BM25Okapi
 from sentence_transformers import SentenceTransformer
 
+from app.dataset_source import load_law_sections
+from app.doc_store import DocStore, write_doc_store
 from app.kg_client import KGClient
+from app.query_metrics import metrics
+from app.sharded_embed import build_embeddings, clear_checkpoints
 
 
 _TOKEN_RE = re.compile(r"[A-Za-z0-9']+")
 
+# where build_and_save_artifacts reads sections: "neo4j" (graph) or "file" (data/laws.json)
+ARTIFACT_SOURCE = os.getenv("ARTIFACT_SOURCE", "neo4j").strip().lower()
+
 STOPWORDS = {
     "a","an","and","are","as","at","be","by","for","from","has","have","in","is","it",
     "of","on","or","that","the","their","they","this","to","was","were","with","you","your"
@@ -59,8 +66,13 @@ class HybridSearchEngine:
         self.ready = False
         self.model = None
 
-        self.sections: List[Dict] = []
-        self.section_texts: List[str] = []
+        # list of dicts (sections.json) or a DocStore (sections.cols/)
+        self.sections = []
+        # short per-section columns used for filtering without touching the docs
+        self.col_act_id = np.zeros(0, dtype=str)
+        self.col_jurisdiction = np.zeros(0, dtype=str)
+        self.col_valid_from = np.zeros(0, dtype=str)
+        self.col_valid_to = np.zeros(0, dtype=str)
         self.section_tokens: List[List[str]] = []
         self.section_token_sets: List[set] = []
 
@@ -102,7 +114,8 @@ class HybridSearchEngine:
         """
         out = []
         with kg.driver.session() as session:
-            for r in session.run(cypher):
+            records, _ = metrics.run(session, "load_sections", cypher)
+            for r in records:
                 out.append({
                     "version_id": r["version_id"],
                     "act_id": r["act_id"],
@@ -139,49 +152,61 @@ class HybridSearchEngine:
     # Artifact paths
     # -----------------------------
     def _p_sections(self): return self.artifact_dir / "sections.json"
+    def _p_store(self): return self.artifact_dir / "sections.cols"
     def _p_bm25(self): return self.artifact_dir / "bm25.pkl"
     def _p_emb(self): return self.artifact_dir / "embeddings.npy"
     def _p_meta(self): return self.artifact_dir / "meta.json"
 
     def artifacts_exist(self) -> bool:
-        return self._p_sections().exists() and self._p_bm25().exists() and self._p_emb().exists() and self._p_meta().exists()
+        has_sections = self._p_sections().exists() or DocStore.exists(self._p_store())
+        return has_sections and self._p_bm25().exists() and self._p_emb().exists() and self._p_meta().exists()
 
     # -----------------------------
     # Build artifacts (slow)
     # -----------------------------
-    def build_and_save_artifacts(self):
-        kg = KGClient()
-        if not kg.ping():
-            raise RuntimeError("Neo4j is not reachable (Aura). Check env credentials/network.")
-        sections = self._load_sections_from_neo4j(kg)
-        kg.close()
-
-        if not sections:
-            raise RuntimeError("No sections loaded from Neo4j. Check your graph data.")
+    def build_and_save_artifacts(self, source: Optional[str] = None, laws_path: Optional[Path] = None):
+        """
+        source="neo4j" reads the graph; source="file" reads laws.json directly
+        (no network) and produces the same artifacts.
+        """
+        source = (source or ARTIFACT_SOURCE).lower()
+        if source == "file":
+            sections = load_law_sections(laws_path)
+            if not sections:
+                raise RuntimeError("No sections found in laws.json.")
+        elif source == "neo4j":
+            kg = KGClient()
+            if not kg.ping():
+                raise RuntimeError("Neo4j is not reachable (Aura). Check env credentials/network.")
+            sections = self._load_sections_from_neo4j(kg)
+            kg.close()
+
+            if not sections:
+                raise RuntimeError("No sections loaded from Neo4j. Check your graph data.")
+        else:
+            raise ValueError(f"Unknown artifact source: {source!r} (expected 'neo4j' or 'file')")
 
         section_texts = [(s.get("section_title", "") + " " + s.get("text", "")) for s in sections]
-        section_tokens = [tokenize(t) for t in section_texts]
-        bm25 = BM25Okapi(section_tokens)
 
-        model = SentenceTransformer(self.model_name)
-        emb = model.encode(
+        # embeddings.npy is assembled from resumable shards (tokens ride along)
+        checkpoint_dir = self.artifact_dir / "_embed_shards"
+        section_tokens = build_embeddings(
             section_texts,
-            convert_to_numpy=True,
-            normalize_embeddings=True,
-            show_progress_bar=True
+            self.model_name,
+            out_path=self._p_emb(),
+            checkpoint_dir=checkpoint_dir,
+            tokenizer=tokenize,
         )
 
-        # save sections.json
+        # save sections.json (interchange, temporal store) + columnar copy for search
         with open(self._p_sections(), "w", encoding="utf-8") as f:
             json.dump(sections, f, ensure_ascii=False)
+        write_doc_store(sections, self._p_store())
 
         # save bm25.pkl (store token lists; rebuild BM25 quickly on load)
         with open(self._p_bm25(), "wb") as f:
             pickle.dump({"section_tokens": section_tokens}, f)
 
-        # save embeddings
-        np.save(self._p_emb(), emb)
-
         # meta
         meta = {
             "model_name": self.model_name,
@@ -192,6 +217,8 @@ class HybridSearchEngine:
         with open(self._p_meta(), "w", encoding="utf-8") as f:
             json.dump(meta, f, ensure_ascii=False, indent=2)
 
+        clear_checkpoints(checkpoint_dir)
+
     # -----------------------------
     # Load artifacts (fast)
     # -----------------------------
@@ -210,11 +237,21 @@ class HybridSearchEngine:
                 )
             self.build_and_save_artifacts()
 
-        # load sections
-        with open(self._p_sections(), "r", encoding="utf-8") as f:
-            self.sections = json.load(f)
-
-        self.section_texts = [(s.get("section_title", "") + " " + s.get("text", "")) for s in self.sections]
+        # load sections: columnar store when present (texts stay on disk until
+        # a hit is returned), else the JSON artifact
+        if DocStore.exists(self._p_store()):
+            self.sections = DocStore(self._p_store())
+            self.col_act_id = self.sections.column("act_id")
+            self.col_jurisdiction = self.sections.column("jurisdiction")
+            self.col_valid_from = self.sections.column("valid_from")
+            self.col_valid_to = self.sections.column("valid_to")
+        else:
+            with open(self._p_sections(), "r", encoding="utf-8") as f:
+                self.sections = json.load(f)
+            self.col_act_id = np.array([s.get("act_id") or "" for s in self.sections], dtype=str)
+            self.col_jurisdiction = np.array([s.get("jurisdiction") or "" for s in self.sections], dtype=str)
+            self.col_valid_from = np.array([s.get("valid_from") or "" for s in self.sections], dtype=str)
+            self.col_valid_to = np.array([s.get("valid_to") or "" for s in self.sections], dtype=str)
 
         # tokens
         with open(self._p_bm25(), "rb") as f:
@@ -232,17 +269,26 @@ class HybridSearchEngine:
 
         # act expansion maps
         self.act_to_sections.clear()
-        for i, s in enumerate(self.sections):
-            self.act_to_sections[s.get("act_id")].append(i)
+        for i, act_id in enumerate(self.col_act_id.tolist()):
+            self.act_to_sections[act_id].append(i)
 
+        # act-level fields are the same on every section of an act
         self.act_meta_tokens.clear()
-        for s in self.sections:
-            act_id = s.get("act_id")
+        for act_id, idxs in self.act_to_sections.items():
+            s = self.sections[idxs[0]]
             meta = f"{s.get('act_id','')} {s.get('law','')} {s.get('act_title','')} {s.get('jurisdiction','')}"
             self.act_meta_tokens[act_id].update(tokenize(meta))
 
         self.ready = True
 
+    def _eligible_mask(self, as_of_date: str, jurisdiction: Optional[str]) -> np.ndarray:
+        """Vectorised jurisdiction + temporal_ok over all sections ('' = no bound)."""
+        vf, vt = self.col_valid_from, self.col_valid_to
+        mask = ((vf == "") | (vf <= as_of_date)) & ((vt == "") | (vt >= as_of_date))
+        if jurisdiction:
+            mask &= self.col_jurisdiction == jurisdiction
+        return mask
+
     # -----------------------------
     # Search (same as your logic)
     # -----------------------------
@@ -284,14 +330,13 @@ class HybridSearchEngine:
                 if overlap / len(q_set) >= 0.6:
                     matching_acts.append(act_id)
 
+        eligible = self._eligible_mask(as_of_date, jurisdiction)
+
         if matching_acts:
             idxs = []
             for act_id in matching_acts:
                 for idx in self.act_to_sections.get(act_id, []):
-                    doc = self.sections[idx]
-                    if jurisdiction and doc.get("jurisdiction") != jurisdiction:
-                        continue
-                    if not temporal_ok(doc, as_of_date):
+                    if not eligible[idx]:
                         continue
                     idxs.append(idx)
 
@@ -310,31 +355,14 @@ class HybridSearchEngine:
             sem01 = (cosine + 1.0) / 2.0
             score = alpha * bm25_norm + beta * sem01
 
-            results = []
-            for j, idx in enumerate(idxs):
-                if cosine[j] < min_semantic_cosine and bm25_arr[j] <= 0.0:
-                    continue
-                results.append({
-                    "doc": self.sections[idx],
-                    "bm25": float(bm25_arr[j]),
-                    "bm25_norm": float(bm25_norm[j]),
-                    "semantic_cosine": float(cosine[j]),
-                    "score": float(score[j]),
-                })
-
-            results.sort(key=lambda x: x["score"], reverse=True)
-            return results[:top_k] if top_k else results
+            keep = ~((cosine < min_semantic_cosine) & (bm25_arr <= 0.0))
+            return self._top_results(idxs, keep, bm25_arr, bm25_norm, cosine, score, top_k)
 
         # Strict BM25 gate + overlap
         required_hits = 1 if len(q_tokens) == 1 else max(1, int(np.ceil(min_match_ratio * len(q_tokens))))
 
         candidates = []
-        for idx, doc in enumerate(self.sections):
-            if jurisdiction and doc.get("jurisdiction") != jurisdiction:
-                continue
-            if not temporal_ok(doc, as_of_date):
-                continue
-
+        for idx in np.flatnonzero(eligible).tolist():
             b = float(bm25_scores[idx])
             if b <= 0.0:
                 continue
@@ -361,17 +389,23 @@ class HybridSearchEngine:
         sem01 = (cosine + 1.0) / 2.0
         score = alpha * bm25_norm + beta * sem01
 
-        results = []
-        for j, idx in enumerate(candidates):
-            if cosine[j] < min_semantic_cosine:
-                continue
-            results.append({
-                "doc": self.sections[idx],
+        keep = cosine >= min_semantic_cosine
+        return self._top_results(candidates, keep, bm25_arr, bm25_norm, cosine, score, top_k)
+
+    def _top_results(self, idxs, keep, bm25_arr, bm25_norm, cosine, score, top_k) -> List[Dict]:
+        # rank on the score arrays; only the returned rows are read from the doc store
+        rows = np.flatnonzero(keep)
+        rows = rows[np.argsort(-score[rows], kind="stable")]
+        if top_k:
+            rows = rows[:top_k]
+
+        return [
+            {
+                "doc": self.sections[idxs[j]],
                 "bm25": float(bm25_arr[j]),
                 "bm25_norm": float(bm25_norm[j]),
                 "semantic_cosine": float(cosine[j]),
                 "score": float(score[j]),
-            })
-
-        results.sort(key=lambda x: x["score"], reverse=True)
-        return results[:top_k] if top_k else results
\ No newline at end of file
+            }
+            for j in rows
+        ]
\ No newline at end of file
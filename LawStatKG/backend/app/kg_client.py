@@ -1,32 +1,473 @@
 import os
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 
-from neo4j import GraphDatabase
+from neo4j import AsyncGraphDatabase, GraphDatabase, Query
 from neo4j.exceptions import Neo4jError
 from dotenv import load_dotenv
 
+from app.pagination import AMENDMENT_PAGE_MAX, page_response
+from app.query_metrics import metrics
+from app.section_keys import act_section_key
+from app.statute_cache import StatuteIntervalCache, validity_interval
+
 # Load environment variables
 load_dotenv()
 
 
-class KGClient:
-    def __init__(self):
-        self.uri = (os.getenv("NEO4J_URI") or "").strip()
-        self.user = (os.getenv("NEO4J_USER") or "").strip()
-        self.password = (os.getenv("NEO4J_PASSWORD") or "").strip()
+# Driver / pool settings (shared by the sync and async clients)
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+NEO4J_CONNECTION_TIMEOUT = float(os.getenv("NEO4J_CONNECTION_TIMEOUT", "20"))
+NEO4J_ACQUIRE_TIMEOUT = float(os.getenv("NEO4J_ACQUIRE_TIMEOUT", "30"))
+NEO4J_MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+NEO4J_QUERY_TIMEOUT = float(os.getenv("NEO4J_QUERY_TIMEOUT", "30"))
+
+
+def _credentials() -> Tuple[str, str, str]:
+    uri = (os.getenv("NEO4J_URI") or "").strip()
+    user = (os.getenv("NEO4J_USER") or "").strip()
+    password = (os.getenv("NEO4J_PASSWORD") or "").strip()
+
+    if not uri or not user or not password:
+        raise RuntimeError(
+            "Missing NEO4J_URI / NEO4J_USER / NEO4J_PASSWORD in .env"
+        )
+    return uri, user, password
+
+
+def _driver_config() -> Dict[str, Any]:
+    return {
+        "connection_timeout": NEO4J_CONNECTION_TIMEOUT,
+        "max_connection_pool_size": NEO4J_MAX_POOL_SIZE,
+        "connection_acquisition_timeout": NEO4J_ACQUIRE_TIMEOUT,
+        "max_connection_lifetime": NEO4J_MAX_CONNECTION_LIFETIME,
+    }
+
+
+def _query(cypher: str) -> Query:
+    return Query(cypher, timeout=NEO4J_QUERY_TIMEOUT)
+
+
+# --------------------------------------------------
+# CYPHER
+# --------------------------------------------------
+STATUTE_AS_OF_CYPHER = """
+    MATCH (a:Act {act_id:$act_id})-[:HAS_SECTION]->(s:Section)-[:HAS_VERSION]->(sv:SectionVersion)
+    WHERE (sv.valid_from IS NULL OR sv.valid_from <= date($as_of_date))
+      AND (sv.valid_to IS NULL OR sv.valid_to >= date($as_of_date))
+    WITH a, collect({
+          version_id: sv.version_id,
+          section_no: sv.section_no,
+          section_title: sv.title,
+          text: sv.text,
+          valid_from: CASE WHEN sv.valid_from IS NULL THEN NULL ELSE toString(sv.valid_from) END,
+          valid_to: CASE WHEN sv.valid_to IS NULL THEN NULL ELSE toString(sv.valid_to) END,
+          current_status: coalesce(sv.current_status, "active")
+      }) AS sections
+
+    // nearest version boundaries on either side of the as-of date, used to
+    // compute how long this exact set of versions stays in force
+    OPTIONAL MATCH (a)-[:HAS_SECTION]->(:Section)-[:HAS_VERSION]->(nv:SectionVersion)
+    WHERE nv.valid_from > date($as_of_date) OR nv.valid_to < date($as_of_date)
+    WITH a, sections,
+         min(CASE WHEN nv.valid_from > date($as_of_date) THEN nv.valid_from END) AS next_start,
+         max(CASE WHEN nv.valid_to < date($as_of_date) THEN nv.valid_to END) AS prev_end
+    RETURN
+      a.act_id AS act_id,
+      a.title AS act_title,
+      a.jurisdiction AS jurisdiction,
+      sections,
+      toString(prev_end) AS prev_end,
+      toString(next_start) AS next_start
+"""
+
+SECTION_TIMELINE_CYPHER = """
+    MATCH (s:Section {act_section:$act_section})
+    MATCH (a:Act {act_id:$act_id})-[:HAS_SECTION]->(s)
+
+    MATCH (s)-[:HAS_VERSION]->(sv:SectionVersion)
+    OPTIONAL MATCH (sv)-[:CHANGED_BY]->(am:Amendment)
+    OPTIONAL MATCH (prev:SectionVersion)-[r:NEXT_VERSION]->(sv)
+
+    RETURN
+      a.act_id AS act_id,
+      a.title AS act_title,
+      a.jurisdiction AS jurisdiction,
+      s.section_no AS section_no,
+      collect({
+        version_id: sv.version_id,
+        valid_from: CASE WHEN sv.valid_from IS NULL THEN NULL ELSE toString(sv.valid_from) END,
+        valid_to:   CASE WHEN sv.valid_to   IS NULL THEN NULL ELSE toString(sv.valid_to) END,
+        section_title: sv.title,
+        text: sv.text,
+        amendment: CASE WHEN am IS NULL THEN NULL ELSE {
+          amend_id: am.amend_id,
+          date: toString(am.date),
+          am_title: am.am_title,
+          summary: am.summary,
+          section_no: am.section_no,
+          section_title: am.section_title,
+          act_id: am.act_id,
+          jurisdiction: am.jurisdiction
+        } END,
+        change_from_prev: CASE WHEN r IS NULL THEN NULL ELSE {
+          summary: r.summary,
+          added: r.added,
+          removed: r.removed
+        } END
+      }) AS timeline
+"""
+
+SECTION_TIMELINE_BATCH_CYPHER = """
+    UNWIND $lookups AS lookup
+    WITH lookup.input_no AS input_no, lookup.act_section AS act_section
+    MATCH (s:Section {act_section:act_section})
+    MATCH (a:Act {act_id:$act_id})-[:HAS_SECTION]->(s)
+
+    MATCH (s)-[:HAS_VERSION]->(sv:SectionVersion)
+    OPTIONAL MATCH (sv)-[:CHANGED_BY]->(am:Amendment)
+    OPTIONAL MATCH (prev:SectionVersion)-[r:NEXT_VERSION]->(sv)
+
+    RETURN
+      input_no,
+      a.act_id AS act_id,
+      a.title AS act_title,
+      a.jurisdiction AS jurisdiction,
+      s.section_no AS section_no,
+      collect({
+        version_id: sv.version_id,
+        valid_from: CASE WHEN sv.valid_from IS NULL THEN NULL ELSE toString(sv.valid_from) END,
+        valid_to:   CASE WHEN sv.valid_to   IS NULL THEN NULL ELSE toString(sv.valid_to) END,
+        section_title: sv.title,
+        text: sv.text,
+        amendment: CASE WHEN am IS NULL THEN NULL ELSE {
+          amend_id: am.amend_id,
+          date: toString(am.date),
+          am_title: am.am_title,
+          summary: am.summary,
+          section_no: am.section_no,
+          section_title: am.section_title,
+          act_id: am.act_id,
+          jurisdiction: am.jurisdiction
+        } END,
+        change_from_prev: CASE WHEN r IS NULL THEN NULL ELSE {
+          summary: r.summary,
+          added: r.added,
+          removed: r.removed
+        } END
+      }) AS timeline
+"""
+
+CHANGE_DETAIL_CYPHER = """
+    MATCH (before:SectionVersion)-[r:NEXT_VERSION]->(after:SectionVersion {version_id:$after_id})
+    OPTIONAL MATCH (after)-[:CHANGED_BY]->(am:Amendment)
+    RETURN
+      before {
+        version_id: before.version_id,
+        valid_from: toString(before.valid_from),
+        text: before.text
+      } AS before_version,
+      after {
+        version_id: after.version_id,
+        valid_from: toString(after.valid_from),
+        text: after.text
+      } AS after_version,
+      {
+        summary: r.summary,
+        diff: r.diff,
+        added: r.added,
+        removed: r.removed
+      } AS change,
+      CASE WHEN am IS NULL THEN NULL ELSE {
+        amend_id: am.amend_id,
+        date: toString(am.date),
+        am_title: am.am_title,
+        summary: am.summary
+      } END AS amendment
+"""
+
+CHANGE_DETAIL_BATCH_CYPHER = """
+    UNWIND $after_ids AS input_id
+    MATCH (before:SectionVersion)-[r:NEXT_VERSION]->(after:SectionVersion {version_id:input_id})
+    OPTIONAL MATCH (after)-[:CHANGED_BY]->(am:Amendment)
+    RETURN
+      input_id,
+      before {
+        version_id: before.version_id,
+        valid_from: toString(before.valid_from),
+        text: before.text
+      } AS before_version,
+      after {
+        version_id: after.version_id,
+        valid_from: toString(after.valid_from),
+        text: after.text
+      } AS after_version,
+      {
+        summary: r.summary,
+        diff: r.diff,
+        added: r.added,
+        removed: r.removed
+      } AS change,
+      CASE WHEN am IS NULL THEN NULL ELSE {
+        amend_id: am.amend_id,
+        date: toString(am.date),
+        am_title: am.am_title,
+        summary: am.summary
+      } END AS amendment
+"""
+
+AMENDMENT_DETAIL_CYPHER = """
+    MATCH (am:Amendment {amend_id:$amend_id})
+    RETURN am {
+        amend_id: am.amend_id,
+        date: toString(am.date),
+        am_title: am.am_title,
+        summary: am.summary,
+        section_no: am.section_no,
+        section_title: am.section_title,
+        act_id: am.act_id,
+        jurisdiction: am.jurisdiction
+    } AS amendment
+"""
+
+AMENDMENTS_BY_DATE_CYPHER = """
+    MATCH (am:Amendment)
+    WHERE am.date IS NOT NULL AND am.date <= date($as_of_date)
+    RETURN am {
+        amend_id: am.amend_id,
+        date: toString(am.date),
+        am_title: am.am_title,
+        summary: am.summary,
+        section_no: am.section_no,
+        section_title: am.section_title,
+        act_id: am.act_id,
+        jurisdiction: am.jurisdiction
+    } AS amendment
+    ORDER BY am.date
+"""
+
+AMENDMENTS_PAGE_CYPHER = """
+    MATCH (am:Amendment)
+    WHERE am.date IS NOT NULL AND am.date <= date($as_of_date)
+      AND ($date_from IS NULL OR am.date >= date($date_from))
+      AND ($act_id IS NULL OR am.act_id = $act_id)
+      AND ($jurisdiction IS NULL OR am.jurisdiction = $jurisdiction)
+      AND ($cursor_date IS NULL
+           OR am.date > date($cursor_date)
+           OR (am.date = date($cursor_date) AND am.amend_id > $cursor_id))
+    RETURN am {
+        amend_id: am.amend_id,
+        date: toString(am.date),
+        am_title: am.am_title,
+        summary: am.summary,
+        section_no: am.section_no,
+        section_title: am.section_title,
+        act_id: am.act_id,
+        jurisdiction: am.jurisdiction
+    } AS amendment
+    ORDER BY am.date, am.amend_id
+    LIMIT $fetch
+"""
+
+
+class _Read(NamedTuple):
+    """One Cypher read plus how its rows become the response."""
+    name: str
+    cypher: str
+    params: Dict[str, Any]
+    shape: Callable[[List[Dict[str, Any]]], Dict[str, Any]]
+
+
+def _neo4j_error(e: Neo4jError) -> Dict[str, Any]:
+    return {"error": "Neo4j query failed", "detail": str(e)}
+
+
+def _first_or(error: Dict[str, Any], shape=lambda rec: rec):
+    def _shape(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return shape(rows[0]) if rows else error
+    return _shape
+
+
+def _cache_statute(cache: StatuteIntervalCache, act_id: str, rec: Dict[str, Any]) -> Dict[str, Any]:
+    prev_end = rec.pop("prev_end", None)
+    next_start = rec.pop("next_start", None)
+    lo, hi = validity_interval(rec.get("sections") or [], prev_end, next_start)
+    cache.put(act_id, lo, hi, rec)
+    return rec
+
+
+def _unique_keys(keys: List[str]) -> List[str]:
+    seen = set()
+    out: List[str] = []
+    for k in keys:
+        k = (k or "").strip()
+        if k and k not in seen:
+            seen.add(k)
+            out.append(k)
+    return out
+
+
+def _sort_timeline(data: Dict[str, Any]) -> Dict[str, Any]:
+    data["timeline"] = sorted(
+        data.get("timeline", []),
+        key=lambda x: (x.get("valid_from") or "")
+    )
+    return data
+
+
+class _KGQueries:
+    """
+    Cypher, parameters and result shaping shared by KGClient and
+    AsyncKGClient. Each builder returns either a finished response (a cache
+    hit) or a _Read; the clients differ only in how they run the _Read.
+    """
+    statute_cache: StatuteIntervalCache
+
+    # --------------------------------------------------
+    # STATUTE AS-OF DATE
+    # --------------------------------------------------
+    def _statute_as_of(self, act_id: str, as_of_date: str):
+        act_id = act_id.strip()
+        as_of_date = as_of_date.strip()
+
+        cached = self.statute_cache.get(act_id, as_of_date)
+        if cached is not None:
+            return cached
+
+        return _Read(
+            "statute_as_of", STATUTE_AS_OF_CYPHER,
+            {"act_id": act_id, "as_of_date": as_of_date},
+            _first_or(
+                {"error": "Act not found", "act_id": act_id},
+                lambda rec: _cache_statute(self.statute_cache, act_id, rec),
+            ),
+        )
+
+    # --------------------------------------------------
+    # SECTION TIMELINE
+    # --------------------------------------------------
+    def _section_timeline(self, act_id: str, section_no: str) -> _Read:
+        act_id = act_id.strip()
+        section_no = section_no.strip()
+
+        return _Read(
+            "section_timeline", SECTION_TIMELINE_CYPHER,
+            {"act_id": act_id, "act_section": act_section_key(act_id, section_no)},
+            _first_or({"error": "Section not found"}, _sort_timeline),
+        )
+
+    # --------------------------------------------------
+    # BEFORE / AFTER BY VERSION
+    # --------------------------------------------------
+    def _change_detail(self, after_version_id: str) -> _Read:
+        return _Read(
+            "change_detail", CHANGE_DETAIL_CYPHER,
+            {"after_id": after_version_id.strip()},
+            _first_or({"error": "Change not found"}),
+        )
+
+    # --------------------------------------------------
+    # BULK TIMELINES / CHANGES (one round trip per batch)
+    # --------------------------------------------------
+    def _section_timelines(self, act_id: str, section_nos: List[str]) -> _Read:
+        act_id = act_id.strip()
+        section_nos = _unique_keys(section_nos)
 
-        if not self.uri or not self.user or not self.password:
-            raise RuntimeError(
-                "Missing NEO4J_URI / NEO4J_USER / NEO4J_PASSWORD in .env"
-            )
+        def shape(rows):
+            found = {r.pop("input_no"): _sort_timeline(r) for r in rows}
+            return {
+                "act_id": act_id,
+                "timelines": {n: found.get(n) or {"error": "Section not found"} for n in section_nos}
+            }
+
+        return _Read(
+            "section_timeline_batch", SECTION_TIMELINE_BATCH_CYPHER,
+            {
+                "act_id": act_id,
+                "lookups": [{"input_no": n, "act_section": act_section_key(act_id, n)} for n in section_nos],
+            },
+            shape,
+        )
+
+    def _change_details(self, after_version_ids: List[str]) -> _Read:
+        after_version_ids = _unique_keys(after_version_ids)
+
+        def shape(rows):
+            found: Dict[str, Dict[str, Any]] = {}
+            for r in rows:
+                found.setdefault(r.pop("input_id"), r)
+            return {
+                "changes": {v: found.get(v) or {"error": "Change not found"} for v in after_version_ids}
+            }
+
+        return _Read("change_detail_batch", CHANGE_DETAIL_BATCH_CYPHER, {"after_ids": after_version_ids}, shape)
+
+    # --------------------------------------------------
+    # AMENDMENT BY ID
+    # --------------------------------------------------
+    def _amendment_detail(self, amend_id: str) -> _Read:
+        return _Read(
+            "amendment_detail", AMENDMENT_DETAIL_CYPHER,
+            {"amend_id": amend_id.strip()},
+            _first_or({"error": "Amendment not found"}),
+        )
+
+    # --------------------------------------------------
+    # AMENDMENTS BY DATE
+    # --------------------------------------------------
+    def _amendments_by_date(self, as_of_date: str) -> _Read:
+        as_of_date = as_of_date.strip()
+
+        def shape(rows):
+            amendments = [r["amendment"] for r in rows]
+            return {
+                "as_of_date": as_of_date,
+                "count": len(amendments),
+                "amendments": amendments
+            }
+
+        return _Read("amendments_by_date", AMENDMENTS_BY_DATE_CYPHER, {"as_of_date": as_of_date}, shape)
+
+    # --------------------------------------------------
+    # AMENDMENTS (KEYSET PAGINATED)
+    # --------------------------------------------------
+    def _amendments_page(
+        self,
+        as_of_date: str,
+        limit: Optional[int] = None,
+        cursor: Tuple[Optional[str], Optional[str]] = (None, None),
+        act_id: Optional[str] = None,
+        jurisdiction: Optional[str] = None,
+        date_from: Optional[str] = None,
+    ) -> _Read:
+        as_of_date = as_of_date.strip()
+        limit = limit or AMENDMENT_PAGE_MAX
+
+        return _Read(
+            "amendments_page", AMENDMENTS_PAGE_CYPHER,
+            {
+                "as_of_date": as_of_date,
+                "date_from": date_from,
+                "act_id": act_id.strip() if act_id else None,
+                "jurisdiction": jurisdiction.strip() if jurisdiction else None,
+                "cursor_date": cursor[0],
+                "cursor_id": cursor[1] or "",
+                "fetch": limit + 1,
+            },
+            lambda rows: page_response(as_of_date, [r["amendment"] for r in rows], limit),
+        )
+
+
+class KGClient(_KGQueries):
+    def __init__(self):
+        self.uri, self.user, self.password = _credentials()
 
         # Aura uses neo4j+s://
         self.driver = GraphDatabase.driver(
             self.uri,
             auth=(self.user, self.password),
-            connection_timeout=20,
-            max_connection_pool_size=50,
+            **_driver_config(),
         )
+        self.statute_cache = StatuteIntervalCache()
 
     def close(self):
         if self.driver:
@@ -39,232 +480,121 @@ class KGClient:
         except Exception:
             return False
 
-    # --------------------------------------------------
-    # STATUTE AS-OF DATE
-    # --------------------------------------------------
-    def get_statute_as_of(self, act_id: str, as_of_date: str) -> Dict[str, Any]:
-        act_id = act_id.strip()
-        as_of_date = as_of_date.strip()
-
-        cypher = """
-        MATCH (a:Act {act_id:$act_id})-[:HAS_SECTION]->(s:Section)-[:HAS_VERSION]->(sv:SectionVersion)
-        WHERE (sv.valid_from IS NULL OR sv.valid_from <= date($as_of_date))
-          AND (sv.valid_to IS NULL OR sv.valid_to >= date($as_of_date))
-        RETURN
-          a.act_id AS act_id,
-          a.title AS act_title,
-          a.jurisdiction AS jurisdiction,
-          collect({
-              version_id: sv.version_id,
-              section_no: sv.section_no,
-              section_title: sv.title,
-              text: sv.text,
-              valid_from: CASE WHEN sv.valid_from IS NULL THEN NULL ELSE toString(sv.valid_from) END,
-              valid_to: CASE WHEN sv.valid_to IS NULL THEN NULL ELSE toString(sv.valid_to) END,
-              current_status: coalesce(sv.current_status, "active")
-          }) AS sections
-        """
+    def _all(self, name: str, cypher: str, **params) -> List[Dict[str, Any]]:
+        with self.driver.session() as session:
+            records, _ = metrics.run(session, name, _query(cypher), **params)
+        return [dict(r) for r in records]
 
+    def _execute(self, read) -> Dict[str, Any]:
+        if not isinstance(read, _Read):
+            return read
         try:
-            with self.driver.session() as session:
-                rec = session.run(
-                    cypher,
-                    act_id=act_id,
-                    as_of_date=as_of_date
-                ).single()
-
-            if not rec:
-                return {"error": "Act not found", "act_id": act_id}
-
-            return dict(rec)
-
+            return read.shape(self._all(read.name, read.cypher, **read.params))
         except Neo4jError as e:
-            return {"error": "Neo4j query failed", "detail": str(e)}
+            return _neo4j_error(e)
+
+    def get_statute_as_of(self, act_id: str, as_of_date: str) -> Dict[str, Any]:
+        return self._execute(self._statute_as_of(act_id, as_of_date))
 
-    # --------------------------------------------------
-    # SECTION TIMELINE
-    # --------------------------------------------------
     def get_section_timeline(self, act_id: str, section_no: str) -> Dict[str, Any]:
-        act_id = act_id.strip()
-        section_no = section_no.strip()
+        return self._execute(self._section_timeline(act_id, section_no))
 
-        cypher = """
-        MATCH (a:Act {act_id:$act_id})-[:HAS_SECTION]->(s:Section)
-        WHERE trim(s.section_no) = trim($section_no)
-
-        MATCH (s)-[:HAS_VERSION]->(sv:SectionVersion)
-        OPTIONAL MATCH (sv)-[:CHANGED_BY]->(am:Amendment)
-        OPTIONAL MATCH (prev:SectionVersion)-[r:NEXT_VERSION]->(sv)
-
-        RETURN
-          a.act_id AS act_id,
-          a.title AS act_title,
-          a.jurisdiction AS jurisdiction,
-          s.section_no AS section_no,
-          collect({
-            version_id: sv.version_id,
-            valid_from: CASE WHEN sv.valid_from IS NULL THEN NULL ELSE toString(sv.valid_from) END,
-            valid_to:   CASE WHEN sv.valid_to   IS NULL THEN NULL ELSE toString(sv.valid_to) END,
-            section_title: sv.title,
-            text: sv.text,
-            amendment: CASE WHEN am IS NULL THEN NULL ELSE {
-              amend_id: am.amend_id,
-              date: toString(am.date),
-              am_title: am.am_title,
-              summary: am.summary,
-              section_no: am.section_no,
-              section_title: am.section_title,
-              act_id: am.act_id,
-              jurisdiction: am.jurisdiction
-            } END,
-            change_from_prev: CASE WHEN r IS NULL THEN NULL ELSE {
-              summary: r.summary,
-              added: r.added,
-              removed: r.removed
-            } END
-          }) AS timeline
-        """
+    def get_change_detail(self, after_version_id: str) -> Dict[str, Any]:
+        return self._execute(self._change_detail(after_version_id))
 
-        try:
-            with self.driver.session() as session:
-                rec = session.run(
-                    cypher,
-                    act_id=act_id,
-                    section_no=section_no
-                ).single()
-
-            if not rec:
-                return {"error": "Section not found"}
-
-            data = dict(rec)
-            data["timeline"] = sorted(
-                data.get("timeline", []),
-                key=lambda x: (x.get("valid_from") or "")
-            )
-            return data
+    def get_section_timelines(self, act_id: str, section_nos: List[str]) -> Dict[str, Any]:
+        return self._execute(self._section_timelines(act_id, section_nos))
 
-        except Neo4jError as e:
-            return {"error": "Neo4j query failed", "detail": str(e)}
+    def get_change_details(self, after_version_ids: List[str]) -> Dict[str, Any]:
+        return self._execute(self._change_details(after_version_ids))
 
-    # --------------------------------------------------
-    # BEFORE / AFTER BY VERSION
-    # --------------------------------------------------
-    def get_change_detail(self, after_version_id: str) -> Dict[str, Any]:
-        after_version_id = after_version_id.strip()
-
-        cypher = """
-        MATCH (before:SectionVersion)-[r:NEXT_VERSION]->(after:SectionVersion {version_id:$after_id})
-        OPTIONAL MATCH (after)-[:CHANGED_BY]->(am:Amendment)
-        RETURN
-          before {
-            version_id: before.version_id,
-            valid_from: toString(before.valid_from),
-            text: before.text
-          } AS before_version,
-          after {
-            version_id: after.version_id,
-            valid_from: toString(after.valid_from),
-            text: after.text
-          } AS after_version,
-          {
-            summary: r.summary,
-            diff: r.diff,
-            added: r.added,
-            removed: r.removed
-          } AS change,
-          CASE WHEN am IS NULL THEN NULL ELSE {
-            amend_id: am.amend_id,
-            date: toString(am.date),
-            am_title: am.am_title,
-            summary: am.summary
-          } END AS amendment
-        """
+    def get_amendment_detail(self, amend_id: str) -> Dict[str, Any]:
+        return self._execute(self._amendment_detail(amend_id))
 
-        try:
-            with self.driver.session() as session:
-                rec = session.run(
-                    cypher,
-                    after_id=after_version_id
-                ).single()
+    def get_amendments_by_date(self, as_of_date: str) -> Dict[str, Any]:
+        return self._execute(self._amendments_by_date(as_of_date))
+
+    def get_amendments_page(
+        self,
+        as_of_date: str,
+        limit: Optional[int] = None,
+        cursor: Tuple[Optional[str], Optional[str]] = (None, None),
+        act_id: Optional[str] = None,
+        jurisdiction: Optional[str] = None,
+        date_from: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return self._execute(self._amendments_page(as_of_date, limit, cursor, act_id, jurisdiction, date_from))
+
+
+class AsyncKGClient(_KGQueries):
+    """
+    Same queries as KGClient on top of AsyncGraphDatabase, for use from
+    `async def` endpoints: an in-flight Cypher query awaits on the event loop
+    instead of pinning a threadpool thread.
+    """
 
-            if not rec:
-                return {"error": "Change not found"}
+    def __init__(self):
+        self.uri, self.user, self.password = _credentials()
 
-            return dict(rec)
+        self.driver = AsyncGraphDatabase.driver(
+            self.uri,
+            auth=(self.user, self.password),
+            **_driver_config(),
+        )
+        self.statute_cache = StatuteIntervalCache()
 
-        except Neo4jError as e:
-            return {"error": "Neo4j query failed", "detail": str(e)}
+    async def close(self):
+        if self.driver:
+            await self.driver.close()
 
-    # --------------------------------------------------
-    # AMENDMENT BY ID
-    # --------------------------------------------------
-    def get_amendment_detail(self, amend_id: str) -> Dict[str, Any]:
-        amend_id = amend_id.strip()
-
-        cypher = """
-        MATCH (am:Amendment {amend_id:$amend_id})
-        RETURN am {
-            amend_id: am.amend_id,
-            date: toString(am.date),
-            am_title: am.am_title,
-            summary: am.summary,
-            section_no: am.section_no,
-            section_title: am.section_title,
-            act_id: am.act_id,
-            jurisdiction: am.jurisdiction
-        } AS amendment
-        """
+    async def ping(self) -> bool:
+        try:
+            await self.driver.verify_connectivity()
+            return True
+        except Exception:
+            return False
 
+    async def _all(self, name: str, cypher: str, **params) -> List[Dict[str, Any]]:
+        async with self.driver.session() as session:
+            records, _ = await metrics.run_async(session, name, _query(cypher), **params)
+        return [dict(r) for r in records]
+
+    async def _execute(self, read) -> Dict[str, Any]:
+        if not isinstance(read, _Read):
+            return read
         try:
-            with self.driver.session() as session:
-                rec = session.run(
-                    cypher,
-                    amend_id=amend_id
-                ).single()
+            return read.shape(await self._all(read.name, read.cypher, **read.params))
+        except Neo4jError as e:
+            return _neo4j_error(e)
 
-            if not rec:
-                return {"error": "Amendment not found"}
+    async def get_statute_as_of(self, act_id: str, as_of_date: str) -> Dict[str, Any]:
+        return await self._execute(self._statute_as_of(act_id, as_of_date))
 
-            return dict(rec)
+    async def get_section_timeline(self, act_id: str, section_no: str) -> Dict[str, Any]:
+        return await self._execute(self._section_timeline(act_id, section_no))
 
-        except Neo4jError as e:
-            return {"error": "Neo4j query failed", "detail": str(e)}
+    async def get_change_detail(self, after_version_id: str) -> Dict[str, Any]:
+        return await self._execute(self._change_detail(after_version_id))
 
-    # --------------------------------------------------
-    # AMENDMENTS BY DATE
-    # --------------------------------------------------
-    def get_amendments_by_date(self, as_of_date: str) -> Dict[str, Any]:
-        as_of_date = as_of_date.strip()
+    async def get_section_timelines(self, act_id: str, section_nos: List[str]) -> Dict[str, Any]:
+        return await self._execute(self._section_timelines(act_id, section_nos))
 
-        cypher = """
-        MATCH (am:Amendment)
-        WHERE am.date IS NOT NULL AND am.date <= date($as_of_date)
-        RETURN am {
-            amend_id: am.amend_id,
-            date: toString(am.date),
-            am_title: am.am_title,
-            summary: am.summary,
-            section_no: am.section_no,
-            section_title: am.section_title,
-            act_id: am.act_id,
-            jurisdiction: am.jurisdiction
-        } AS amendment
-        ORDER BY am.date
-        """
+    async def get_change_details(self, after_version_ids: List[str]) -> Dict[str, Any]:
+        return await self._execute(self._change_details(after_version_ids))
 
-        try:
-            with self.driver.session() as session:
-                result = session.run(
-                    cypher,
-                    as_of_date=as_of_date
-                )
-                amendments = [r["amendment"] for r in result]
+    async def get_amendment_detail(self, amend_id: str) -> Dict[str, Any]:
+        return await self._execute(self._amendment_detail(amend_id))
 
-            return {
-                "as_of_date": as_of_date,
-                "count": len(amendments),
-                "amendments": amendments
-            }
+    async def get_amendments_by_date(self, as_of_date: str) -> Dict[str, Any]:
+        return await self._execute(self._amendments_by_date(as_of_date))
 
-        except Neo4jError as e:
-            return {"error": "Neo4j query failed", "detail": str(e)}
+    async def get_amendments_page(
+        self,
+        as_of_date: str,
+        limit: Optional[int] = None,
+        cursor: Tuple[Optional[str], Optional[str]] = (None, None),
+        act_id: Optional[str] = None,
+        jurisdiction: Optional[str] = None,
+        date_from: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return await self._execute(self._amendments_page(as_of_date, limit, cursor, act_id, jurisdiction, date_from))
@@ -0,0 +1,42 @@
+import base64
+from typing import Optional, Tuple
+
+AMENDMENT_PAGE_MAX = 1000
+# page size used internally when streaming the full history as NDJSON
+AMENDMENT_STREAM_CHUNK = 500
+
+
+def encode_cursor(date: str, amend_id: str) -> str:
+    """Opaque keyset cursor for the (date, amend_id) ordering of amendments."""
+    raw = f"{date}|{amend_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    if not cursor:
+        return None, None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date, amend_id = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split("|", 1)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    return date, amend_id
+
+
+def next_cursor(page: list, limit: Optional[int], has_more: bool) -> Optional[str]:
+    if not limit or not has_more or not page:
+        return None
+    last = page[-1]
+    return encode_cursor(last["date"], last["amend_id"])
+
+
+def page_response(as_of_date: str, rows: list, limit: Optional[int]) -> dict:
+    """rows holds up to limit + 1 amendments; the extra one only signals has_more."""
+    has_more = bool(limit) and len(rows) > limit
+    page = rows[:limit] if limit else rows
+    return {
+        "as_of_date": as_of_date,
+        "count": len(page),
+        "amendments": page,
+        "next_cursor": next_cursor(page, limit, has_more),
+    }
@@ -0,0 +1,12 @@
+def normalize_section_no(section_no) -> str:
+    """
+    Canonical section number used for exact-match lookups.
+    Mirrors the Cypher expression toLower(replace(trim(s.section_no), " ", ""))
+    used by scripts/migrate_section_no_norm.py.
+    """
+    return str(section_no or "").strip().replace(" ", "").lower()
+
+
+def act_section_key(act_id: str, section_no) -> str:
+    """Composite (act_id, section_no_norm) lookup key stored as Section.act_section."""
+    return f"{(act_id or '').strip()}::{normalize_section_no(section_no)}"
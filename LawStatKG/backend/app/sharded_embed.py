@@ -0,0 +1,171 @@
+import os
+import json
+import pickle
+import shutil
+import hashlib
+from pathlib import Path
+from multiprocessing import get_context
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from app.embedding_cache import embedding_cache
+
+
+EMBED_SHARD_SIZE = int(os.getenv("EMBED_SHARD_SIZE", "2048"))
+EMBED_WORKERS = int(os.getenv("EMBED_WORKERS", "1"))
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+
+
+def _fingerprint(texts: List[str], model_name: str, shard_size: int) -> str:
+    h = hashlib.sha256()
+    h.update(model_name.encode("utf-8"))
+    h.update(str(shard_size).encode("utf-8"))
+    for t in texts:
+        h.update(hashlib.md5((t or "").encode("utf-8")).digest())
+    return h.hexdigest()
+
+
+def _shard_paths(checkpoint_dir: Path, i: int):
+    return checkpoint_dir / f"shard_{i:05d}.npy", checkpoint_dir / f"shard_{i:05d}.tokens.pkl"
+
+
+# -----------------------------
+# Worker side (one model per process)
+# -----------------------------
+_model = None
+_model_name = None
+
+
+def _init_worker(model_name: str, threads: int):
+    global _model, _model_name
+    if threads:
+        try:
+            import torch
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+    from sentence_transformers import SentenceTransformer
+    _model = SentenceTransformer(model_name)
+    _model_name = model_name
+
+
+def _encode_shard(job):
+    i, texts, checkpoint_dir, batch_size, tokenizer = job
+    emb_path, tok_path = _shard_paths(Path(checkpoint_dir), i)
+
+    # unchanged texts from earlier builds come straight from the embedding cache
+    emb = embedding_cache.encode(
+        _model,
+        _model_name,
+        texts,
+        normalize_embeddings=True,
+        batch_size=batch_size,
+        show_progress_bar=False,
+    ).astype(np.float32)
+    tokens = [tokenizer(t) for t in texts] if tokenizer else None
+
+    # tokens first, vectors last: a shard counts as done once its .npy exists
+    tmp = tok_path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(tokens, f)
+    os.replace(tmp, tok_path)
+
+    tmp = emb_path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, emb)
+    os.replace(tmp, emb_path)
+    return i
+
+
+# -----------------------------
+# Driver
+# -----------------------------
+def build_embeddings(
+    texts: List[str],
+    model_name: str,
+    out_path: Path,
+    checkpoint_dir: Path,
+    tokenizer: Optional[Callable[[str], List[str]]] = None,
+    shard_size: int = EMBED_SHARD_SIZE,
+    batch_size: int = EMBED_BATCH_SIZE,
+    workers: int = EMBED_WORKERS,
+) -> Optional[List[List[str]]]:
+    """
+    Encode texts shard by shard into checkpoint_dir, then assemble the shards
+    into out_path (.npy, written through a memmap so the full matrix never
+    has to sit in RAM twice).
+
+    An interrupted build resumes from the shards already on disk as long as
+    the texts, model and shard size are unchanged; otherwise the checkpoint
+    directory is started over. Returns the per-text token lists when a
+    tokenizer is given (tokenized alongside encoding, also checkpointed).
+    """
+    checkpoint_dir = Path(checkpoint_dir)
+    out_path = Path(out_path)
+    shard_size = max(int(shard_size), 1)
+    n_shards = (len(texts) + shard_size - 1) // shard_size
+
+    manifest_path = checkpoint_dir / "manifest.json"
+    fingerprint = _fingerprint(texts, model_name, shard_size)
+    if manifest_path.exists():
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            if json.load(f).get("fingerprint") != fingerprint:
+                shutil.rmtree(checkpoint_dir)
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"fingerprint": fingerprint, "model": model_name, "count": len(texts),
+                   "shard_size": shard_size, "shards": n_shards}, f, indent=2)
+
+    pending = [i for i in range(n_shards) if not _shard_paths(checkpoint_dir, i)[0].exists()]
+    if n_shards - len(pending):
+        print(f"Resuming embedding build: {n_shards - len(pending)}/{n_shards} shards already done")
+
+    jobs = (
+        (i, texts[i * shard_size:(i + 1) * shard_size], str(checkpoint_dir), batch_size, tokenizer)
+        for i in pending
+    )
+
+    workers = max(1, min(int(workers), len(pending) or 1))
+    if not pending:
+        pass
+    elif workers == 1:
+        _init_worker(model_name, 0)
+        for done, i in enumerate(map(_encode_shard, jobs), 1):
+            print(f"  shard {i + 1}/{n_shards} encoded ({done}/{len(pending)} this run)")
+    else:
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        with get_context("spawn").Pool(workers, initializer=_init_worker, initargs=(model_name, threads)) as pool:
+            for done, i in enumerate(pool.imap_unordered(_encode_shard, jobs), 1):
+                print(f"  shard {i + 1}/{n_shards} encoded ({done}/{len(pending)} this run)")
+
+    return _assemble(checkpoint_dir, n_shards, len(texts), out_path, tokenizer is not None)
+
+
+def _assemble(checkpoint_dir: Path, n_shards: int, count: int, out_path: Path, with_tokens: bool):
+    tokens: Optional[List[List[str]]] = [] if with_tokens else None
+    out = None
+    row = 0
+    tmp = out_path.with_name(out_path.name + ".tmp")
+
+    for i in range(n_shards):
+        emb_path, tok_path = _shard_paths(checkpoint_dir, i)
+        shard = np.load(emb_path, mmap_mode="r")
+        if out is None:
+            out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float32, shape=(count, shard.shape[1]))
+        out[row:row + len(shard)] = shard
+        row += len(shard)
+        if with_tokens:
+            with open(tok_path, "rb") as f:
+                tokens.extend(pickle.load(f))
+
+    if out is None:
+        raise RuntimeError("No texts to embed.")
+    out.flush()
+    del out
+    os.replace(tmp, out_path)
+    return tokens
+
+
+def clear_checkpoints(checkpoint_dir: Path):
+    shutil.rmtree(checkpoint_dir, ignore_errors=True)
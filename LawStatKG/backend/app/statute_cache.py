@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+
+STATUTE_CACHE_MAX_ACTS = int(os.getenv("STATUTE_CACHE_MAX_ACTS", "256"))
+STATUTE_CACHE_MAX_INTERVALS = int(os.getenv("STATUTE_CACHE_MAX_INTERVALS", "64"))
+# seconds before an entry is re-read from Neo4j (0 = never expire). The
+# invalidation endpoint only reaches the worker process that serves it, so
+# this is what bounds staleness in the other workers and for graph edits
+# that bypass the endpoint
+STATUTE_CACHE_TTL = float(os.getenv("STATUTE_CACHE_TTL", "300"))
+
+
+def _shift(iso: str, days: int) -> str:
+    return (date.fromisoformat(iso) + timedelta(days=days)).isoformat()
+
+
+def validity_interval(
+    sections: List[Dict[str, Any]],
+    prev_end: Optional[str] = None,
+    next_start: Optional[str] = None,
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Date interval [lo, hi] (inclusive, ISO strings, None = unbounded) during
+    which exactly this set of SectionVersions is in force.
+
+    lo/hi come from the returned valid_from/valid_to bounds, tightened by the
+    latest version that ended before the as-of date (prev_end) and the
+    earliest version that starts after it (next_start).
+    """
+    lo: Optional[str] = None
+    hi: Optional[str] = None
+
+    for s in sections:
+        vf = s.get("valid_from")
+        vt = s.get("valid_to")
+        if vf and (lo is None or vf > lo):
+            lo = vf
+        if vt and (hi is None or vt < hi):
+            hi = vt
+
+    if prev_end:
+        after_prev = _shift(prev_end, 1)
+        if lo is None or after_prev > lo:
+            lo = after_prev
+
+    if next_start:
+        before_next = _shift(next_start, -1)
+        if hi is None or before_next < hi:
+            hi = before_next
+
+    return lo, hi
+
+
+class StatuteIntervalCache:
+    """
+    act_id -> list of (lo, hi, result). A lookup for any as-of date inside a
+    cached interval is a hit, so "today" and common historical dates are
+    served without touching Neo4j until the act is amended.
+    """
+    def __init__(
+        self,
+        max_acts: int = STATUTE_CACHE_MAX_ACTS,
+        max_intervals: int = STATUTE_CACHE_MAX_INTERVALS,
+        ttl: float = STATUTE_CACHE_TTL,
+    ):
+        self.max_acts = max_acts
+        self.max_intervals = max_intervals
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._acts: "OrderedDict[str, List[Tuple[Optional[str], Optional[str], float, Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, act_id: str, as_of_date: str) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            entries = self._acts.get(act_id)
+            if entries:
+                for lo, hi, stored_at, result in entries:
+                    if self.ttl and now - stored_at > self.ttl:
+                        continue
+                    if (lo is None or lo <= as_of_date) and (hi is None or as_of_date <= hi):
+                        self._acts.move_to_end(act_id)
+                        self.hits += 1
+                        return result
+            self.misses += 1
+            return None
+
+    def put(self, act_id: str, lo: Optional[str], hi: Optional[str], result: Dict[str, Any]):
+        now = time.monotonic()
+        with self._lock:
+            entries = self._acts.setdefault(act_id, [])
+            entries[:] = [
+                e for e in entries
+                if not (self.ttl and now - e[2] > self.ttl) and (e[0], e[1]) != (lo, hi)
+            ]
+            entries.append((lo, hi, now, result))
+            if len(entries) > self.max_intervals:
+                del entries[0]
+
+            self._acts.move_to_end(act_id)
+            while len(self._acts) > self.max_acts:
+                self._acts.popitem(last=False)
+
+    def invalidate(self, act_id: Optional[str] = None) -> int:
+        with self._lock:
+            if act_id is None:
+                n = len(self._acts)
+                self._acts.clear()
+                return n
+            return 1 if self._acts.pop(act_id, None) is not None else 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "acts": len(self._acts),
+                "intervals": sum(len(v) for v in self._acts.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,362 @@
+import os
+import json
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.dataset_source import default_data_path
+from app.doc_store import DocStore
+from app.pagination import AMENDMENT_PAGE_MAX, page_response
+from app.section_keys import normalize_section_no
+from app.version_diff import diff_versions
+from app.version_links import nearest_version, version_order
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def _days(iso: str) -> int:
+    return date.fromisoformat(iso).toordinal()
+
+
+def _read_sections(path: Path) -> List[Dict[str, Any]]:
+    # the columnar artifact (sections.cols/) or the JSON interchange copy
+    if DocStore.exists(path):
+        return list(DocStore(path))
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _amendment_view(am: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "amend_id": am.get("amend_id"),
+        "date": am.get("date"),
+        "am_title": am.get("am_title"),
+        "summary": am.get("summary"),
+        "section_no": am.get("section_no"),
+        "section_title": am.get("section_title"),
+        "act_id": am.get("act_id"),
+        "jurisdiction": am.get("jurisdiction"),
+    }
+
+
+class _ActIndex:
+    """
+    Elementary-interval index over one act: boundaries[i] is the first day of
+    interval i, in_force[i] the version indices valid throughout it.
+    """
+    def __init__(self, version_idx: List[int], versions: List[Dict[str, Any]]):
+        points = set()
+        for i in version_idx:
+            v = versions[i]
+            if v.get("valid_from"):
+                points.add(v["valid_from"])
+            if v.get("valid_to"):
+                points.add(date.fromordinal(_days(v["valid_to"]) + 1).isoformat())
+
+        # "" sorts before every ISO date and stands for the open lower end
+        self.boundaries: List[str] = [""] + sorted(points)
+        self.in_force: List[List[int]] = []
+        for b in self.boundaries:
+            probe = b or "0001-01-01"
+            self.in_force.append([
+                i for i in version_idx
+                if (not versions[i].get("valid_from") or versions[i]["valid_from"] <= probe)
+                and (not versions[i].get("valid_to") or versions[i]["valid_to"] >= probe)
+            ])
+
+    def at(self, as_of_date: str) -> List[int]:
+        return self.in_force[bisect_right(self.boundaries, as_of_date) - 1]
+
+
+class TemporalStatuteStore:
+    """
+    In-memory copy of the versioned statute graph, built from
+    artifacts/sections.cols (sections.json when there is no columnar store)
+    and data/amendments.json at startup.
+
+    Answers /statute, /timeline, /timeline/change and /amendments in the same
+    response shape as KGClient without a Neo4j round trip. Reloading builds a
+    new instance which the API swaps in, so readers never see a partial index.
+    """
+    def __init__(self, sections_path: Optional[Path] = None, amendments_path: Optional[Path] = None):
+        artifact_dir = Path(os.getenv("ARTIFACT_DIR", BACKEND_DIR / "artifacts"))
+        if sections_path is None:
+            sections_path = artifact_dir / "sections.cols"
+            if not DocStore.exists(sections_path):
+                sections_path = artifact_dir / "sections.json"
+        self.sections_path = Path(sections_path)
+        self.amendments_path = Path(
+            amendments_path or os.getenv("AMENDMENTS_PATH") or default_data_path("amendments.json")
+        )
+
+        self.ready = False
+        self._reset()
+
+    def _reset(self):
+        self.versions: List[Dict[str, Any]] = []
+        self.version_by_id: Dict[str, int] = {}
+        self.acts: Dict[str, Dict[str, Any]] = {}
+        self.act_index: Dict[str, _ActIndex] = {}
+        self.chains: Dict[Tuple[str, str], List[int]] = {}
+        self.prev_version: Dict[int, int] = {}
+
+        self.amendments: List[Dict[str, Any]] = []
+        self.amendment_dates: List[str] = []
+        self.amendment_keys: List[Tuple[str, str]] = []
+        # act_id / jurisdiction -> (sorted keys, positions into self.amendments)
+        self.amendments_by_act: Dict[str, Tuple[List[Tuple[str, str]], List[int]]] = {}
+        self.amendments_by_jurisdiction: Dict[str, Tuple[List[Tuple[str, str]], List[int]]] = {}
+        self.amendments_by_version: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        self._diff_cache: Dict[int, Dict[str, Any]] = {}
+
+    # -----------------------------
+    # Build
+    # -----------------------------
+    def load(self, sections: Optional[List[Dict[str, Any]]] = None):
+        if sections is None:
+            sections = _read_sections(self.sections_path)
+
+        amendments: List[Dict[str, Any]] = []
+        if self.amendments_path.exists():
+            with open(self.amendments_path, "r", encoding="utf-8") as f:
+                amendments = json.load(f).get("amendments", [])
+
+        self._reset()
+        self._index_sections(sections)
+        self._index_amendments(amendments)
+        self.ready = True
+
+    def _index_sections(self, sections: List[Dict[str, Any]]):
+        by_act: Dict[str, List[int]] = defaultdict(list)
+        chains: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+
+        for s in sections:
+            act_id = (s.get("act_id") or "").strip()
+            section_no = str(s.get("section_no") or "").strip()
+            if not act_id or not s.get("version_id"):
+                continue
+
+            i = len(self.versions)
+            self.versions.append({**s, "act_id": act_id, "section_no": section_no})
+            self.version_by_id[s["version_id"]] = i
+            by_act[act_id].append(i)
+            chains[(act_id, normalize_section_no(section_no))].append(i)
+
+            if act_id not in self.acts:
+                self.acts[act_id] = {
+                    "act_id": act_id,
+                    "act_title": s.get("act_title"),
+                    "jurisdiction": s.get("jurisdiction"),
+                }
+
+        for act_id, idx in by_act.items():
+            self.act_index[act_id] = _ActIndex(idx, self.versions)
+
+        for key, idx in chains.items():
+            idx.sort(key=lambda i: version_order(self.versions[i].get("valid_from"), self.versions[i].get("version_id")))
+            self.chains[key] = idx
+            for before, after in zip(idx, idx[1:]):
+                self.prev_version[after] = before
+
+    def _index_amendments(self, amendments: List[Dict[str, Any]]):
+        rows = [
+            am for am in amendments
+            if (am.get("amend_id") or "").strip() and (am.get("date") or "").strip()
+        ]
+        rows.sort(key=lambda am: (am["date"], am["amend_id"]))
+        self.amendments = rows
+        self.amendment_dates = [am["date"] for am in rows]
+        self.amendment_keys = [(am["date"], am["amend_id"]) for am in rows]
+
+        for pos, am in enumerate(rows):
+            for group, value in (
+                (self.amendments_by_act, (am.get("act_id") or "").strip()),
+                (self.amendments_by_jurisdiction, (am.get("jurisdiction") or "").strip()),
+            ):
+                keys, positions = group.setdefault(value, ([], []))
+                keys.append(self.amendment_keys[pos])
+                positions.append(pos)
+
+        # same rule as load_amendments: link to the version whose valid_from
+        # is closest to the amendment date
+        for am in rows:
+            chain = self.chains.get(((am.get("act_id") or "").strip(), normalize_section_no(am.get("section_no"))))
+            dated = sorted(
+                (self.versions[i]["valid_from"], self.versions[i]["version_id"])
+                for i in (chain or []) if self.versions[i].get("valid_from")
+            )
+            version_id, _ = nearest_version(dated, am["date"])
+            if version_id is not None:
+                self.amendments_by_version[self.version_by_id[version_id]].append(am)
+
+    def _change(self, after: int) -> Optional[Dict[str, Any]]:
+        before = self.prev_version.get(after)
+        if before is None:
+            return None
+        if after not in self._diff_cache:
+            self._diff_cache[after] = diff_versions(
+                self.versions[before].get("text") or "",
+                self.versions[after].get("text") or "",
+            )
+        return self._diff_cache[after]
+
+    # -----------------------------
+    # Queries (KGClient-compatible)
+    # -----------------------------
+    def has_act(self, act_id: str) -> bool:
+        return act_id.strip() in self.acts
+
+    def get_statute_as_of(self, act_id: str, as_of_date: str) -> Dict[str, Any]:
+        act_id = act_id.strip()
+        index = self.act_index.get(act_id)
+        in_force = index.at(as_of_date.strip()) if index else []
+        if not in_force:
+            return {"error": "Act not found", "act_id": act_id}
+
+        return {
+            **self.acts[act_id],
+            "sections": [
+                {
+                    "version_id": v["version_id"],
+                    "section_no": v["section_no"],
+                    "section_title": v.get("section_title"),
+                    "text": v.get("text"),
+                    "valid_from": v.get("valid_from"),
+                    "valid_to": v.get("valid_to"),
+                    "current_status": v.get("current_status") or "active",
+                }
+                for v in (self.versions[i] for i in in_force)
+            ],
+        }
+
+    def get_section_timeline(self, act_id: str, section_no: str) -> Dict[str, Any]:
+        act_id = act_id.strip()
+        chain = self.chains.get((act_id, normalize_section_no(section_no)))
+        if not chain:
+            return {"error": "Section not found"}
+
+        timeline = []
+        for i in chain:
+            v = self.versions[i]
+            change = self._change(i)
+            entry = {
+                "version_id": v["version_id"],
+                "valid_from": v.get("valid_from"),
+                "valid_to": v.get("valid_to"),
+                "section_title": v.get("section_title"),
+                "text": v.get("text"),
+                "change_from_prev": None if change is None else {
+                    "summary": change["summary"],
+                    "added": change["added"],
+                    "removed": change["removed"],
+                },
+            }
+            linked = self.amendments_by_version.get(i) or [None]
+            for am in linked:
+                timeline.append({**entry, "amendment": _amendment_view(am) if am else None})
+
+        return {
+            **self.acts[act_id],
+            "section_no": self.versions[chain[0]]["section_no"],
+            "timeline": timeline,
+        }
+
+    def get_change_detail(self, after_version_id: str) -> Dict[str, Any]:
+        after = self.version_by_id.get(after_version_id.strip())
+        change = self._change(after) if after is not None else None
+        if change is None:
+            return {"error": "Change not found"}
+
+        before_v = self.versions[self.prev_version[after]]
+        after_v = self.versions[after]
+        linked = self.amendments_by_version.get(after) or []
+        am = linked[0] if linked else None
+
+        return {
+            "before_version": {
+                "version_id": before_v["version_id"],
+                "valid_from": before_v.get("valid_from"),
+                "text": before_v.get("text"),
+            },
+            "after_version": {
+                "version_id": after_v["version_id"],
+                "valid_from": after_v.get("valid_from"),
+                "text": after_v.get("text"),
+            },
+            "change": dict(change),
+            "amendment": None if am is None else {
+                "amend_id": am.get("amend_id"),
+                "date": am.get("date"),
+                "am_title": am.get("am_title"),
+                "summary": am.get("summary"),
+            },
+        }
+
+    def get_section_timelines(self, act_id: str, section_nos: List[str]) -> Dict[str, Any]:
+        act_id = act_id.strip()
+        return {
+            "act_id": act_id,
+            "timelines": {n.strip(): self.get_section_timeline(act_id, n) for n in section_nos if n.strip()}
+        }
+
+    def get_change_details(self, after_version_ids: List[str]) -> Dict[str, Any]:
+        return {
+            "changes": {v.strip(): self.get_change_detail(v) for v in after_version_ids if v.strip()}
+        }
+
+    def get_amendments_by_date(self, as_of_date: str) -> Dict[str, Any]:
+        as_of_date = as_of_date.strip()
+        amendments = [_amendment_view(am) for am in self.amendments[:bisect_right(self.amendment_dates, as_of_date)]]
+        return {
+            "as_of_date": as_of_date,
+            "count": len(amendments),
+            "amendments": amendments
+        }
+
+    def get_amendments_page(
+        self,
+        as_of_date: str,
+        limit: Optional[int] = None,
+        cursor: Tuple[Optional[str], Optional[str]] = (None, None),
+        act_id: Optional[str] = None,
+        jurisdiction: Optional[str] = None,
+        date_from: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Keyset page over (date, amend_id); cursor is the last key of the previous page."""
+        as_of_date = as_of_date.strip()
+        limit = limit or AMENDMENT_PAGE_MAX
+
+        if act_id:
+            keys, positions = self.amendments_by_act.get(act_id.strip(), ([], []))
+        elif jurisdiction:
+            keys, positions = self.amendments_by_jurisdiction.get(jurisdiction.strip(), ([], []))
+        else:
+            keys, positions = self.amendment_keys, range(len(self.amendments))
+
+        lo = bisect_left(keys, (date_from, "")) if date_from else 0
+        if cursor[0] is not None:
+            lo = max(lo, bisect_right(keys, (cursor[0], cursor[1] or "")))
+        hi = bisect_right(keys, (as_of_date, "\uffff"))
+
+        rows = []
+        for pos in positions[lo:hi]:
+            am = self.amendments[pos]
+            if act_id and jurisdiction and (am.get("jurisdiction") or "").strip() != jurisdiction.strip():
+                continue
+            rows.append(_amendment_view(am))
+            if len(rows) > limit:
+                break
+
+        return page_response(as_of_date, rows, limit)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "acts": len(self.acts),
+            "versions": len(self.versions),
+            "sections": len(self.chains),
+            "amendments": len(self.amendments),
+        }
@@ -0,0 +1,32 @@
+import hashlib
+from difflib import unified_diff
+from typing import Any, Dict
+
+MAX_DIFF_CHARS = 12000
+
+
+def text_hash(text: str) -> str:
+    """Fingerprint of a SectionVersion text, stored as sv.text_hash and on NEXT_VERSION."""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()[:16]
+
+
+def diff_versions(before_text: str, after_text: str) -> Dict[str, Any]:
+    """
+    Line diff between two SectionVersion texts, in the shape stored on
+    NEXT_VERSION relationships (diff / summary / added / removed).
+    """
+    lines = list(unified_diff(
+        (before_text or "").splitlines(),
+        (after_text or "").splitlines(),
+        lineterm=""
+    ))
+
+    added = sum(1 for line in lines if line.startswith("+") and not line.startswith("+++"))
+    removed = sum(1 for line in lines if line.startswith("-") and not line.startswith("---"))
+
+    return {
+        "diff": "\n".join(lines)[:MAX_DIFF_CHARS],
+        "summary": f"Added: {added}, Removed: {removed}",
+        "added": added,
+        "removed": removed,
+    }
@@ -0,0 +1,42 @@
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import List, Optional, Tuple
+
+
+def _days(iso: str) -> int:
+    return date.fromisoformat(iso).toordinal()
+
+
+def version_order(valid_from: Optional[str], version_id: Optional[str] = None) -> Tuple[bool, str, str]:
+    """
+    Sort key for the versions of one section: by valid_from, undated
+    versions last, version_id breaking ties. build_timeline_links (the
+    NEXT_VERSION links) and the temporal store (prev_version) both use it.
+    """
+    return (not valid_from, valid_from or "", version_id or "")
+
+
+def nearest_version(dated: List[Tuple[str, str]], target: str) -> Tuple[Optional[str], bool]:
+    """
+    Version whose valid_from is closest to the target date.
+
+    dated holds (valid_from, version_id) pairs sorted by valid_from. Only the
+    two neighbours around the bisect point can be closest. On a tie the
+    earlier version wins and the match is flagged ambiguous.
+    Returns (version_id, ambiguous).
+    """
+    if not dated:
+        return None, False
+
+    i = bisect_left(dated, (target, ""))
+    t = _days(target)
+    candidates = [dated[j] for j in (i - 1, i) if 0 <= j < len(dated)]
+    deltas = [abs(_days(vf) - t) for vf, _ in candidates]
+    best = min(deltas)
+    winners = [c for c, d in zip(candidates, deltas) if d == best]
+
+    # versions sharing the winning valid_from are equally close as well
+    best_from = winners[0][0]
+    first = bisect_left(dated, (best_from, ""))
+    same_day = bisect_right(dated, (best_from, "\uffff")) - first
+    return dated[first][1], len(winners) > 1 or same_day > 1
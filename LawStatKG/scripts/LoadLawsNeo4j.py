@@ -1,6 +1,10 @@
 import os
+import sys
 import json
+import time
+import argparse
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 from neo4j import GraphDatabase
 from dotenv import load_dotenv
@@ -11,104 +15,206 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 ENV_PATH = PROJECT_ROOT / "backend" / ".env"
 load_dotenv(dotenv_path=ENV_PATH)
 
+# Ensure app import works from project root
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from app.query_metrics import metrics
+from app.section_keys import act_section_key, normalize_section_no
+from app.version_diff import text_hash
+
 NEO4J_URI = os.getenv("NEO4J_URI", "").strip()
 NEO4J_USER = os.getenv("NEO4J_USER", "").strip()
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "").strip()
 
 DATA_PATH = PROJECT_ROOT / "data" / "laws.json"
 
-
-def load_laws():
+# rows per UNWIND transaction / concurrent writer sessions
+LOAD_CHUNK_SIZE = int(os.getenv("LOAD_CHUNK_SIZE", "1000"))
+LOAD_WORKERS = int(os.getenv("LOAD_WORKERS", "4"))
+
+
+# -----------------------------
+# Cypher (one statement per chunk)
+# -----------------------------
+MERGE_ACTS_CYPHER = """
+UNWIND $rows AS row
+MERGE (a:Act {act_id: row.act_id})
+ON CREATE SET
+    a.law = row.law,
+    a.title = row.title,
+    a.chapter_no = row.chapter_no,
+    a.jurisdiction = row.jurisdiction,
+    a.enactment_date = CASE WHEN row.enactment_date IS NULL THEN NULL ELSE date(row.enactment_date) END,
+    a.effective_date = CASE WHEN row.effective_date IS NULL THEN NULL ELSE date(row.effective_date) END
+"""
+
+MERGE_SECTIONS_CYPHER = """
+UNWIND $rows AS row
+MATCH (a:Act {act_id: row.act_id})
+MERGE (s:Section {key: row.key})
+ON CREATE SET
+    s.section_no = row.section_no,
+    s.act_id = row.act_id
+SET
+    s.section_no_norm = row.section_no_norm,
+    s.act_section = row.act_section
+MERGE (a)-[:HAS_SECTION]->(s)
+"""
+
+MERGE_VERSIONS_CYPHER = """
+UNWIND $rows AS row
+MATCH (s:Section {key: row.key})
+MERGE (sv:SectionVersion {version_id: row.version_id})
+SET
+    sv.section_no      = row.section_no,
+    sv.title           = row.title,
+    sv.text            = row.text,
+    sv.text_hash       = row.text_hash,
+    sv.valid_from      = CASE WHEN row.valid_from IS NULL THEN NULL ELSE date(row.valid_from) END,
+    sv.valid_to        = CASE WHEN row.valid_to   IS NULL THEN NULL ELSE date(row.valid_to)   END,
+    sv.current_status  = row.current_status,
+    sv.citations       = row.citations,
+    sv.amended_by      = row.amended_by,
+    sv.repealed_by     = row.repealed_by
+MERGE (s)-[:HAS_VERSION]->(sv)
+"""
+
+
+# -----------------------------
+# Flatten laws.json into parameter rows
+# -----------------------------
+def flatten_acts(acts: list):
+    act_rows, section_rows, version_rows = [], [], []
+    seen_sections = set()
+
+    for act in acts:
+        act_id = act["act_id"]
+        act_rows.append({
+            "act_id": act_id,
+            "law": act.get("law"),
+            "title": act.get("title"),
+            "chapter_no": act.get("chapter_no"),
+            "jurisdiction": act.get("jurisdiction"),
+            "enactment_date": act.get("enactment_date"),
+            "effective_date": act.get("effective_date"),
+        })
+
+        for sec in act.get("sections", []):
+            section_key = f"{act_id}::S{sec['section_no']}"
+
+            # several versions of one section share a single Section row
+            if section_key not in seen_sections:
+                seen_sections.add(section_key)
+                section_rows.append({
+                    "key": section_key,
+                    "act_id": act_id,
+                    "section_no": sec["section_no"],
+                    "section_no_norm": normalize_section_no(sec["section_no"]),
+                    "act_section": act_section_key(act_id, sec["section_no"]),
+                })
+
+            version_rows.append({
+                "key": section_key,
+                "version_id": sec["version_id"],
+                "section_no": sec["section_no"],
+                "title": sec.get("title"),
+                "text": sec.get("text", ""),
+                "text_hash": text_hash(sec.get("text", "")),
+                "valid_from": sec.get("valid_from"),
+                "valid_to": sec.get("valid_to"),
+                "current_status": sec.get("current_status", "active"),
+                "citations": sec.get("citations", []),
+                "amended_by": sec.get("amended_by", []),
+                "repealed_by": sec.get("repealed_by"),
+            })
+
+    return act_rows, section_rows, version_rows
+
+
+def chunked(rows: list, size: int):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+# -----------------------------
+# Writers
+# -----------------------------
+def _write_chunk(tx, name: str, cypher: str, rows: list):
+    metrics.run(tx, name, cypher, rows=rows)
+
+
+def write_stage(driver, name: str, cypher: str, rows: list, chunk_size: int, workers: int) -> float:
+    """
+    Write rows in chunks of chunk_size, one UNWIND transaction per chunk,
+    spread over `workers` sessions. Returns elapsed seconds.
+
+    Chunks of one stage never MERGE the same node twice (rows are unique by
+    key), so the only contention is on shared parent nodes; execute_write
+    retries the transient lock errors that can cause.
+    """
+    start = time.perf_counter()
+
+    def run(chunk):
+        with driver.session() as session:
+            session.execute_write(_write_chunk, name, cypher, chunk)
+        return len(chunk)
+
+    chunks = list(chunked(rows, chunk_size))
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            run(chunk)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(run, chunks))
+
+    elapsed = time.perf_counter() - start
+    rate = len(rows) / elapsed if elapsed > 0 else 0.0
+    print(f"{name:<20} {len(rows):>8} rows in {len(chunks):>5} chunks  {elapsed:8.2f}s  {rate:10.0f} rows/s")
+    return elapsed
+
+
+def load_laws(chunk_size: int = LOAD_CHUNK_SIZE, workers: int = LOAD_WORKERS, data_path: Path = DATA_PATH):
     if not NEO4J_URI or not NEO4J_USER or not NEO4J_PASSWORD:
         raise RuntimeError(
             f"Missing Neo4j env vars. Ensure {ENV_PATH} has NEO4J_URI/NEO4J_USER/NEO4J_PASSWORD."
         )
 
-    if not DATA_PATH.exists():
-        raise FileNotFoundError(f"laws.json not found at: {DATA_PATH}")
+    if not data_path.exists():
+        raise FileNotFoundError(f"laws.json not found at: {data_path}")
 
-    with open(DATA_PATH, "r", encoding="utf-8") as f:
+    with open(data_path, "r", encoding="utf-8") as f:
         acts = json.load(f)
 
-    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
-
-    with driver.session() as session:
-        for act in acts:
-            print(f"Loading act: {act.get('act_id')} - {act.get('law')}")
-            session.execute_write(_create_act_with_sections, act)
-
-    driver.close()
-    print("Finished loading laws into Neo4j AuraDB.")
-
-
-def _create_act_with_sections(tx, act: dict):
-    tx.run(
-        """
-        MERGE (a:Act {act_id: $act_id})
-        ON CREATE SET
-            a.law = $law,
-            a.title = $title,
-            a.chapter_no = $chapter_no,
-            a.jurisdiction = $jurisdiction,
-            a.enactment_date = CASE WHEN $enactment_date IS NULL THEN NULL ELSE date($enactment_date) END,
-            a.effective_date = CASE WHEN $effective_date IS NULL THEN NULL ELSE date($effective_date) END
-        """,
-        act_id=act["act_id"],
-        law=act.get("law"),
-        title=act.get("title"),
-        chapter_no=act.get("chapter_no"),
-        jurisdiction=act.get("jurisdiction"),
-        enactment_date=act.get("enactment_date"),
-        effective_date=act.get("effective_date"),
+    act_rows, section_rows, version_rows = flatten_acts(acts)
+    print(f"Loading {len(act_rows)} acts, {len(section_rows)} sections, {len(version_rows)} versions "
+          f"(chunk_size={chunk_size}, workers={workers})")
+
+    driver = GraphDatabase.driver(
+        NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD),
+        max_connection_pool_size=max(workers, 1) + 1,
     )
 
-    for sec in act.get("sections", []):
-        section_key = f"{act['act_id']}::S{sec['section_no']}"
-
-        tx.run(
-            """
-            MERGE (s:Section {key: $key})
-            ON CREATE SET
-                s.section_no = $section_no,
-                s.act_id = $act_id
-            WITH s
-            MATCH (a:Act {act_id: $act_id})
-            MERGE (a)-[:HAS_SECTION]->(s)
-            """,
-            key=section_key,
-            section_no=sec["section_no"],
-            act_id=act["act_id"],
-        )
+    start = time.perf_counter()
+    try:
+        # stages run in order: sections MATCH their Act, versions MATCH their Section
+        write_stage(driver, "laws.merge_acts", MERGE_ACTS_CYPHER, act_rows, chunk_size, workers)
+        write_stage(driver, "laws.merge_sections", MERGE_SECTIONS_CYPHER, section_rows, chunk_size, workers)
+        write_stage(driver, "laws.merge_versions", MERGE_VERSIONS_CYPHER, version_rows, chunk_size, workers)
+    finally:
+        driver.close()
 
-        tx.run(
-            """
-            MATCH (s:Section {key: $key})
-            MERGE (sv:SectionVersion {version_id: $version_id})
-            SET
-                sv.section_no      = $section_no,
-                sv.title           = $title,
-                sv.text            = $text,
-                sv.valid_from      = CASE WHEN $valid_from IS NULL THEN NULL ELSE date($valid_from) END,
-                sv.valid_to        = CASE WHEN $valid_to   IS NULL THEN NULL ELSE date($valid_to)   END,
-                sv.current_status  = $current_status,
-                sv.citations       = $citations,
-                sv.amended_by      = $amended_by,
-                sv.repealed_by     = $repealed_by
-            MERGE (s)-[:HAS_VERSION]->(sv)
-            """,
-            key=section_key,
-            version_id=sec["version_id"],
-            section_no=sec["section_no"],
-            title=sec.get("title"),
-            text=sec.get("text", ""),
-            valid_from=sec.get("valid_from"),
-            valid_to=sec.get("valid_to"),
-            current_status=sec.get("current_status", "active"),
-            citations=sec.get("citations", []),
-            amended_by=sec.get("amended_by", []),
-            repealed_by=sec.get("repealed_by"),
-        )
+    total_rows = len(act_rows) + len(section_rows) + len(version_rows)
+    elapsed = time.perf_counter() - start
+    print(f"Finished loading laws into Neo4j AuraDB: {total_rows} rows in {elapsed:.2f}s "
+          f"({total_rows / elapsed if elapsed > 0 else 0.0:.0f} rows/s).")
+    print(metrics.report())
 
 
 if __name__ == "__main__":
-    load_laws()
+    parser = argparse.ArgumentParser(description="Load laws.json into Neo4j with batched UNWIND writes.")
+    parser.add_argument("--data", type=Path, default=DATA_PATH, help="path to laws.json")
+    parser.add_argument("--chunk-size", type=int, default=LOAD_CHUNK_SIZE, help="rows per transaction")
+    parser.add_argument("--workers", type=int, default=LOAD_WORKERS, help="concurrent writer sessions")
+    args = parser.parse_args()
+
+    load_laws(chunk_size=max(args.chunk_size, 1), workers=max(args.workers, 1), data_path=args.data)
@@ -1,25 +1,35 @@
 import os
 import json
+import argparse
 import pickle
 from pathlib import Path
 from typing import List, Dict, Any
 
-import numpy as np
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
-from rank_bm25 import BM25Okapi
-from sentence_transformers import SentenceTransformer
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 load_dotenv(PROJECT_ROOT / "backend" / ".env")
 
+# Ensure app import works from project root
+import sys
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from app.dataset_source import default_data_path, iter_case_law_docs
+from app.doc_store import write_doc_store
+from app.query_metrics import metrics
+from app.sharded_embed import build_embeddings, clear_checkpoints
+
 NEO4J_URI = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 MODEL_NAME = os.getenv("EMBED_MODEL", "nlpaueb/legal-bert-base-uncased")
+# "neo4j" (graph) or "file" (case-law corpus JSON files)
+ARTIFACT_SOURCE = os.getenv("ARTIFACT_SOURCE", "neo4j").strip().lower()
 
 ART_DIR = PROJECT_ROOT / "backend" / "case_law_artifacts"
 ART_DIR.mkdir(parents=True, exist_ok=True)
+CHECKPOINT_DIR = ART_DIR / "_embed_shards"
 
 
 def tokenize(text: str):
@@ -78,7 +88,7 @@ def fetch_case_law_docs() -> List[Dict[str, Any]]:
     """
     docs = []
     with driver.session() as session:
-        rows = session.run(cypher)
+        rows, _ = metrics.run(session, "caselaw.fetch_docs", cypher)
         for r in rows:
             base = {
                 "source_id": r["source_id"],
@@ -105,10 +115,35 @@ def fetch_case_law_docs() -> List[Dict[str, Any]]:
     return out
 
 
+def fetch_case_law_docs_from_files(paths: List[Path]) -> List[Dict[str, Any]]:
+    """Same docs as fetch_case_law_docs, read from the corpora loadCaseLaw ingests."""
+    seen = set()
+    out = []
+    for path in paths:
+        for d in iter_case_law_docs(path):
+            if d["case_id"] in seen:
+                continue
+            seen.add(d["case_id"])
+            out.append(d)
+    return out
+
+
 def main():
-    docs = fetch_case_law_docs()
-    if not docs:
-        raise RuntimeError("No case-law docs found in Neo4j.")
+    parser = argparse.ArgumentParser(description="Build BM25 + embedding artifacts for case-law search.")
+    parser.add_argument("--source", choices=["neo4j", "file"], default=ARTIFACT_SOURCE,
+                        help="read cases from the graph or straight from the corpus JSON")
+    parser.add_argument("--corpus", type=Path, action="append",
+                        help="case-law corpus JSON for --source file (repeatable, default data/civil_case_law.json)")
+    args = parser.parse_args()
+
+    if args.source == "file":
+        docs = fetch_case_law_docs_from_files(args.corpus or [default_data_path("civil_case_law.json")])
+        if not docs:
+            raise RuntimeError("No case-law docs found in the corpus files.")
+    else:
+        docs = fetch_case_law_docs()
+        if not docs:
+            raise RuntimeError("No case-law docs found in Neo4j.")
 
     texts = []
     for d in docs:
@@ -129,21 +164,26 @@ def main():
         ]).strip()
         texts.append(blob)
 
-    token_lists = [tokenize(t) for t in texts]
-    model = SentenceTransformer(MODEL_NAME)
-    emb = model.encode(texts, convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=True)
+    # sharded + resumable; an interrupted run picks up from CHECKPOINT_DIR
+    token_lists = build_embeddings(
+        texts,
+        MODEL_NAME,
+        out_path=ART_DIR / "embeddings.npy",
+        checkpoint_dir=CHECKPOINT_DIR,
+        tokenizer=tokenize,
+    )
 
     with open(ART_DIR / "docs.json", "w", encoding="utf-8") as f:
         json.dump(docs, f, ensure_ascii=False)
+    write_doc_store(docs, ART_DIR / "docs.cols")
 
     with open(ART_DIR / "bm25.pkl", "wb") as f:
         pickle.dump({"tokens": token_lists}, f)
 
-    np.save(ART_DIR / "embeddings.npy", emb)
-
     with open(ART_DIR / "meta.json", "w", encoding="utf-8") as f:
         json.dump({"count": len(docs), "model": MODEL_NAME}, f, ensure_ascii=False, indent=2)
 
+    clear_checkpoints(CHECKPOINT_DIR)
     print(f"Case-law artifacts built successfully. Total docs: {len(docs)}")
 
 if __name__ == "__main__":
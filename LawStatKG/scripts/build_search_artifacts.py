@@ -1,4 +1,5 @@
 import os
+import argparse
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -10,11 +11,17 @@ load_dotenv(PROJECT_ROOT / "backend" / ".env")
 import sys
 sys.path.insert(0, str(PROJECT_ROOT / "backend"))
 
-from app.hybrid_search import HybridSearchEngine
+from app.hybrid_search import ARTIFACT_SOURCE, HybridSearchEngine
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build BM25 + embedding artifacts for statute search.")
+    parser.add_argument("--source", choices=["neo4j", "file"], default=ARTIFACT_SOURCE,
+                        help="read sections from the graph or straight from laws.json")
+    parser.add_argument("--laws", type=Path, default=None, help="laws.json path for --source file")
+    args = parser.parse_args()
+
     engine = HybridSearchEngine()
-    print("Building artifacts (BM25 + embeddings) ...")
-    engine.build_and_save_artifacts()
-    print(f"Artifacts saved to: {engine.artifact_dir}")
\ No newline at end of file
+    print(f"Building artifacts (BM25 + embeddings) from {args.source} ...")
+    engine.build_and_save_artifacts(source=args.source, laws_path=args.laws)
+    print(f"Artifacts saved to: {engine.artifact_dir}")
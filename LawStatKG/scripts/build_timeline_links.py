@@ -1,69 +1,245 @@
 import os
+import time
+import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from difflib import unified_diff
 from neo4j import GraphDatabase
 from dotenv import load_dotenv
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 load_dotenv(PROJECT_ROOT / "backend" / ".env")
 
+# Ensure app import works from project root
+import sys
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from app.query_metrics import metrics
+from app.section_keys import act_section_key
+from app.version_diff import diff_versions, text_hash
+from app.version_links import version_order
+
 NEO4J_URI = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 
+# rows per UNWIND transaction / diff worker processes
+TIMELINE_CHUNK_SIZE = int(os.getenv("TIMELINE_CHUNK_SIZE", "500"))
+TIMELINE_WORKERS = int(os.getenv("TIMELINE_WORKERS", str(os.cpu_count() or 1)))
+
+
+# -----------------------------
+# Cypher
+# -----------------------------
+# version metadata only (no text): enough to decide which pairs are stale
+VERSION_META_CYPHER = """
+MATCH (s:Section)-[:HAS_VERSION]->(sv:SectionVersion)
+WHERE ($act_ids IS NULL OR s.act_id IN $act_ids)
+  AND ($act_sections IS NULL OR s.act_section IN $act_sections)
+OPTIONAL MATCH (sv)-[r:NEXT_VERSION]->(nxt:SectionVersion)
+RETURN s.key AS section_key,
+       sv.version_id AS version_id,
+       toString(sv.valid_from) AS valid_from,
+       sv.text_hash AS text_hash,
+       collect(CASE WHEN nxt IS NULL THEN NULL ELSE
+           {after_id: nxt.version_id, before_hash: r.before_hash, after_hash: r.after_hash}
+       END) AS links
+"""
+
+VERSION_TEXTS_CYPHER = """
+UNWIND $version_ids AS version_id
+MATCH (sv:SectionVersion {version_id: version_id})
+RETURN version_id, sv.text AS text
+"""
+
+SET_TEXT_HASH_CYPHER = """
+UNWIND $rows AS row
+MATCH (sv:SectionVersion {version_id: row.version_id})
+SET sv.text_hash = row.text_hash
+"""
+
+MERGE_NEXT_VERSION_CYPHER = """
+UNWIND $rows AS row
+MATCH (b:SectionVersion {version_id: row.before_id})
+MATCH (a:SectionVersion {version_id: row.after_id})
+CALL {
+    WITH b, row
+    MATCH (b)-[stale:NEXT_VERSION]->(other:SectionVersion)
+    WHERE other.version_id <> row.after_id
+    DELETE stale
+}
+MERGE (b)-[r:NEXT_VERSION]->(a)
+SET r.change_date = a.valid_from,
+    r.diff = row.diff,
+    r.summary = row.summary,
+    r.added = row.added,
+    r.removed = row.removed,
+    r.before_hash = row.before_hash,
+    r.after_hash = row.after_hash
+"""
+
+# last version of a chain must not point anywhere
+DELETE_NEXT_VERSION_CYPHER = """
+UNWIND $version_ids AS version_id
+MATCH (:SectionVersion {version_id: version_id})-[r:NEXT_VERSION]->()
+DELETE r
+"""
+
+
+def chunked(rows: list, size: int):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def _write_chunk(tx, name: str, cypher: str, **params):
+    metrics.run(tx, name, cypher, **params)
+
+
+def _fetch_meta(tx, act_ids, act_sections):
+    records, _ = metrics.run(
+        tx, "timeline.fetch_version_meta", VERSION_META_CYPHER,
+        act_ids=act_ids, act_sections=act_sections,
+    )
+    return [r.data() for r in records]
+
+
+def _fetch_texts(tx, version_ids: list):
+    records, _ = metrics.run(tx, "timeline.fetch_version_texts", VERSION_TEXTS_CYPHER, version_ids=version_ids)
+    return {r["version_id"]: r["text"] or "" for r in records}
+
+
+def _diff_pair(pair):
+    # top-level so ProcessPoolExecutor can pickle it
+    before_text, after_text = pair
+    return diff_versions(before_text, after_text)
 
-def build_links():
+
+# -----------------------------
+# Planning
+# -----------------------------
+def build_chains(meta: list):
+    """section_key -> versions ordered by valid_from (undated last, as ORDER BY did)."""
+    chains = defaultdict(list)
+    for row in meta:
+        chains[row["section_key"]].append(row)
+    for versions in chains.values():
+        versions.sort(key=lambda v: version_order(v["valid_from"], v["version_id"]))
+    return chains
+
+
+def _up_to_date(before: dict, after: dict) -> bool:
+    links = [l for l in before["links"] if l]
+    if len(links) != 1 or links[0]["after_id"] != after["version_id"]:
+        return False
+    return (
+        before["text_hash"] is not None and after["text_hash"] is not None
+        and links[0]["before_hash"] == before["text_hash"]
+        and links[0]["after_hash"] == after["text_hash"]
+    )
+
+
+def plan_links(chains: dict):
+    """
+    Returns (pairs, dangling): consecutive (before, after) version rows whose
+    NEXT_VERSION edge is missing, points elsewhere or was diffed from other
+    texts, and chain tails that still carry an outgoing edge.
+    """
+    pairs, dangling = [], []
+    for versions in chains.values():
+        for before, after in zip(versions, versions[1:]):
+            if not _up_to_date(before, after):
+                pairs.append((before, after))
+        tail = versions[-1]
+        if any(tail["links"]):
+            dangling.append(tail["version_id"])
+    return pairs, dangling
+
+
+# -----------------------------
+# Build
+# -----------------------------
+def compute_diffs(text_pairs: list, workers: int):
+    if workers <= 1 or len(text_pairs) < 2:
+        return [_diff_pair(p) for p in text_pairs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_diff_pair, text_pairs, chunksize=max(1, len(text_pairs) // (workers * 4))))
+
+
+def build_links(act_ids=None, act_sections=None, chunk_size: int = TIMELINE_CHUNK_SIZE, workers: int = TIMELINE_WORKERS):
     driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+    start = time.perf_counter()
 
-    with driver.session() as session:
-
-        rows = session.run("""
-        MATCH (s:Section)-[:HAS_VERSION]->(sv:SectionVersion)
-        WITH s, sv
-        ORDER BY sv.valid_from ASC
-        WITH s, collect(sv) AS versions
-        RETURN s.key AS section_key, versions
-        """).data()
-
-        for row in rows:
-            versions = row["versions"]
-            if len(versions) < 2:
-                continue
-
-            for i in range(len(versions)-1):
-                before = versions[i]
-                after = versions[i+1]
-
-                diff = "\n".join(unified_diff(
-                    (before.get("text") or "").splitlines(),
-                    (after.get("text") or "").splitlines(),
-                    lineterm=""
-                ))
-
-                added = sum(1 for line in diff.splitlines() if line.startswith("+") and not line.startswith("+++"))
-                removed = sum(1 for line in diff.splitlines() if line.startswith("-") and not line.startswith("---"))
-
-                session.run("""
-                MATCH (b:SectionVersion {version_id:$before_id})
-                MATCH (a:SectionVersion {version_id:$after_id})
-                MERGE (b)-[r:NEXT_VERSION]->(a)
-                SET r.change_date = a.valid_from,
-                    r.diff = $diff,
-                    r.summary = $summary,
-                    r.added = $added,
-                    r.removed = $removed
-                """,
-                before_id=before["version_id"],
-                after_id=after["version_id"],
-                diff=diff[:12000],
-                summary=f"Added: {added}, Removed: {removed}",
-                added=added,
-                removed=removed
-                )
-
-    driver.close()
-    print("Timeline links built successfully.")
+    try:
+        with driver.session() as session:
+            meta = session.execute_read(_fetch_meta, act_ids or None, act_sections or None)
+            chains = build_chains(meta)
+            pairs, dangling = plan_links(chains)
+
+            # texts only for versions that take part in a stale pair
+            needed = sorted({v["version_id"] for pair in pairs for v in pair})
+            texts = {}
+            for chunk in chunked(needed, chunk_size):
+                texts.update(session.execute_read(_fetch_texts, chunk))
+
+            # versions loaded before text_hash existed get it backfilled,
+            # and pairs whose edge already matches the real texts drop out
+            hash_rows = []
+            by_id = {row["version_id"]: row for row in meta}
+            for version_id, text in texts.items():
+                h = text_hash(text)
+                if by_id[version_id]["text_hash"] != h:
+                    by_id[version_id]["text_hash"] = h
+                    hash_rows.append({"version_id": version_id, "text_hash": h})
+            pairs = [(b, a) for b, a in pairs if not _up_to_date(b, a)]
+
+            diffs = compute_diffs([(texts[b["version_id"]], texts[a["version_id"]]) for b, a in pairs], workers)
+            link_rows = [
+                {
+                    "before_id": b["version_id"],
+                    "after_id": a["version_id"],
+                    "before_hash": b["text_hash"],
+                    "after_hash": a["text_hash"],
+                    **d,
+                }
+                for (b, a), d in zip(pairs, diffs)
+            ]
+
+            for chunk in chunked(hash_rows, chunk_size):
+                session.execute_write(_write_chunk, "timeline.set_text_hash", SET_TEXT_HASH_CYPHER, rows=chunk)
+            for chunk in chunked(link_rows, chunk_size):
+                session.execute_write(_write_chunk, "timeline.merge_next_version", MERGE_NEXT_VERSION_CYPHER, rows=chunk)
+            for chunk in chunked(dangling, chunk_size):
+                session.execute_write(_write_chunk, "timeline.delete_next_version", DELETE_NEXT_VERSION_CYPHER, version_ids=chunk)
+    finally:
+        driver.close()
+
+    total_pairs = sum(max(len(v) - 1, 0) for v in chains.values())
+    print(
+        f"Timeline links built successfully: {len(chains)} sections, {len(link_rows)}/{total_pairs} links rebuilt, "
+        f"{len(dangling)} removed, {len(hash_rows)} text hashes set in {time.perf_counter() - start:.2f}s."
+    )
+    print(metrics.report())
+
+
+def _act_section_arg(value: str) -> str:
+    act_id, sep, section_no = value.partition("::")
+    if not sep or not act_id.strip() or not section_no.strip():
+        raise argparse.ArgumentTypeError(f"expected act_id::section_no, got {value!r}")
+    return act_section_key(act_id, section_no)
 
 
 if __name__ == "__main__":
-    build_links()
+    parser = argparse.ArgumentParser(description="Incrementally build NEXT_VERSION links with diffs.")
+    parser.add_argument("--act-id", action="append", dest="act_ids", help="only sections of this act (repeatable)")
+    parser.add_argument("--act-section", action="append", dest="act_sections", type=_act_section_arg,
+                        help="only this section, as act_id::section_no (repeatable)")
+    parser.add_argument("--chunk-size", type=int, default=TIMELINE_CHUNK_SIZE, help="rows per transaction")
+    parser.add_argument("--workers", type=int, default=TIMELINE_WORKERS, help="diff worker processes")
+    args = parser.parse_args()
+
+    build_links(
+        act_ids=args.act_ids,
+        act_sections=args.act_sections,
+        chunk_size=max(args.chunk_size, 1),
+        workers=max(args.workers, 1),
+    )
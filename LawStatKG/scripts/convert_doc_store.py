@@ -0,0 +1,30 @@
+import argparse
+from pathlib import Path
+
+# Ensure app import works from project root
+import sys
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from app.doc_store import DocStore, convert_json_artifact
+
+DEFAULT_ARTIFACTS = [
+    PROJECT_ROOT / "backend" / "artifacts" / "sections.json",
+    PROJECT_ROOT / "backend" / "case_law_artifacts" / "docs.json",
+]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert sections.json / docs.json artifacts into columnar doc stores (<name>.cols/)."
+    )
+    parser.add_argument("json_paths", nargs="*", type=Path, help="JSON artifacts (default: both search artifacts)")
+    args = parser.parse_args()
+
+    for json_path in args.json_paths or DEFAULT_ARTIFACTS:
+        if not json_path.exists():
+            print(f"Skipping {json_path} (not found)")
+            continue
+        store_path = convert_json_artifact(json_path)
+        store = DocStore(store_path)
+        print(f"{json_path} -> {store_path}: {len(store)} docs, fields {store.kinds}")
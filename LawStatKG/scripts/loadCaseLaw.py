@@ -1,6 +1,8 @@
 import os
+import sys
 import json
-import hashlib
+import time
+import argparse
 from pathlib import Path
 from typing import Any, Dict, List
 
@@ -10,215 +12,268 @@ from neo4j import GraphDatabase
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 load_dotenv(PROJECT_ROOT / "backend" / ".env")
 
+# Ensure app import works from project root
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from app.dataset_source import CASE_LAW_SOURCE_TITLE, case_law_row, make_case_id
+from app.query_metrics import metrics
+
 NEO4J_URI = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 
-
-def norm_list(v):
-    if v is None:
-        return []
-    if isinstance(v, list):
-        return [str(x).strip() for x in v if str(x).strip()]
-    if isinstance(v, str):
-        return [v.strip()] if v.strip() else []
-    return [str(v).strip()]
-
-
-def make_case_id(prefix: str, case_name: str, citation: str) -> str:
-    raw = f"{prefix}|{case_name}|{citation}".encode("utf-8")
-    h = hashlib.md5(raw).hexdigest()[:12]
-    return f"{prefix}_{h}"
-
-
-def upsert_source(tx, source_id: str, title: str, chapter: str):
-    tx.run(
-        """
-        MERGE (s:CaseLawSource {source_id:$source_id})
-        SET s.title = $title,
-            s.chapter = $chapter
-        """,
-        source_id=source_id,
-        title=title,
-        chapter=chapter,
-    )
-
-
-def upsert_section(tx, source_id: str, section: Dict[str, Any]):
-    section_key = f"{source_id}::S{section['section_number']}"
-    tx.run(
-        """
-        MERGE (sec:CaseLawSection {section_key:$section_key})
-        SET sec.section_number = $section_number,
-            sec.title = $title,
-            sec.content = $content
-        WITH sec
-        MATCH (src:CaseLawSource {source_id:$source_id})
-        MERGE (src)-[:HAS_SECTION]->(sec)
-        """,
-        section_key=section_key,
-        section_number=section["section_number"],
-        title=section.get("title"),
-        content=section.get("content", ""),
-        source_id=source_id,
-    )
-
-
-def upsert_topic(tx, topic: str):
-    tx.run(
-        """
-        MERGE (t:CaseLawTopic {name:$topic})
-        """,
-        topic=topic,
-    )
-
-
-def upsert_case_law_under_section(tx, source_id: str, section_number: str, case_item: Dict[str, Any]):
-    prefix = f"{source_id}_s{section_number}"
-    case_id = make_case_id(prefix, case_item.get("case_name", ""), case_item.get("citation", ""))
-
-    topic = case_item.get("topic", "General")
-    held = norm_list(case_item.get("held"))
-    principle = norm_list(case_item.get("principle"))
-    relevant_laws = norm_list(case_item.get("relevant_laws"))
-    relevant_sections = norm_list(case_item.get("relevant_sections"))
-    if case_item.get("relevant_section"):
-        relevant_sections.extend(norm_list(case_item.get("relevant_section")))
-
-    tx.run(
-        """
-        MERGE (c:CaseLaw {case_id:$case_id})
-        SET c.case_name = $case_name,
-            c.citation = $citation,
-            c.facts = $facts,
-            c.held = $held,
-            c.principle = $principle,
-            c.topic = $topic,
-            c.court = $court,
-            c.relevant_laws = $relevant_laws,
-            c.relevant_sections = $relevant_sections,
-            c.amending_law = $amending_law
-        WITH c
-        MATCH (sec:CaseLawSection {section_key:$section_key})
-        MERGE (sec)-[:HAS_CASE_LAW]->(c)
-        """,
-        case_id=case_id,
-        case_name=case_item.get("case_name"),
-        citation=case_item.get("citation"),
-        facts=case_item.get("facts", ""),
-        held=held,
-        principle=principle,
-        topic=topic,
-        court=case_item.get("court", ""),
-        relevant_laws=relevant_laws,
-        relevant_sections=relevant_sections,
-        amending_law=case_item.get("amending_law", ""),
-        section_key=f"{source_id}::S{section_number}",
-    )
-
-    upsert_topic(tx, topic)
-    tx.run(
-        """
-        MATCH (c:CaseLaw {case_id:$case_id})
-        MATCH (t:CaseLawTopic {name:$topic})
-        MERGE (c)-[:HAS_TOPIC]->(t)
-        """,
-        case_id=case_id,
-        topic=topic,
-    )
-
-
-def upsert_topic_case_law(tx, source_id: str, topic_name: str, case_item: Dict[str, Any]):
-    prefix = f"{source_id}_topic_{topic_name}"
-    case_id = make_case_id(prefix, case_item.get("case_name", ""), case_item.get("citation", ""))
-
-    held = norm_list(case_item.get("held"))
-    principle = norm_list(case_item.get("principle"))
-    relevant_laws = norm_list(case_item.get("relevant_laws"))
-    relevant_sections = norm_list(case_item.get("relevant_sections"))
-    if case_item.get("relevant_section"):
-        relevant_sections.extend(norm_list(case_item.get("relevant_section")))
-
-    tx.run(
-        """
-        MERGE (c:CaseLaw {case_id:$case_id})
-        SET c.case_name = $case_name,
-            c.citation = $citation,
-            c.facts = $facts,
-            c.held = $held,
-            c.principle = $principle,
-            c.topic = $topic,
-            c.court = $court,
-            c.relevant_laws = $relevant_laws,
-            c.relevant_sections = $relevant_sections,
-            c.amending_law = $amending_law
-        WITH c
-        MATCH (src:CaseLawSource {source_id:$source_id})
-        MERGE (src)-[:HAS_TOPIC_CASE_LAW]->(c)
-        """,
-        case_id=case_id,
-        case_name=case_item.get("case_name"),
-        citation=case_item.get("citation"),
-        facts=case_item.get("facts", ""),
-        held=held,
-        principle=principle,
-        topic=topic_name,
-        court=case_item.get("court", ""),
-        relevant_laws=relevant_laws,
-        relevant_sections=relevant_sections,
-        amending_law=case_item.get("amending_law", ""),
-        source_id=source_id,
-    )
-
-    upsert_topic(tx, topic_name)
-    tx.run(
-        """
-        MATCH (c:CaseLaw {case_id:$case_id})
-        MATCH (t:CaseLawTopic {name:$topic})
-        MERGE (c)-[:HAS_TOPIC]->(t)
-        """,
-        case_id=case_id,
-        topic=topic_name,
-    )
+# rows per UNWIND transaction
+LOAD_CHUNK_SIZE = int(os.getenv("LOAD_CHUNK_SIZE", "1000"))
+
+CASE_FIELDS = [
+    "case_name", "citation", "facts", "held", "principle", "topic",
+    "court", "relevant_laws", "relevant_sections", "amending_law",
+]
+
+
+# -----------------------------
+# Cypher (one UNWIND statement per chunk)
+# -----------------------------
+MERGE_SOURCES_CYPHER = """
+UNWIND $rows AS row
+MERGE (s:CaseLawSource {source_id: row.source_id})
+SET s.title = row.title,
+    s.chapter = row.chapter
+"""
+
+MERGE_SECTIONS_CYPHER = """
+UNWIND $rows AS row
+MATCH (src:CaseLawSource {source_id: row.source_id})
+MERGE (sec:CaseLawSection {section_key: row.section_key})
+SET sec.section_number = row.section_number,
+    sec.title = row.title,
+    sec.content = row.content
+MERGE (src)-[:HAS_SECTION]->(sec)
+"""
+
+MERGE_TOPICS_CYPHER = """
+UNWIND $rows AS row
+MERGE (:CaseLawTopic {name: row.name})
+"""
+
+_SET_CASE = """
+MERGE (c:CaseLaw {case_id: row.case_id})
+SET c.case_name = row.case_name,
+    c.citation = row.citation,
+    c.facts = row.facts,
+    c.held = row.held,
+    c.principle = row.principle,
+    c.topic = row.topic,
+    c.court = row.court,
+    c.relevant_laws = row.relevant_laws,
+    c.relevant_sections = row.relevant_sections,
+    c.amending_law = row.amending_law
+WITH c, row
+MATCH (t:CaseLawTopic {name: row.topic})
+MERGE (c)-[:HAS_TOPIC]->(t)
+"""
+
+MERGE_SECTION_CASES_CYPHER = """
+UNWIND $rows AS row
+""" + _SET_CASE + """
+WITH c, row
+MATCH (sec:CaseLawSection {section_key: row.section_key})
+MERGE (sec)-[:HAS_CASE_LAW]->(c)
+"""
+
+MERGE_TOPIC_CASES_CYPHER = """
+UNWIND $rows AS row
+""" + _SET_CASE + """
+WITH c, row
+MATCH (src:CaseLawSource {source_id: row.source_id})
+MERGE (src)-[:HAS_TOPIC_CASE_LAW]->(c)
+"""
+
+# dry run: current state of the nodes a load would touch
+EXISTING_SECTIONS_CYPHER = """
+UNWIND $keys AS key
+MATCH (sec:CaseLawSection {section_key: key})
+RETURN key, sec.section_number AS section_number, sec.title AS title, sec.content AS content
+"""
+
+EXISTING_TOPICS_CYPHER = """
+UNWIND $keys AS key
+MATCH (t:CaseLawTopic {name: key})
+RETURN key
+"""
+
+EXISTING_CASES_CYPHER = """
+UNWIND $keys AS key
+MATCH (c:CaseLaw {case_id: key})
+RETURN key, properties(c) AS props
+"""
+
+
+# -----------------------------
+# Flatten the corpus into parameter rows
+# -----------------------------
+def build_rows(source_id: str, title: str, chapter: str, data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    case_ids are derived in Python exactly as before (prefix|case_name|citation),
+    so re-running the loader MERGEs onto the same nodes. A case repeated under
+    the same prefix collapses to one row (last occurrence wins, as it did when
+    each item was written in turn).
+    """
+    sections: Dict[str, Dict[str, Any]] = {}
+    section_cases: Dict[str, Dict[str, Any]] = {}
+    topic_cases: Dict[str, Dict[str, Any]] = {}
+    topics = set()
+
+    for sec in data.get("sections", []):
+        section_number = sec["section_number"]
+        section_key = f"{source_id}::S{section_number}"
+        sections[section_key] = {
+            "source_id": source_id,
+            "section_key": section_key,
+            "section_number": section_number,
+            "title": sec.get("title"),
+            "content": sec.get("content", ""),
+        }
+
+        prefix = f"{source_id}_s{section_number}"
+        for case_item in sec.get("case_laws", []):
+            case_id = make_case_id(prefix, case_item.get("case_name", ""), case_item.get("citation", ""))
+            row = case_law_row(case_id, case_item.get("topic", "General"), case_item)
+            row["section_key"] = section_key
+            section_cases[case_id] = row
+            topics.add(row["topic"])
+
+    for topic_name, items in data.get("case_laws_by_topic", {}).items():
+        prefix = f"{source_id}_topic_{topic_name}"
+        for case_item in items:
+            case_id = make_case_id(prefix, case_item.get("case_name", ""), case_item.get("citation", ""))
+            row = case_law_row(case_id, topic_name, case_item)
+            row["source_id"] = source_id
+            topic_cases[case_id] = row
+            topics.add(topic_name)
+
+    return {
+        "sources": [{"source_id": source_id, "title": title, "chapter": chapter}],
+        "sections": list(sections.values()),
+        "topics": [{"name": t} for t in sorted(topics)],
+        "section_cases": list(section_cases.values()),
+        "topic_cases": list(topic_cases.values()),
+    }
+
+
+def chunked(rows: list, size: int):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+# -----------------------------
+# Load
+# -----------------------------
+# (stage, cypher) in dependency order: later stages MATCH nodes created earlier
+STAGES = [
+    ("sources", MERGE_SOURCES_CYPHER),
+    ("sections", MERGE_SECTIONS_CYPHER),
+    ("topics", MERGE_TOPICS_CYPHER),
+    ("section_cases", MERGE_SECTION_CASES_CYPHER),
+    ("topic_cases", MERGE_TOPIC_CASES_CYPHER),
+]
+
+
+def _write_chunk(tx, name: str, cypher: str, rows: list):
+    metrics.run(tx, name, cypher, rows=rows)
+
+
+def write_rows(session, rows: Dict[str, List[Dict[str, Any]]], chunk_size: int):
+    for stage, cypher in STAGES:
+        stage_rows = rows[stage]
+        start = time.perf_counter()
+        for chunk in chunked(stage_rows, chunk_size):
+            session.execute_write(_write_chunk, f"caselaw.merge_{stage}", cypher, chunk)
+        elapsed = time.perf_counter() - start
+        rate = len(stage_rows) / elapsed if elapsed > 0 else 0.0
+        print(f"{stage:<14} {len(stage_rows):>8} rows  {elapsed:8.2f}s  {rate:10.0f} rows/s")
+
+
+# -----------------------------
+# Dry run
+# -----------------------------
+def _existing(session, name: str, cypher: str, keys: List[str]) -> Dict[str, Any]:
+    def work(tx):
+        records, _ = metrics.run(tx, name, cypher, keys=keys)
+        return {r["key"]: r for r in records}
+    return session.execute_read(work)
+
+
+def _diff(rows: List[Dict[str, Any]], key: str, existing: Dict[str, Any], fields: List[str], props) -> Dict[str, int]:
+    out = {"create": 0, "update": 0, "unchanged": 0}
+    for row in rows:
+        rec = existing.get(row[key])
+        if rec is None:
+            out["create"] += 1
+        elif any(props(rec).get(f) != row[f] for f in fields):
+            out["update"] += 1
+        else:
+            out["unchanged"] += 1
+    return out
+
+
+def plan_changes(session, rows: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, int]]:
+    """Compare the rows against the graph without writing anything."""
+    plan = {}
+
+    sections = rows["sections"]
+    existing = _existing(session, "caselaw.existing_sections", EXISTING_SECTIONS_CYPHER,
+                         [r["section_key"] for r in sections])
+    plan["sections"] = _diff(sections, "section_key", existing,
+                             ["section_number", "title", "content"], lambda r: dict(r))
+
+    topics = rows["topics"]
+    existing = _existing(session, "caselaw.existing_topics", EXISTING_TOPICS_CYPHER,
+                         [r["name"] for r in topics])
+    plan["topics"] = _diff(topics, "name", existing, [], lambda r: {})
+
+    for stage in ("section_cases", "topic_cases"):
+        cases = rows[stage]
+        existing = _existing(session, "caselaw.existing_cases", EXISTING_CASES_CYPHER,
+                             [r["case_id"] for r in cases])
+        plan[stage] = _diff(cases, "case_id", existing, CASE_FIELDS, lambda r: r["props"])
+
+    return plan
 
 
 def main():
-    import sys
-    if len(sys.argv) < 2:
-        raise RuntimeError("Usage: python scripts/load_case_law_dataset.py <json_path>")
+    parser = argparse.ArgumentParser(description="Load a case-law corpus JSON into Neo4j with batched UNWIND writes.")
+    parser.add_argument("json_path", help="path to the case-law corpus JSON")
+    parser.add_argument("--chunk-size", type=int, default=LOAD_CHUNK_SIZE, help="rows per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="report what would change without writing")
+    args = parser.parse_args()
 
-    json_path = sys.argv[1]
-    with open(json_path, "r", encoding="utf-8") as f:
+    with open(args.json_path, "r", encoding="utf-8") as f:
         raw = json.load(f)
 
     root_key = next(iter(raw.keys()))
     data = raw[root_key]
 
     source_id = root_key
-    title = "Civil Procedure Code Matrimonial Actions Case Law Corpus"
-    chapter = data.get("chapter", "")
+    rows = build_rows(source_id, CASE_LAW_SOURCE_TITLE, data.get("chapter", ""), data)
+    print(", ".join(f"{stage}={len(stage_rows)}" for stage, stage_rows in rows.items()))
 
     driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
 
-    with driver.session() as session:
-        session.execute_write(upsert_source, source_id, title, chapter)
-
-        for sec in data.get("sections", []):
-            session.execute_write(upsert_section, source_id, sec)
-            for case_item in sec.get("case_laws", []):
-                session.execute_write(
-                    upsert_case_law_under_section,
-                    source_id,
-                    sec["section_number"],
-                    case_item
-                )
-
-        for topic_name, topic_cases in data.get("case_laws_by_topic", {}).items():
-            for case_item in topic_cases:
-                session.execute_write(upsert_topic_case_law, source_id, topic_name, case_item)
-
-    driver.close()
-    print("Case law dataset loaded into Neo4j successfully.")
+    try:
+        with driver.session() as session:
+            if args.dry_run:
+                for stage, counts in plan_changes(session, rows).items():
+                    print(f"{stage:<14} create={counts['create']} update={counts['update']} unchanged={counts['unchanged']}")
+                print("Dry run: nothing written.")
+            else:
+                start = time.perf_counter()
+                write_rows(session, rows, max(args.chunk_size, 1))
+                print(f"Case law dataset loaded into Neo4j successfully in {time.perf_counter() - start:.2f}s.")
+    finally:
+        driver.close()
+
+    print(metrics.report())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
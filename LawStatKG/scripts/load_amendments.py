@@ -1,5 +1,9 @@
 import os
 import json
+import time
+import urllib.parse
+import urllib.request
+from collections import defaultdict
 from pathlib import Path
 from neo4j import GraphDatabase
 from dotenv import load_dotenv
@@ -7,14 +11,65 @@ from dotenv import load_dotenv
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 load_dotenv(PROJECT_ROOT / "backend" / ".env")
 
+# Ensure app import works from project root
+import sys
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from app.query_metrics import metrics
+from app.section_keys import act_section_key
+from app.version_links import nearest_version
+
 NEO4J_URI = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 
 AMENDMENTS_PATH = PROJECT_ROOT / "data" / "amendments.json"
 
-
-def load_amendments():
+# running LawStatKG API whose statute cache should be dropped after a load;
+# unless the loader runs on the API host, LAWSTATKG_ADMIN_TOKEN must match the API's
+LAWSTATKG_API_URL = (os.getenv("LAWSTATKG_API_URL") or "").strip().rstrip("/")
+LAWSTATKG_ADMIN_TOKEN = os.getenv("LAWSTATKG_ADMIN_TOKEN", "")
+
+# rows per UNWIND transaction
+LOAD_CHUNK_SIZE = int(os.getenv("LOAD_CHUNK_SIZE", "1000"))
+# refresh NEXT_VERSION links (build_timeline_links) for the sections a load touched
+REBUILD_TIMELINE_LINKS = os.getenv("REBUILD_TIMELINE_LINKS", "true").lower() == "true"
+
+
+# -----------------------------
+# Cypher
+# -----------------------------
+MERGE_AMENDMENTS_CYPHER = """
+UNWIND $rows AS row
+MERGE (am:Amendment {amend_id: row.amend_id})
+SET am.date = date(row.date),
+    am.am_title = row.am_title,
+    am.summary = row.summary,
+    am.section_no = row.section_no,
+    am.section_title = row.section_title,
+    am.act_id = row.act_id,
+    am.jurisdiction = row.jurisdiction
+"""
+
+# every dated version of every section touched by the batch
+SECTION_VERSION_DATES_CYPHER = """
+UNWIND $lookups AS lookup
+MATCH (s:Section {act_section: lookup.act_section})
+MATCH (:Act {act_id: lookup.act_id})-[:HAS_SECTION]->(s)
+MATCH (s)-[:HAS_VERSION]->(v:SectionVersion)
+WHERE v.valid_from IS NOT NULL
+RETURN lookup.act_section AS act_section, toString(v.valid_from) AS valid_from, v.version_id AS version_id
+"""
+
+LINK_VERSIONS_CYPHER = """
+UNWIND $rows AS row
+MATCH (v:SectionVersion {version_id: row.version_id})
+MATCH (am:Amendment {amend_id: row.amend_id})
+MERGE (v)-[:CHANGED_BY]->(am)
+"""
+
+
+def load_amendments(chunk_size: int = LOAD_CHUNK_SIZE):
     if not NEO4J_URI or not NEO4J_USER or not NEO4J_PASSWORD:
         raise RuntimeError("Missing Neo4j env vars in backend/.env")
 
@@ -29,71 +84,139 @@ def load_amendments():
         print("No amendments found in amendments.json")
         return
 
+    rows, skipped = clean_rows(amendments)
+    if skipped:
+        print(f"Skipped {len(skipped)} amendment(s) missing amend_id/act_id/section_no/date: {skipped}")
+
     driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
 
-    with driver.session() as session:
-        for am in amendments:
-            session.execute_write(_upsert_and_link, am)
-            print(f"Loaded + linked: {am.get('amend_id')}")
+    start = time.perf_counter()
+    try:
+        with driver.session() as session:
+            for chunk in chunked(rows, chunk_size):
+                session.execute_write(_write_chunk, "amendments.merge_amendments", MERGE_AMENDMENTS_CYPHER, chunk)
+
+            dated = session.execute_read(_fetch_version_dates, rows)
+            links, ambiguous, missing = assign_versions(rows, dated)
+
+            for chunk in chunked(links, chunk_size):
+                session.execute_write(_write_chunk, "amendments.link_versions", LINK_VERSIONS_CYPHER, chunk)
+    finally:
+        driver.close()
+
+    print(f"Done: {len(rows)} amendments loaded, {len(links)} linked in {time.perf_counter() - start:.2f}s.")
+    print_link_report(ambiguous, missing)
+    print(metrics.report())
+
+    rebuild_timeline_links(sorted({row["act_section"] for row in rows}))
+    invalidate_statute_cache(sorted({row["act_id"] for row in rows}))
+
+
+def clean_rows(amendments: list):
+    rows, skipped = [], []
+    for am in amendments:
+        row = {
+            "amend_id": (am.get("amend_id") or "").strip(),
+            "act_id": (am.get("act_id") or "").strip(),
+            "section_no": str(am.get("section_no") or "").strip(),
+            "date": (am.get("date") or "").strip(),
+            "am_title": am.get("am_title"),
+            "summary": am.get("summary"),
+            "section_title": am.get("section_title"),
+            "jurisdiction": am.get("jurisdiction"),
+        }
+        if not row["amend_id"] or not row["act_id"] or not row["section_no"] or not row["date"]:
+            # Skip broken rows safely
+            skipped.append(row["amend_id"] or "<no amend_id>")
+            continue
+        row["act_section"] = act_section_key(row["act_id"], row["section_no"])
+        rows.append(row)
+    return rows, skipped
+
+
+def chunked(rows: list, size: int):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def _write_chunk(tx, name: str, cypher: str, rows: list):
+    metrics.run(tx, name, cypher, rows=rows)
+
+
+def _fetch_version_dates(tx, rows: list):
+    """act_section -> [(valid_from, version_id)] sorted by valid_from, in one round trip."""
+    lookups = {row["act_section"]: {"act_id": row["act_id"], "act_section": row["act_section"]} for row in rows}
+    records, _ = metrics.run(
+        tx, "amendments.section_version_dates", SECTION_VERSION_DATES_CYPHER,
+        lookups=list(lookups.values()),
+    )
 
-    driver.close()
-    print("Done: Amendments loaded and linked.")
+    dated = defaultdict(list)
+    for r in records:
+        dated[r["act_section"]].append((r["valid_from"], r["version_id"]))
+    for versions in dated.values():
+        versions.sort()
+    return dated
+
+
+def assign_versions(rows: list, dated: dict):
+    """
+    Link each amendment to the version of its section whose valid_from is
+    closest to the amendment date. Returns (links, ambiguous, missing).
+    """
+    links, ambiguous, missing = [], [], []
+    for row in rows:
+        version_id, tie = nearest_version(dated.get(row["act_section"]) or [], row["date"])
+        if version_id is None:
+            missing.append(row)
+            continue
+        links.append({"amend_id": row["amend_id"], "version_id": version_id})
+        if tie:
+            ambiguous.append((row, version_id))
+    return links, ambiguous, missing
+
+
+def print_link_report(ambiguous: list, missing: list):
+    if missing:
+        print(f"Unlinked ({len(missing)}): no dated SectionVersion for the amended section")
+        for row in missing:
+            print(f"  {row['amend_id']}  {row['act_id']} s.{row['section_no']}  {row['date']}")
+    if ambiguous:
+        print(f"Ambiguous ({len(ambiguous)}): several versions equally close, earliest chosen")
+        for row, version_id in ambiguous:
+            print(f"  {row['amend_id']}  {row['act_id']} s.{row['section_no']}  {row['date']} -> {version_id}")
+
+
+def rebuild_timeline_links(act_sections):
+    if not REBUILD_TIMELINE_LINKS:
+        args = " ".join(f"--act-section '{key}'" for key in act_sections)
+        print(f"REBUILD_TIMELINE_LINKS=false; refresh the timeline with: python build_timeline_links.py {args}")
+        return
 
+    # incremental: only pairs whose texts or order changed are diffed again
+    from build_timeline_links import build_links
+    build_links(act_sections=act_sections)
 
-def _upsert_and_link(tx, am: dict):
-    amend_id = (am.get("amend_id") or "").strip()
-    act_id = (am.get("act_id") or "").strip()
-    section_no = str(am.get("section_no") or "").strip()
-    date_str = (am.get("date") or "").strip()
 
-    if not amend_id or not act_id or not section_no or not date_str:
-        # Skip broken rows safely
+def invalidate_statute_cache(act_ids):
+    if not LAWSTATKG_API_URL:
+        print("LAWSTATKG_API_URL not set; skipping statute cache invalidation")
         return
 
-    # 1) Create/Update Amendment node
-    tx.run(
-        """
-        MERGE (am:Amendment {amend_id:$amend_id})
-        SET am.date = date($date),
-            am.am_title = $am_title,
-            am.summary = $summary,
-            am.section_no = $section_no,
-            am.section_title = $section_title,
-            am.act_id = $act_id,
-            am.jurisdiction = $jurisdiction
-        """,
-        amend_id=amend_id,
-        date=date_str,
-        am_title=am.get("am_title"),
-        summary=am.get("summary"),
-        section_no=section_no,
-        section_title=am.get("section_title"),
-        act_id=act_id,
-        jurisdiction=am.get("jurisdiction"),
-    )
-
-    # 2) Link to the closest SectionVersion by date (robust)
-    # It finds the version in that section with valid_from closest to amendment date.
-    tx.run(
-        """
-        MATCH (a:Act {act_id:$act_id})-[:HAS_SECTION]->(s:Section)
-        WHERE trim(s.section_no) = trim($section_no) OR s.key ENDS WITH ("::S" + trim($section_no))
-
-        MATCH (s)-[:HAS_VERSION]->(v:SectionVersion)
-        WHERE v.valid_from IS NOT NULL
-
-        WITH v, abs(duration.inDays(v.valid_from, date($date)).days) AS delta
-        ORDER BY delta ASC
-        LIMIT 1
-
-        MATCH (am:Amendment {amend_id:$amend_id})
-        MERGE (v)-[:CHANGED_BY]->(am)
-        """,
-        act_id=act_id,
-        section_no=section_no,
-        date=date_str,
-        amend_id=amend_id,
-    )
+    # one call for the whole load: every act invalidated, the store rebuilt once
+    query = urllib.parse.urlencode([("act_id", a) for a in act_ids] + [("reload", "true")])
+    url = f"{LAWSTATKG_API_URL}/admin/statute-cache/invalidate?{query}"
+    headers = {"X-Admin-Token": LAWSTATKG_ADMIN_TOKEN} if LAWSTATKG_ADMIN_TOKEN else {}
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, method="POST", headers=headers), timeout=60) as resp:
+            print(f"Statute cache invalidated for {len(act_ids)} act(s): {resp.read().decode('utf-8')}")
+    except Exception as e:
+        # the graph is loaded but the API would keep serving the old intervals
+        raise SystemExit(
+            f"Amendments loaded, but statute cache invalidation failed: {e}\n"
+            "Loaders on another host need LAWSTATKG_ADMIN_TOKEN set here and on the API. "
+            f"Retry with: curl -X POST -H 'X-Admin-Token: ...' '{url}'"
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+import os
+from pathlib import Path
+from neo4j import GraphDatabase
+from dotenv import load_dotenv
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+load_dotenv(PROJECT_ROOT / "backend" / ".env")
+
+NEO4J_URI = os.getenv("NEO4J_URI")
+NEO4J_USER = os.getenv("NEO4J_USER")
+NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
+
+BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "1000"))
+
+INDEXES = [
+    """
+    CREATE INDEX section_act_section_no_norm IF NOT EXISTS
+    FOR (s:Section) ON (s.act_id, s.section_no_norm)
+    """,
+    """
+    CREATE INDEX section_act_section IF NOT EXISTS
+    FOR (s:Section) ON (s.act_section)
+    """,
+]
+
+# normalization must stay in sync with app/section_keys.normalize_section_no
+BACKFILL = """
+MATCH (a:Act)-[:HAS_SECTION]->(s:Section)
+WHERE s.section_no IS NOT NULL
+CALL {
+  WITH a, s
+  WITH s, coalesce(s.act_id, a.act_id) AS act_id,
+       toLower(replace(trim(s.section_no), " ", "")) AS norm
+  SET s.act_id = act_id,
+      s.section_no_norm = norm,
+      s.act_section = act_id + "::" + norm
+} IN TRANSACTIONS OF $batch_size ROWS
+"""
+
+
+def migrate():
+    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+    with driver.session() as session:
+        for q in INDEXES:
+            session.run(q).consume()
+
+        # CALL { } IN TRANSACTIONS needs an auto-commit transaction
+        summary = session.run(BACKFILL, batch_size=BATCH_SIZE).consume()
+        print(f"Sections updated: {summary.counters.properties_set // 3} (properties set: {summary.counters.properties_set})")
+
+        session.run("CALL db.awaitIndexes(300)").consume()
+    driver.close()
+    print("Section number normalization migration complete")
+
+
+if __name__ == "__main__":
+    migrate()
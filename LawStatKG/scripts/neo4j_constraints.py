@@ -23,6 +23,22 @@ def init_constraints():
             """
             CREATE CONSTRAINT section_version_id_unique IF NOT EXISTS
             FOR (sv:SectionVersion) REQUIRE sv.version_id IS UNIQUE
+            """,
+            """
+            CREATE CONSTRAINT amendment_id_unique IF NOT EXISTS
+            FOR (am:Amendment) REQUIRE am.amend_id IS UNIQUE
+            """,
+            """
+            CREATE INDEX amendment_date_id IF NOT EXISTS
+            FOR (am:Amendment) ON (am.date, am.amend_id)
+            """,
+            """
+            CREATE INDEX section_act_section_no_norm IF NOT EXISTS
+            FOR (s:Section) ON (s.act_id, s.section_no_norm)
+            """,
+            """
+            CREATE INDEX section_act_section IF NOT EXISTS
+            FOR (s:Section) ON (s.act_section)
             """
         ]
         for q in statements:
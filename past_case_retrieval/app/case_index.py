@@ -0,0 +1,394 @@
+import os
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.config import WEIGHTS
+from app.neo4j_driver import db
+
+
+CASE_INDEX_ENABLED = os.getenv("CASE_INDEX_ENABLED", "true").lower() == "true"
+# optional .npz snapshot: startup loads it and fetches only the cases added since
+CASE_INDEX_SNAPSHOT = os.getenv("CASE_INDEX_SNAPSHOT", "")
+# other workers' uploads are picked up by an id sync at most this often
+CASE_INDEX_REFRESH_S = float(os.getenv("CASE_INDEX_REFRESH_S", "30"))
+CASE_INDEX_PAGE_SIZE = int(os.getenv("CASE_INDEX_PAGE_SIZE", "1000"))
+# per-role candidates to start from: max(limit * factor, min), doubled while
+# unseen cases could still make the result list
+CANDIDATE_K_FACTOR = int(os.getenv("CANDIDATE_K_FACTOR", "4"))
+CANDIDATE_MIN_K = int(os.getenv("CANDIDATE_MIN_K", "10"))
+
+ROLES = ["facts", "issues", "arguments", "decisions"]
+PREVIEW_CHARS = 500
+
+logger = logging.getLogger("case_index")
+
+
+_CASE_FIELDS = """
+RETURN c.case_id AS case_id,
+       c.case_name AS case_name,
+       left(c.summary, 500) AS preview,
+       c.facts_embedding AS facts_embedding,
+       c.issues_embedding AS issues_embedding,
+       c.arguments_embedding AS arguments_embedding,
+       c.decisions_embedding AS decisions_embedding,
+       [(c)-[:INVOLVES_ISSUE]->(i) | i.name] AS issues
+"""
+
+CASES_PAGE_CYPHER = """
+MATCH (c:Case)
+WHERE c.case_id > $after
+WITH c ORDER BY c.case_id LIMIT $limit
+""" + _CASE_FIELDS
+
+CASES_BY_ID_CYPHER = """
+UNWIND $ids AS cid
+MATCH (c:Case {case_id: cid})
+""" + _CASE_FIELDS
+
+CASE_IDS_CYPHER = """
+MATCH (c:Case)
+RETURN c.case_id AS case_id
+"""
+
+
+def vector_index_score(cos):
+    # what db.index.vector.queryNodes reports for a cosine index, so the facts
+    # score (and the 0.50 cutoff / reason thresholds) keep their meaning
+    return (1 + cos) / 2
+
+
+def candidate_k(limit: int) -> int:
+    return max(limit * CANDIDATE_K_FACTOR, CANDIDATE_MIN_K)
+
+
+def _unit(v) -> Optional[np.ndarray]:
+    if v is None:
+        return None
+    v = np.asarray(v, dtype=np.float32)
+    n = np.linalg.norm(v)
+    return v / n if n else None
+
+
+class _State:
+    """One immutable generation of the index; writers swap in a new one."""
+
+    def __init__(self, case_ids, names, previews, issues, vectors, present):
+        self.case_ids: List[str] = case_ids
+        self.rows: Dict[str, int] = {cid: i for i, cid in enumerate(case_ids)}
+        self.names: List[Optional[str]] = names
+        self.previews: List[str] = previews
+        self.issues: List[List[str]] = issues
+        # role -> (n, dim) unit rows (zeros where missing), role -> (n,) bool
+        self.vectors: Dict[str, np.ndarray] = vectors
+        self.present: Dict[str, np.ndarray] = present
+
+    @classmethod
+    def empty(cls):
+        return cls([], [], [], [], {r: np.zeros((0, 0), dtype=np.float32) for r in ROLES},
+                   {r: np.zeros(0, dtype=bool) for r in ROLES})
+
+    def __len__(self):
+        return len(self.case_ids)
+
+
+class CaseIndex:
+    """
+    In-process copy of every Case's four role embeddings plus the fields
+    hybrid_search returns. Neo4j stays the system of record: the index is
+    loaded from it (or from a snapshot plus the cases added since), kept
+    current by store_case, and re-synced by case id every
+    CASE_INDEX_REFRESH_S seconds for cases written by other workers.
+
+    Searches read whatever generation is current without locking; writes
+    build the next generation under a lock.
+    """
+
+    def __init__(self, snapshot_path: str = CASE_INDEX_SNAPSHOT, refresh_s: float = CASE_INDEX_REFRESH_S):
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.refresh_s = refresh_s
+        self._state = _State.empty()
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._synced_at = 0.0
+
+    # -----------------------------
+    # Loading
+    # -----------------------------
+    def ensure_loaded(self):
+        if self._loaded:
+            # one caller refreshes, the rest keep searching the current generation
+            if time.monotonic() - self._synced_at >= self.refresh_s and self._lock.acquire(blocking=False):
+                try:
+                    self._sync_locked()
+                except Exception as e:
+                    logger.warning("case index sync failed: %s", e)
+                    self._synced_at = time.monotonic()
+                finally:
+                    self._lock.release()
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            start = time.perf_counter()
+            if self.snapshot_path and self.snapshot_path.exists():
+                self._state = self._read_snapshot(self.snapshot_path)
+                self._sync_locked()
+            else:
+                self._state = self._build(self._fetch_all())
+                self._synced_at = time.monotonic()
+            self._loaded = True
+            logger.info("case index loaded: %d cases in %.0f ms", len(self._state), (time.perf_counter() - start) * 1000)
+        self.save()
+
+    def _fetch_all(self) -> List[Dict[str, Any]]:
+        rows, after = [], ""
+        while True:
+            page = db.query(CASES_PAGE_CYPHER, {"after": after, "limit": CASE_INDEX_PAGE_SIZE}, name="case_index_page")
+            rows.extend(page)
+            if len(page) < CASE_INDEX_PAGE_SIZE:
+                return rows
+            after = page[-1]["case_id"]
+
+    def sync(self):
+        with self._lock:
+            self._sync_locked()
+
+    def _sync_locked(self):
+        ids = {r["case_id"] for r in db.query(CASE_IDS_CYPHER, name="case_index_ids")}
+        state = self._state
+        missing = [cid for cid in ids if cid not in state.rows]
+        removed = [cid for cid in state.case_ids if cid not in ids]
+
+        fetched = []
+        for i in range(0, len(missing), CASE_INDEX_PAGE_SIZE):
+            fetched.extend(db.query(
+                CASES_BY_ID_CYPHER, {"ids": missing[i:i + CASE_INDEX_PAGE_SIZE]}, name="case_index_fetch"
+            ))
+        if fetched or removed:
+            self._state = self._merge(state, set(removed), fetched)
+        self._synced_at = time.monotonic()
+
+    # -----------------------------
+    # Incremental updates
+    # -----------------------------
+    def upsert(self, case_id, case_name, summary, embeddings, issues):
+        """Add or replace one case; a no-op until the index has been loaded."""
+        if not self._loaded:
+            return
+        row = {
+            "case_id": case_id,
+            "case_name": case_name,
+            "preview": (summary or "")[:PREVIEW_CHARS],
+            "issues": [i.strip() for i in issues],
+            **{f"{r}_embedding": embeddings.get(r) for r in ROLES},
+        }
+        with self._lock:
+            self._state = self._merge(self._state, {case_id}, [row])
+
+    @staticmethod
+    def _merge(state: _State, drop_ids, rows: List[Dict[str, Any]]) -> _State:
+        """state minus drop_ids plus rows, without re-reading the kept rows."""
+        keep = np.array([cid not in drop_ids for cid in state.case_ids], dtype=bool)
+        idx = np.flatnonzero(keep)
+        dims = {r: state.vectors[r].shape[1] for r in ROLES if state.vectors[r].shape[1]}
+        add = CaseIndex._build(rows, dims)
+
+        vectors, present = {}, {}
+        for r in ROLES:
+            old = state.vectors[r][idx]
+            if old.shape[1] != add.vectors[r].shape[1]:
+                # no vectors for this role yet: the kept rows are all missing
+                old = np.zeros((len(idx), add.vectors[r].shape[1]), dtype=np.float32)
+            vectors[r] = np.concatenate([old, add.vectors[r]])
+            present[r] = np.concatenate([state.present[r][idx], add.present[r]])
+
+        return _State(
+            [state.case_ids[i] for i in idx] + add.case_ids,
+            [state.names[i] for i in idx] + add.names,
+            [state.previews[i] for i in idx] + add.previews,
+            [state.issues[i] for i in idx] + add.issues,
+            vectors,
+            present,
+        )
+
+    @staticmethod
+    def _build(rows: List[Dict[str, Any]], dims: Optional[Dict[str, int]] = None) -> _State:
+        vectors, present = {}, {}
+        for r in ROLES:
+            units = [_unit(row.get(f"{r}_embedding")) for row in rows]
+            # the index's dimension (else the most common one) wins; a stray
+            # size left by a model switch counts as missing
+            sizes = [len(u) for u in units if u is not None]
+            dim = (dims or {}).get(r) or (max(set(sizes), key=sizes.count) if sizes else 0)
+            m = np.zeros((len(rows), dim), dtype=np.float32)
+            mask = np.zeros(len(rows), dtype=bool)
+            for i, u in enumerate(units):
+                if u is not None and len(u) == dim:
+                    m[i] = u
+                    mask[i] = True
+            vectors[r], present[r] = m, mask
+
+        return _State(
+            [row["case_id"] for row in rows],
+            [row.get("case_name") for row in rows],
+            [row.get("preview") or "" for row in rows],
+            [list(row.get("issues") or []) for row in rows],
+            vectors,
+            present,
+        )
+
+    # -----------------------------
+    # Querying
+    # -----------------------------
+    def role_scores(self, state: _State, role: str, query) -> np.ndarray:
+        """Cosine of query against every case's role vector (0 where missing)."""
+        m = state.vectors[role]
+        q = _unit(query)
+        if q is None or len(q) != m.shape[1]:
+            return np.zeros(len(state), dtype=np.float32)
+        scores = m @ q
+        scores[~state.present[role]] = 0
+        return scores
+
+    def search(self, embeddings: Dict[str, List[float]], k: int = 20, weights: Dict[str, float] = WEIGHTS) -> List[Dict[str, Any]]:
+        """
+        Top-k cases by the weighted sum of all four role similarities. Only
+        cases with a facts embedding are candidates, as with the Neo4j
+        facts vector index.
+        """
+        self.ensure_loaded()
+        state = self._state
+        if not len(state):
+            return []
+
+        breakdown = {r: self.role_scores(state, r, embeddings[r]) for r in ROLES}
+        breakdown["facts"] = vector_index_score(breakdown["facts"])
+
+        total = sum(weights[r] * breakdown[r] for r in ROLES)
+        eligible = np.flatnonzero(state.present["facts"])
+        k = min(k, len(eligible))
+        if not k:
+            return []
+        top = eligible[np.argpartition(-total[eligible], k - 1)[:k]]
+        top = top[np.argsort(-total[top])]
+
+        return [self.hit(state, i, {r: float(breakdown[r][i]) for r in ROLES}) for i in top]
+
+    def fused_candidates(self, embeddings: Dict[str, List[float]], limit: int, min_score: float,
+                         weights: Dict[str, float] = WEIGHTS) -> List[Dict[str, Any]]:
+        """
+        Best `limit` cases scoring at least min_score, found from per-role
+        top-k lists instead of fully scoring every case (threshold-algorithm
+        style). A case outside a role's top-k scores at most that list's k-th
+        score there, so with non-negative weights
+            bound = sum(w_r * (score_r if listed else kth_r))
+        caps its fused score. Listed cases whose bound misses min_score are
+        dropped unscored; k doubles while a case in no list at all could still
+        qualify (sum(w_r * kth_r)).
+        """
+        # zero-weight roles cannot move the fused score; they only feed the breakdown
+        roles = [r for r in ROLES if weights[r] > 0]
+        if not roles or any(w < 0 for w in weights.values()):
+            # bounds only hold for non-negative weights
+            hits = self.search(embeddings, k=limit * CANDIDATE_K_FACTOR, weights=weights)
+            return [h for h in hits if sum(weights[r] * h["breakdown"][r] for r in ROLES) >= min_score][:limit]
+
+        self.ensure_loaded()
+        state = self._state
+        eligible = np.flatnonzero(state.present["facts"])
+        if not len(eligible):
+            return []
+
+        scores = {r: self.role_scores(state, r, embeddings[r])[eligible] for r in ROLES}
+        scores["facts"] = vector_index_score(scores["facts"])
+        # final_score is rounded to 4 places before the cutoff
+        cutoff = min_score - 5e-5
+
+        k = min(candidate_k(limit), len(eligible))
+        while True:
+            listed, kth = {}, {}
+            for r in roles:
+                top = np.argpartition(-scores[r], k - 1)[:k]
+                listed[r] = top
+                kth[r] = float(scores[r][top].min())
+
+            seen = np.unique(np.concatenate(list(listed.values())))
+            bound = np.zeros(len(seen))
+            for r in roles:
+                in_list = np.isin(seen, listed[r])
+                bound += weights[r] * np.where(in_list, scores[r][seen], kth[r])
+
+            survivors = seen[bound >= cutoff]
+            exact = sum(weights[r] * scores[r][survivors] for r in roles)
+            order = np.argsort(-exact)
+            ranked = [survivors[j] for j in order[:limit] if exact[j] >= cutoff]
+            floor = float(exact[order[limit - 1]]) if len(ranked) == limit else cutoff
+
+            unseen_bound = sum(weights[r] * kth[r] for r in roles)
+            if k == len(eligible) or unseen_bound < max(floor, cutoff):
+                break
+            k = min(k * 2, len(eligible))
+
+        return [self.hit(state, eligible[j], {r: float(scores[r][j]) for r in ROLES}) for j in ranked]
+
+    @staticmethod
+    def hit(state: _State, i: int, breakdown: Dict[str, float]) -> Dict[str, Any]:
+        return {
+            "case_id": state.case_ids[i],
+            "case_name": state.names[i],
+            "summary": state.previews[i],
+            "issues": state.issues[i],
+            "breakdown": breakdown,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": CASE_INDEX_ENABLED,
+            "loaded": self._loaded,
+            "cases": len(self._state),
+            "snapshot": str(self.snapshot_path) if self.snapshot_path else None,
+        }
+
+    # -----------------------------
+    # Snapshot
+    # -----------------------------
+    def save(self):
+        if not self.snapshot_path or not self._loaded:
+            return
+        state = self._state
+        arrays = {
+            "case_ids": np.array(state.case_ids, dtype=str),
+            "names": np.array([n or "" for n in state.names], dtype=str),
+            "previews": np.array(state.previews, dtype=str),
+            "issues": np.array([json.dumps(i, ensure_ascii=False) for i in state.issues], dtype=str),
+        }
+        for r in ROLES:
+            arrays[f"{r}_vectors"] = state.vectors[r]
+            arrays[f"{r}_present"] = state.present[r]
+
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, self.snapshot_path)
+
+    @staticmethod
+    def _read_snapshot(path: Path) -> _State:
+        with np.load(path) as z:
+            return _State(
+                [str(x) for x in z["case_ids"]],
+                [str(x) or None for x in z["names"]],
+                [str(x) for x in z["previews"]],
+                [json.loads(str(x)) for x in z["issues"]],
+                {r: z[f"{r}_vectors"] for r in ROLES},
+                {r: z[f"{r}_present"] for r in ROLES},
+            )
+
+
+case_index = CaseIndex()
@@ -0,0 +1,184 @@
+# Kept identical to LawStatKG/backend/app/embedding_cache.py: each service is built from its own
+# directory, so the module is copied rather than shared. Change both together.
+import os
+import time
+import logging
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+
+EMBED_CACHE_ENABLED = os.getenv("EMBED_CACHE_ENABLED", "true").lower() == "true"
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", str(Path.home() / ".cache" / "juriaid" / "embeddings.sqlite"))
+EMBED_CACHE_MAX_MB = float(os.getenv("EMBED_CACHE_MAX_MB", "1024"))
+
+# SQLite caps bound parameters per statement; stay well below it
+_SQL_CHUNK = 500
+
+logger = logging.getLogger("embedding_cache")
+
+
+def normalize_text(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+def cache_key(model_name: str, text: str, normalize: bool) -> str:
+    raw = f"{model_name}\x00{int(normalize)}\x00{normalize_text(text)}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding store: (model name, normalized text) -> vector,
+    in one SQLite file that several processes can share (WAL mode). Entries
+    are evicted least-recently-used once the file holds more than max_mb of
+    vectors.
+    """
+    def __init__(self, path: str = EMBED_CACHE_PATH, max_mb: float = EMBED_CACHE_MAX_MB, enabled: bool = EMBED_CACHE_ENABLED):
+        self.path = Path(path)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        # running estimate of stored vector bytes (exact after each eviction pass)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        # opened lazily, and again after a fork (connections must not cross processes)
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    dim INTEGER NOT NULL,
+                    vec BLOB NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings(last_used)")
+            conn.commit()
+            self._bytes = conn.execute("SELECT COALESCE(SUM(LENGTH(vec)), 0) FROM embeddings").fetchone()[0]
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        found = {}
+        with self._lock:
+            db = self._db()
+            for i in range(0, len(keys), _SQL_CHUNK):
+                chunk = list(keys[i:i + _SQL_CHUNK])
+                marks = ",".join("?" * len(chunk))
+                for key, dim, vec in db.execute(f"SELECT key, dim, vec FROM embeddings WHERE key IN ({marks})", chunk):
+                    found[key] = np.frombuffer(vec, dtype=np.float32, count=dim)
+            if found:
+                now = time.time()
+                db.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, k) for k in found])
+                db.commit()
+
+        out = [found.get(k) for k in keys]
+        self.hits += sum(v is not None for v in out)
+        self.misses += sum(v is None for v in out)
+        return out
+
+    def put_many(self, model_name: str, keys: Sequence[str], vectors: np.ndarray):
+        now = time.time()
+        rows = [
+            (k, model_name, int(v.shape[0]), np.ascontiguousarray(v, dtype=np.float32).tobytes(), now)
+            for k, v in zip(keys, vectors)
+        ]
+        with self._lock:
+            db = self._db()
+            db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, dim, vec, last_used) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            db.commit()
+            self._bytes += sum(len(r[3]) for r in rows)
+            if self._bytes > self.max_bytes:
+                self._evict(db)
+
+    def _evict(self, db: sqlite3.Connection):
+        total, count = db.execute("SELECT COALESCE(SUM(LENGTH(vec)), 0), COUNT(*) FROM embeddings").fetchone()
+        self._bytes = total
+        if total <= self.max_bytes or not count:
+            return
+        # drop the least recently used rows down to 90% of the budget
+        excess = total - int(self.max_bytes * 0.9)
+        n = max(1, int(count * excess / total))
+        db.execute(
+            "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+            (n,),
+        )
+        db.commit()
+        self._bytes = db.execute("SELECT COALESCE(SUM(LENGTH(vec)), 0) FROM embeddings").fetchone()[0]
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "path": str(self.path), "hits": self.hits, "misses": self.misses}
+
+    # -----------------------------
+    # Encoding helper
+    # -----------------------------
+    def encode(self, model: Any, model_name: str, texts, normalize_embeddings: bool = False, **encode_kwargs) -> np.ndarray:
+        """
+        Drop-in for model.encode(texts, convert_to_numpy=True, ...): cached
+        vectors are reused, only the misses go to the model (one batched call).
+        A single string returns a 1-D vector, a list a 2-D array.
+        """
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+
+        if not batch:
+            return np.zeros((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+        if not self.enabled:
+            vecs = model.encode(batch, convert_to_numpy=True, normalize_embeddings=normalize_embeddings, **encode_kwargs)
+            return vecs[0] if single else vecs
+
+        keys = [cache_key(model_name, t, normalize_embeddings) for t in batch]
+        try:
+            cached = self.get_many(keys)
+        except sqlite3.Error as e:
+            # an unusable cache file must not take encoding down with it
+            logger.warning("embedding cache disabled (%s): %s", self.path, e)
+            self.enabled = False
+            return self.encode(model, model_name, texts, normalize_embeddings, **encode_kwargs)
+        missing = [i for i, v in enumerate(cached) if v is None]
+
+        if missing:
+            # identical texts in one call are encoded once
+            todo = list(dict.fromkeys(keys[i] for i in missing))
+            first = {}
+            for i in missing:
+                first.setdefault(keys[i], i)
+            fresh = model.encode(
+                [batch[first[k]] for k in todo],
+                convert_to_numpy=True,
+                normalize_embeddings=normalize_embeddings,
+                **encode_kwargs,
+            )
+            fresh = np.asarray(fresh, dtype=np.float32)
+            try:
+                self.put_many(model_name, todo, fresh)
+            except sqlite3.Error as e:
+                logger.warning("embedding cache write failed (%s): %s", self.path, e)
+            by_key = dict(zip(todo, fresh))
+            for i in missing:
+                cached[i] = by_key[keys[i]]
+
+        out = np.stack(cached).astype(np.float32, copy=False)
+        return out[0] if single else out
+
+
+embedding_cache = EmbeddingCache()
@@ -1,6 +1,27 @@
-from sentence_transformers import SentenceTransformer
+from app.embedding_cache import embedding_cache
+from app.model_registry import registry
 
-model = SentenceTransformer("all-MiniLM-L6-v2")
+MODEL_NAME = "all-MiniLM-L6-v2"
 
+
+def _load_model():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(MODEL_NAME)
+
+
+registry.register("minilm", _load_model)
+
+
+def get_model():
+    return registry.get("minilm")
+
+
+# every text encoded here comes from an uploaded document (or the fixed role
+# references), so a re-uploaded PDF is served from the cache
 def generate_embedding(text: str):
-    return model.encode(text).tolist()
\ No newline at end of file
+    return embedding_cache.encode(get_model(), MODEL_NAME, text).tolist()
+
+
+def generate_embeddings(texts):
+    """(n, dim) array for many texts in one batched (cached) encode call."""
+    return embedding_cache.encode(get_model(), MODEL_NAME, list(texts))
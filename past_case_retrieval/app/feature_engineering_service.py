@@ -6,7 +6,7 @@ def citation_similarity(query_id, candidate_id):
     MATCH (q:Case {case_id:$qid})-[:CITES*1..2]->(ref)<-[:CITES*1..2]-(c:Case {case_id:$cid})
     RETURN count(ref) as score
     """
-    result = db.query(query, {"qid": query_id, "cid": candidate_id})
+    result = db.query(query, {"qid": query_id, "cid": candidate_id}, name="citation_similarity")
     count = result[0]["score"] if result else 0
     return min(count / 10, 1)
 
@@ -15,7 +15,7 @@ def legal_issue_similarity(query_id, candidate_id):
     MATCH (q:Case {case_id:$qid})-[:INVOLVES_ISSUE]->(i)<-[:INVOLVES_ISSUE]-(c:Case {case_id:$cid})
     RETURN count(i) as shared
     """
-    result = db.query(query, {"qid": query_id, "cid": candidate_id})
+    result = db.query(query, {"qid": query_id, "cid": candidate_id}, name="legal_issue_similarity")
     count = result[0]["shared"] if result else 0
     return min(count / 5, 1)
 
@@ -1,19 +1,54 @@
+import numpy as np
+
 from app.config import WEIGHTS
 from app.neo4j_driver import db
+from app.case_index import CASE_INDEX_ENABLED, candidate_k, case_index
+
+
+ROLES = ["facts", "issues", "arguments", "decisions"]
+
+MIN_SCORE = 0.50
 
+# role vectors and issue names for every candidate in one round trip
+CANDIDATES_CYPHER = """
+UNWIND $ids AS cid
+MATCH (c:Case {case_id: cid})
+RETURN c.case_id AS case_id,
+       c.issues_embedding AS issues_embedding,
+       c.arguments_embedding AS arguments_embedding,
+       c.decisions_embedding AS decisions_embedding,
+       [(c)-[:INVOLVES_ISSUE]->(i) | i.name] AS issues
+"""
 
-def get_shared_legal_issues(query_issues, candidate_id):
 
-    result = db.query("""
-    MATCH (c:Case {case_id:$cid})-[:INVOLVES_ISSUE]->(i)
-    RETURN collect(i.name) AS issues
-    """, {"cid": candidate_id})
+def fetch_candidates(case_ids):
+    if not case_ids:
+        return {}
+    rows = db.query(CANDIDATES_CYPHER, {"ids": list(case_ids)}, name="candidate_features")
+    return {r["case_id"]: r for r in rows}
 
-    if not result:
-        return []
 
-    candidate_issues = result[0]["issues"]
-    return list(set(query_issues) & set(candidate_issues))
+def cosine_scores(vectors, query):
+    """
+    Cosine of query against each vector (a list with None for missing
+    embeddings); missing or mismatched vectors score 0.
+    """
+    q = np.asarray(query, dtype=np.float64)
+    out = np.zeros(len(vectors), dtype=np.float64)
+    rows = [i for i, v in enumerate(vectors) if v is not None and len(v) == len(q)]
+    q_norm = np.linalg.norm(q)
+    if not rows or not q_norm:
+        return out
+
+    m = np.asarray([vectors[i] for i in rows], dtype=np.float64)
+    norms = np.linalg.norm(m, axis=1)
+    out[rows] = (m @ q) / np.where(norms == 0, np.inf, norms * q_norm)
+    return out
+
+
+def shared_legal_issues(query_issues, candidate_issues):
+    candidate = set(candidate_issues or [])
+    return [i for i in dict.fromkeys(query_issues or []) if i in candidate]
 
 
 def generate_reason(breakdown, shared_issues):
@@ -38,10 +73,10 @@ def generate_reason(breakdown, shared_issues):
     return ". ".join(reasons) + "."
 
 
-def hybrid_search(embeddings, query_issues, limit=3):
-
+def _neo4j_candidates(embeddings, k=20):
+    """Facts vector-index top-k from Neo4j, other roles scored locally (CASE_INDEX_ENABLED=false)."""
     vector_query = """
-    CALL db.index.vector.queryNodes('facts_embedding_index', 20, $facts_embedding)
+    CALL db.index.vector.queryNodes('facts_embedding_index', $k, $facts_embedding)
     YIELD node, score
     RETURN node.case_id AS case_id,
            node.case_name AS case_name,
@@ -50,74 +85,58 @@ def hybrid_search(embeddings, query_issues, limit=3):
     """
 
     results = db.query(vector_query, {
+        "k": k,
         "facts_embedding": embeddings["facts"]
-    })
-
-    final_results = []
+    }, name="facts_vector_search")
 
-    for r in results:
+    features = fetch_candidates([r["case_id"] for r in results])
+    results = [r for r in results if r["case_id"] in features]
 
-        cid = r["case_id"]
+    scores = {
+        role: cosine_scores([features[r["case_id"]][f"{role}_embedding"] for r in results], embeddings[role])
+        for role in ROLES[1:]
+    }
 
-        # ISSUE SIMILARITY
-        issue_score_result = db.query("""
-        MATCH (c:Case {case_id:$id})
-        RETURN gds.similarity.cosine(c.issues_embedding, $embedding) AS score
-        """, {
-            "id": cid,
-            "embedding": embeddings["issues"]
-        })
-
-        issue_score = issue_score_result[0]["score"] if issue_score_result else 0
-
-
-        # ARGUMENT SIMILARITY
-        arg_score_result = db.query("""
-        MATCH (c:Case {case_id:$id})
-        RETURN gds.similarity.cosine(c.arguments_embedding, $embedding) AS score
-        """, {
-            "id": cid,
-            "embedding": embeddings["arguments"]
-        })
+    return [
+        {
+            "case_id": r["case_id"],
+            "case_name": r["case_name"],
+            "summary": r["summary"],
+            "issues": features[r["case_id"]]["issues"],
+            "breakdown": {
+                "facts": r["facts_score"],
+                **{role: float(scores[role][n]) for role in ROLES[1:]}
+            }
+        }
+        for n, r in enumerate(results)
+    ]
 
-        arg_score = arg_score_result[0]["score"] if arg_score_result else 0
 
+def hybrid_search(embeddings, query_issues, limit=3):
 
-        # DECISION SIMILARITY
-        decision_score_result = db.query("""
-        MATCH (c:Case {case_id:$id})
-        RETURN gds.similarity.cosine(c.decisions_embedding, $embedding) AS score
-        """, {
-            "id": cid,
-            "embedding": embeddings["decisions"]
-        })
+    if CASE_INDEX_ENABLED:
+        candidates = case_index.fused_candidates(embeddings, limit, MIN_SCORE)
+    else:
+        candidates = _neo4j_candidates(embeddings, k=candidate_k(limit))
 
-        decision_score = decision_score_result[0]["score"] if decision_score_result else 0
+    final_results = []
 
+    for c in candidates:
 
-        breakdown = {
-            "facts": r["facts_score"],
-            "issues": issue_score,
-            "arguments": arg_score,
-            "decisions": decision_score
-        }
+        cid = c["case_id"]
+        breakdown = c["breakdown"]
 
-        final_score = (
-            WEIGHTS["facts"] * breakdown["facts"] +
-            WEIGHTS["issues"] * breakdown["issues"] +
-            WEIGHTS["arguments"] * breakdown["arguments"] +
-            WEIGHTS["decisions"] * breakdown["decisions"]
-        )
+        final_score = sum(WEIGHTS[role] * breakdown[role] for role in ROLES)
 
-        shared_issues = get_shared_legal_issues(query_issues, cid)
+        shared_issues = shared_legal_issues(query_issues, c["issues"])
 
         reason = generate_reason(breakdown, shared_issues)
 
         final_results.append({
             "case_id": cid,
-            "case_name": r["case_name"],
+            "case_name": c["case_name"],
             "final_score": round(final_score, 4),
-            "judgment_preview": r["summary"][:500] if r["summary"] else "",
+            "judgment_preview": c["summary"][:500] if c["summary"] else "",
             "reason": reason,
             "shared_issues": shared_issues,
             "breakdown": breakdown,
@@ -128,7 +147,7 @@ def hybrid_search(embeddings, query_issues, limit=3):
 
     filtered = [
         r for r in final_results
-        if r["final_score"] >= 0.50
+        if r["final_score"] >= MIN_SCORE
     ]
 
     filtered.sort(key=lambda x: x["final_score"], reverse=True)
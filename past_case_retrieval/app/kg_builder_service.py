@@ -1,25 +1,50 @@
 from app.neo4j_driver import db
+from app.query_metrics import metrics
+from app.case_index import case_index
+
+
+# existence check, case upsert and issue links in one statement; returns no
+# row when the case exists and overwrite is false
+STORE_CASE_CYPHER = """
+OPTIONAL MATCH (existing:Case {case_id: $case_id})
+WITH existing IS NULL AS created
+MERGE (c:Case {case_id: $case_id})
+WITH c, created
+WHERE created OR $overwrite
+SET c += $props
+WITH c, created
+CALL {
+    WITH c
+    UNWIND $issues AS name
+    MERGE (i:LegalIssue {name: name})
+    MERGE (c)-[:INVOLVES_ISSUE]->(i)
+}
+RETURN created
+"""
+
+# only fills a missing file_id; a case that already has its PDF keeps it
+ATTACH_CASE_FILE_CYPHER = """
+MATCH (c:Case {case_id: $case_id})
+WHERE c.file_id IS NULL
+SET c.file_id = $file_id
+RETURN count(c) AS attached
+"""
+
+
+def _store_case_tx(tx, params):
+    records, _ = metrics.run(tx, "store_case", STORE_CASE_CYPHER, params)
+    return bool(records) and records[0]["created"]
 
 
 def store_case(case_id, case_name, roles, embeddings, issues,
                summary=None, complaint=None, defense=None,
-               file_id=None):
-
-    query = """
-    MERGE (c:Case {case_id:$case_id})
-    SET c.case_name=$case_name,
-        c.facts_embedding=$facts_embedding,
-        c.issues_embedding=$issues_embedding,
-        c.arguments_embedding=$arguments_embedding,
-        c.decisions_embedding=$decisions_embedding,
-        c.summary=$summary,
-        c.complaint=$complaint,
-        c.defense=$defense,
-        c.file_id=$file_id
+               file_id=None, overwrite=True):
     """
-
-    db.query(query, {
-        "case_id": case_id,
+    Upsert a case and link its legal issues in a single write transaction.
+    With overwrite=False an existing case is left untouched. Returns True
+    when the case was newly created.
+    """
+    props = {
         "case_name": case_name,
         "facts_embedding": embeddings["facts"],
         "issues_embedding": embeddings["issues"],
@@ -28,17 +53,26 @@ def store_case(case_id, case_name, roles, embeddings, issues,
         "summary": summary,
         "complaint": complaint,
         "defense": defense,
-        "file_id": file_id
+    }
+    if file_id is not None:
+        props["file_id"] = file_id
+
+    issues = [issue.strip() for issue in issues]
+
+    created = db.write(_store_case_tx, {
+        "case_id": case_id,
+        "props": props,
+        "issues": issues,
+        "overwrite": overwrite,
     })
 
-    # Store legal issues
-    for issue in issues:
-        db.query("""
-        MERGE (i:LegalIssue {name:$name})
-        WITH i
-        MATCH (c:Case {case_id:$case_id})
-        MERGE (c)-[:INVOLVES_ISSUE]->(i)
-        """, {
-            "name": issue.strip(),
-            "case_id": case_id
-        })
\ No newline at end of file
+    if created or overwrite:
+        case_index.upsert(case_id, case_name, summary, embeddings, issues)
+
+    return created
+
+
+def attach_case_file(case_id, file_id):
+    """Give an existing case file_id if it has none yet. Returns True when attached."""
+    result = db.query(ATTACH_CASE_FILE_CYPHER, {"case_id": case_id, "file_id": file_id}, name="attach_case_file")
+    return bool(result) and result[0]["attached"] > 0
@@ -1,21 +1,35 @@
+import os
 import re
-import torch
-from transformers import AutoTokenizer, AutoModel
-from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
+
+from app.embedding_cache import embedding_cache
+from app.model_registry import registry
 
 MODEL_NAME = "nlpaueb/legal-bert-base-uncased"
 
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-model = AutoModel.from_pretrained(MODEL_NAME)
+# sentences per forward pass in classify_text
+LEGALBERT_BATCH_SIZE = int(os.getenv("LEGALBERT_BATCH_SIZE", "32"))
+
+
+def _load_legalbert():
+    from transformers import AutoTokenizer, AutoModel
+
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+    model = AutoModel.from_pretrained(MODEL_NAME)
+    model.eval()
+    return tokenizer, model
+
 
-model.eval()
+registry.register("legalbert", _load_legalbert)
 
 
 # --------------------------------
 # Generate embedding using LegalBERT
 # --------------------------------
 def get_embedding(text):
+    import torch
 
+    tokenizer, model = registry.get("legalbert")
     inputs = tokenizer(text, return_tensors="pt", truncation=True, padding=True)
 
     with torch.no_grad():
@@ -26,6 +40,64 @@ def get_embedding(text):
     return embedding
 
 
+def get_embeddings(texts, batch_size=LEGALBERT_BATCH_SIZE):
+    """
+    Mean-pooled LegalBERT embeddings for many texts, same values as
+    get_embedding() per text. Sentences seen before (a re-uploaded case)
+    come from the embedding cache; only the rest run through the model.
+    """
+    tokenizer, model = registry.get("legalbert")
+    if not texts:
+        return np.zeros((0, model.config.hidden_size), dtype=np.float32)
+
+    return embedding_cache.encode(_PooledLegalBert(tokenizer, model), MODEL_NAME, list(texts), batch_size=batch_size)
+
+
+class _PooledLegalBert:
+    """model.encode()-style front over the LegalBERT forward passes, for the embedding cache."""
+
+    def __init__(self, tokenizer, model):
+        self.tokenizer = tokenizer
+        self.model = model
+
+    def get_sentence_embedding_dimension(self):
+        return self.model.config.hidden_size
+
+    def encode(self, texts, convert_to_numpy=True, normalize_embeddings=False, batch_size=LEGALBERT_BATCH_SIZE):
+        """
+        Texts are sorted by token length so each batch pads to a similar
+        length, and padding is masked out of the mean.
+        """
+        import torch
+
+        tokenizer, model = self.tokenizer, self.model
+        encoded = tokenizer(list(texts), truncation=True)
+        input_ids = encoded["input_ids"]
+        order = sorted(range(len(texts)), key=lambda i: len(input_ids[i]))
+
+        out = np.zeros((len(texts), model.config.hidden_size), dtype=np.float32)
+        for start in range(0, len(order), max(1, batch_size)):
+            idx = order[start:start + batch_size]
+            batch = tokenizer.pad(
+                {k: [encoded[k][i] for i in idx] for k in encoded.keys()},
+                return_tensors="pt",
+            )
+
+            with torch.no_grad():
+                hidden = model(**batch).last_hidden_state
+
+            mask = batch["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+            out[idx] = pooled.numpy()
+
+        return _normalize_rows(out) if normalize_embeddings else out
+
+
+def _normalize_rows(m):
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return m / np.where(norms == 0, 1.0, norms)
+
+
 # --------------------------------
 # Reference sentences for classes
 # --------------------------------
@@ -36,40 +108,43 @@ REFERENCE = {
     "decisions": "final decision or judgment of the court"
 }
 
-REFERENCE_EMBEDDINGS = {
-    k: get_embedding(v)
-    for k, v in REFERENCE.items()
-}
+REFERENCE_LABELS = list(REFERENCE)
 
 
-# --------------------------------
-# Classify sentence
-# --------------------------------
-def classify_sentence(sentence):
+def _load_reference_matrix():
+    # labels x dim, unit rows: cosine against every class is one matmul
+    return _normalize_rows(np.stack([get_embedding(REFERENCE[k]) for k in REFERENCE_LABELS]))
 
-    sentence_embedding = get_embedding(sentence)
 
-    scores = {}
+registry.register("legalbert_reference", _load_reference_matrix)
 
-    for label, ref_embedding in REFERENCE_EMBEDDINGS.items():
 
-        score = cosine_similarity(
-            [sentence_embedding],
-            [ref_embedding]
-        )[0][0]
+# --------------------------------
+# Classify sentence
+# --------------------------------
+def classify_embeddings(embeddings):
+    """Role label per row of a (n, dim) embedding matrix."""
+    scores = _normalize_rows(np.asarray(embeddings)) @ registry.get("legalbert_reference").T
+    return [REFERENCE_LABELS[j] for j in scores.argmax(axis=1)]
+
 
-        scores[label] = score
+def classify_sentence(sentence):
 
-    return max(scores, key=scores.get)
+    return classify_embeddings(get_embeddings([sentence]))[0]
 
 
 # --------------------------------
 # Classify full text
 # --------------------------------
-def classify_text(text):
+def split_sentences(text):
 
     sentences = re.split(r'(?<=[.!?])\s+', text)
 
+    return [s for s in sentences if len(s.strip()) >= 20]
+
+
+def classify_text(text):
+
     roles = {
         "facts": [],
         "issues": [],
@@ -77,13 +152,10 @@ def classify_text(text):
         "decisions": []
     }
 
-    for sentence in sentences:
-
-        if len(sentence.strip()) < 20:
-            continue
+    sentences = split_sentences(text)
 
-        role = classify_sentence(sentence)
+    for sentence, role in zip(sentences, classify_embeddings(get_embeddings(sentences))):
 
         roles[role].append(sentence)
 
-    return roles
\ No newline at end of file
+    return roles
@@ -1,25 +1,25 @@
-from fastapi import FastAPI, UploadFile, File
-from fastapi.responses import StreamingResponse
+from fastapi import Depends, FastAPI, File, Header, HTTPException, Request, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
 import uuid
+import hmac
 import os
 import re
 import io
 
-from app.pdf_service import extract_text_from_pdf_bytes
-from app.legalbert_classifier import classify_text
-from app.embedding_service import generate_embedding
-from app.kg_builder_service import store_case
+from app.role_encoder import encode_roles, required_models
+from app.model_registry import MODEL_WARMUP, registry
+from app.case_index import CASE_INDEX_ENABLED, case_index
+from app.kg_builder_service import attach_case_file, store_case
 from app.hybrid_engine import hybrid_search
 from app.neo4j_driver import db
-from app.legal_validator import is_legal_document
-from app.metadata_service import extract_case_name, extract_case_number
-from app.complaint_defense_extractor import extract_complaint_defense
-from app.utils import generate_file_hash, case_exists
+from app.query_metrics import metrics
+from app.pipeline import STAGES, StageOverloaded, encode_stage, io_stage, parse_case, parse_stage
+from app.utils import generate_file_hash, case_exists, case_has_file
 
 from app.legal_issue_extractor import extract_legal_issues
 
 # MongoDB storage
-from app.mongodb_service import upload_case_file, get_case_file
+from app.mongodb_service import upload_case_file, get_case_file, delete_case_file
 
 
 # -------------------------------------------------
@@ -59,6 +59,56 @@ app = FastAPI()
 UPLOAD_DIR = "temp"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# warmup / pipeline / query-metrics need this value in X-Admin-Token;
+# unset, only local callers are allowed
+ADMIN_TOKEN = os.getenv("PAST_CASE_ADMIN_TOKEN", "")
+
+
+def require_admin(request: Request, x_admin_token: str = Header(None)):
+    if ADMIN_TOKEN:
+        if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+            raise HTTPException(status_code=403, detail="Admin token required")
+    elif not request.client or request.client.host not in ("127.0.0.1", "::1", "localhost"):
+        raise HTTPException(status_code=403, detail="Admin routes are local-only unless PAST_CASE_ADMIN_TOKEN is set")
+
+
+@app.exception_handler(StageOverloaded)
+async def stage_overloaded(request, exc: StageOverloaded):
+    return JSONResponse(
+        {"message": "Server is busy, please retry shortly", "stage": exc.stage},
+        status_code=429,
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.on_event("startup")
+def warm_models():
+    # otherwise models load on the first request that needs them
+    if MODEL_WARMUP:
+        registry.warmup(required_models())
+
+
+@app.on_event("startup")
+def load_case_index():
+    if not CASE_INDEX_ENABLED:
+        return
+    try:
+        case_index.ensure_loaded()
+    except Exception as e:
+        # first search retries the load
+        print(f"Case index not loaded at startup: {e}")
+
+
+@app.on_event("shutdown")
+def save_case_index():
+    case_index.save()
+
+
+@app.on_event("shutdown")
+def stop_pipeline():
+    for stage in STAGES:
+        stage.shutdown()
+
 
 # --------------------------------
 # HEALTH CHECK
@@ -71,12 +121,64 @@ def root():
 @app.get("/health")
 def health():
     try:
-        db.query("RETURN 1")
+        db.query("RETURN 1", name="health_ping")
         return {"database": "connected"}
     except Exception as e:
         return {"database": "error", "message": str(e)}
 
 
+@app.get("/health/ready")
+def ready():
+    status = registry.status(required_models())
+    status["case_index"] = case_index.stats()
+    if CASE_INDEX_ENABLED and not status["case_index"]["loaded"]:
+        status["ready"] = False
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+@app.post("/admin/warmup", dependencies=[Depends(require_admin)])
+def warmup():
+    return registry.warmup(required_models())
+
+
+@app.get("/admin/pipeline", dependencies=[Depends(require_admin)])
+def pipeline_stats():
+    return {stage.name: stage.stats() for stage in STAGES}
+
+
+@app.get("/admin/query-metrics", dependencies=[Depends(require_admin)])
+def query_metrics(reset: bool = False):
+    snapshot = metrics.snapshot()
+    if reset:
+        metrics.reset()
+    return snapshot
+
+
+# --------------------------------
+# STORE CASE WITH ITS PDF
+# --------------------------------
+async def store_case_with_file(case_id, file_bytes, **case):
+    """
+    Upload the PDF to GridFS, then store the case with its file_id so a
+    committed case always has its file. An existing case is left as it is:
+    it takes the upload only if it has no file yet, otherwise the upload is
+    deleted. Returns True when the case was newly created.
+    """
+    file_id = await io_stage.run(upload_case_file, case_id, file_bytes)
+
+    try:
+        created = await io_stage.run(store_case, case_id=case_id, file_id=file_id, overwrite=False, **case)
+        kept = created or await io_stage.run(attach_case_file, case_id, file_id)
+    except Exception:
+        await io_stage.run(delete_case_file, file_id)
+        raise
+
+    if not kept:
+        await io_stage.run(delete_case_file, file_id)
+
+    return created
+
+
 # --------------------------------
 # ADMIN: STORE CASE IN KG
 # --------------------------------
@@ -88,57 +190,45 @@ async def build_kg(file: UploadFile = File(...)):
     case_id = generate_file_hash(file_bytes)
 
     # prevent duplicates
-    if case_exists(case_id):
+    if await io_stage.run(case_exists, case_id):
         return {
             "message": "Case already exists in Knowledge Graph",
             "case_id": case_id,
             "case_stored": False
         }
 
-    text = extract_text_from_pdf_bytes(file_bytes)
+    parsed = await parse_stage.run(parse_case, file_bytes)
+    text = parsed["text"]
 
-    if not is_legal_document(text):
+    if not parsed["is_legal"]:
         return {
             "message": "Uploaded file is not a valid legal document",
             "case_stored": False
         }
 
-    case_number = extract_case_number(text)
-    case_name = extract_case_name(text)
-
-    display_name = f"{case_number} - {case_name}"
-
-    complaint_text, defense_text = extract_complaint_defense(text)
+    display_name = f"{parsed['case_number']} - {parsed['case_name']}"
 
-    roles = classify_text(text)
-
-    embeddings = {
-        r: generate_embedding(" ".join(roles[r]))
-        for r in ["facts", "issues", "arguments", "decisions"]
-    }
+    roles, embeddings = await encode_stage.run(encode_roles, text)
 
     issues = list(set(roles["issues"]))[:5]
 
-    # store PDF in MongoDB
-    file_id = upload_case_file(case_id, file_bytes)
-
-    # store metadata in Neo4j
-    store_case(
-        case_id=case_id,
+    # store PDF in MongoDB and metadata in Neo4j
+    created = await store_case_with_file(
+        case_id,
+        file_bytes,
         case_name=display_name,
         roles=roles,
         embeddings=embeddings,
         issues=issues,
         summary=text,
-        complaint=complaint_text,
-        defense=defense_text,
-        file_id=file_id
+        complaint=parsed["complaint"],
+        defense=parsed["defense"]
     )
 
     return {
-        "message": "Case stored in Knowledge Graph",
+        "message": "Case stored in Knowledge Graph" if created else "Case already exists in Knowledge Graph",
         "case_id": case_id,
-        "case_stored": True
+        "case_stored": created
     }
 
 
@@ -152,48 +242,36 @@ async def search(file: UploadFile = File(...)):
 
     case_id = generate_file_hash(file_bytes)
 
-    text = extract_text_from_pdf_bytes(file_bytes)
+    parsed = await parse_stage.run(parse_case, file_bytes)
+    text = parsed["text"]
 
-    case_number = extract_case_number(text)
-    case_name = extract_case_name(text)
-
-    display_name = f"{case_number} - {case_name}"
-
-    if not is_legal_document(text):
+    if not parsed["is_legal"]:
         return {
             "message": "Uploaded file is not a legal case document",
             "similar_cases": []
         }
 
-    complaint_text, defense_text = extract_complaint_defense(text)
+    display_name = f"{parsed['case_number']} - {parsed['case_name']}"
 
-    roles = classify_text(text)
+    roles, embeddings = await encode_stage.run(encode_roles, text)
 
-    embeddings = {
-        r: generate_embedding(" ".join(roles[r]))
-        for r in ["facts", "issues", "arguments", "decisions"]
-    }
-
-    
     issues = roles["issues"][:5]
 
-    results = hybrid_search(embeddings, issues)
-
-    # store new case if not exist
-    if not case_exists(case_id):
-
-        file_id = upload_case_file(case_id, file_bytes)
+    results = await io_stage.run(hybrid_search, embeddings, issues)
 
-        store_case(
-            case_id=case_id,
+    # store new case if not exist; a stored case that already has its PDF
+    # is left alone, so repeat searches never touch GridFS
+    if not await io_stage.run(case_has_file, case_id):
+        await store_case_with_file(
+            case_id,
+            file_bytes,
             case_name=display_name,
             roles=roles,
             embeddings=embeddings,
             issues=issues,
             summary=text,
-            complaint=complaint_text,
-            defense=defense_text,
-            file_id=file_id
+            complaint=parsed["complaint"],
+            defense=parsed["defense"]
         )
 
     return {
@@ -215,7 +293,7 @@ def get_case(case_id: str):
            c.summary AS judgment,
            c.complaint AS complaint,
            c.defense AS defense
-    """, {"id": case_id})
+    """, {"id": case_id}, name="case_detail")
 
     if not result:
         return {"message": "Case not found"}
@@ -246,7 +324,7 @@ def view_case(case_id: str):
     result = db.query("""
     MATCH (c:Case {case_id:$id})
     RETURN c.file_id AS file_id
-    """, {"id": case_id})
+    """, {"id": case_id}, name="case_file_id")
 
     if not result:
         return {"message": "Case not found"}
@@ -265,24 +343,19 @@ async def search_more(file: UploadFile = File(...)):
 
     file_bytes = await file.read()
 
-    text = extract_text_from_pdf_bytes(file_bytes)
+    parsed = await parse_stage.run(parse_case, file_bytes, details=False)
 
-    if not is_legal_document(text):
+    if not parsed["is_legal"]:
         return {
             "message": "Uploaded file is not a legal case document",
             "similar_cases": []
         }
 
-    roles = classify_text(text)
-
-    embeddings = {
-        r: generate_embedding(" ".join(roles[r]))
-        for r in ["facts", "issues", "arguments", "decisions"]
-    }
+    roles, embeddings = await encode_stage.run(encode_roles, parsed["text"])
 
     issues = roles["issues"][:5]
 
-    results = hybrid_search(embeddings, issues, limit=6)
+    results = await io_stage.run(hybrid_search, embeddings, issues, limit=6)
 
     formatted_results = []
 
@@ -0,0 +1,103 @@
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+# worker processes behind this service (uvicorn --workers reads the same variable)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+# torch intra-op threads per process; unset -> cores split evenly across the workers
+TORCH_NUM_THREADS = int(os.getenv("TORCH_NUM_THREADS", "0")) or max(1, (os.cpu_count() or 1) // max(1, WEB_CONCURRENCY))
+# load the models the service needs at startup instead of on the first request
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "false").lower() == "true"
+
+logger = logging.getLogger("model_registry")
+
+
+class ModelRegistry:
+    """
+    Process-wide, lazily loaded models. Modules register a loader by name at
+    import time (cheap); the first get() of a name loads it once and every
+    caller shares the same instance afterwards.
+    """
+
+    def __init__(self, num_threads: int = TORCH_NUM_THREADS):
+        self.num_threads = num_threads
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._load_ms: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._threads_pid: Optional[int] = None
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        with self._lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+
+    def configure_threads(self):
+        # once per process, before the first model runs (a forked worker sets its own)
+        if self._threads_pid == os.getpid():
+            return
+        self._threads_pid = os.getpid()
+        if not self.num_threads:
+            return
+        try:
+            import torch
+            torch.set_num_threads(self.num_threads)
+        except ImportError:
+            pass
+
+    def get(self, name: str) -> Any:
+        if name in self._models:
+            return self._models[name]
+        if name not in self._loaders:
+            raise KeyError(f"No model registered under {name!r}")
+
+        # per-name lock: a loader may get() another model without deadlocking
+        with self._locks[name]:
+            if name not in self._models:
+                self.configure_threads()
+                start = time.perf_counter()
+                try:
+                    model = self._loaders[name]()
+                except Exception as e:
+                    self._errors[name] = str(e)
+                    raise
+                self._load_ms[name] = round((time.perf_counter() - start) * 1000, 1)
+                self._errors.pop(name, None)
+                self._models[name] = model
+                logger.info("model %s loaded in %.0f ms", name, self._load_ms[name])
+        return self._models[name]
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def warmup(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Load the given (default: all registered) models; failures are reported, not raised."""
+        for name in list(names if names is not None else self._loaders):
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.warning("model %s failed to load: %s", name, e)
+        return self.status(names)
+
+    def status(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        names = list(names if names is not None else self._loaders)
+        return {
+            "ready": all(self.is_loaded(n) for n in names),
+            "torch_threads": self.num_threads,
+            "models": {
+                n: {
+                    "loaded": self.is_loaded(n),
+                    "load_ms": self._load_ms.get(n),
+                    "error": self._errors.get(n),
+                }
+                for n in names
+            },
+        }
+
+
+registry = ModelRegistry()
@@ -26,4 +26,9 @@ def get_case_file(file_id):
 
     file = fs.get(ObjectId(file_id))
 
-    return file.read()
\ No newline at end of file
+    return file.read()
+
+
+def delete_case_file(file_id):
+
+    fs.delete(ObjectId(file_id))
@@ -1,5 +1,6 @@
 from neo4j import GraphDatabase
 from app.config import NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD
+from app.query_metrics import metrics
 
 
 class Neo4jConnection:
@@ -10,10 +11,20 @@ class Neo4jConnection:
             max_connection_lifetime=300
         )
 
-    def query(self, query, parameters=None):
+    def query(self, query, parameters=None, name=None):
         with self.driver.session(database="neo4j") as session:
-            result = session.run(query, parameters)
-            return [record.data() for record in result]
+            records, _ = metrics.run(session, name or _query_name(query), query, parameters)
+            return [record.data() for record in records]
+
+    def write(self, work, *args, **kwargs):
+        """work(tx, *args) in one managed write transaction, retried on transient errors."""
+        with self.driver.session(database="neo4j") as session:
+            return session.execute_write(work, *args, **kwargs)
+
+
+def _query_name(query: str) -> str:
+    # unnamed queries are grouped by their collapsed first 60 characters
+    return " ".join(query.split())[:60]
 
 
-db = Neo4jConnection()
\ No newline at end of file
+db = Neo4jConnection()
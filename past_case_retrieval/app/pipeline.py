@@ -0,0 +1,134 @@
+import os
+import asyncio
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, Optional
+
+from app.pdf_service import extract_text_from_pdf_bytes
+from app.legal_validator import is_legal_document
+from app.metadata_service import extract_case_name, extract_case_number
+from app.complaint_defense_extractor import extract_complaint_defense
+
+
+# PDF parsing processes (0 = run it on threads instead)
+PIPELINE_PDF_WORKERS = int(os.getenv("PIPELINE_PDF_WORKERS", "2"))
+# concurrent model passes; torch already spreads each one over TORCH_NUM_THREADS
+PIPELINE_ENCODE_CONCURRENCY = int(os.getenv("PIPELINE_ENCODE_CONCURRENCY", "1"))
+# concurrent Neo4j / MongoDB calls
+PIPELINE_IO_CONCURRENCY = int(os.getenv("PIPELINE_IO_CONCURRENCY", "8"))
+# requests allowed to wait for a busy stage before it answers 429
+PIPELINE_QUEUE_LIMIT = int(os.getenv("PIPELINE_QUEUE_LIMIT", "16"))
+
+
+class StageOverloaded(Exception):
+    def __init__(self, stage: str):
+        super().__init__(f"{stage} stage is at capacity")
+        self.stage = stage
+
+
+class Stage:
+    """
+    Runs blocking work off the event loop: at most `concurrency` calls in
+    the executor at once, at most `queue_limit` more waiting for a slot.
+    Beyond that run() raises StageOverloaded instead of queueing.
+    """
+
+    def __init__(self, name: str, make_executor: Callable[[], Executor], concurrency: int, queue_limit: int = PIPELINE_QUEUE_LIMIT):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.queue_limit = queue_limit
+        self._make_executor = make_executor
+        self._executor: Optional[Executor] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+        self.active = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._make_executor()
+        return self._executor
+
+    async def run(self, fn, *args, **kwargs) -> Any:
+        # created here so it binds to the serving event loop
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.concurrency)
+
+        if self._sem.locked() and self.waiting >= self.queue_limit:
+            self.rejected += 1
+            raise StageOverloaded(self.name)
+
+        self.waiting += 1
+        try:
+            await self._sem.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+        finally:
+            self.active -= 1
+            self.completed += 1
+            self._sem.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "queue_limit": self.queue_limit,
+            "active": self.active,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _pdf_executor() -> Executor:
+    if PIPELINE_PDF_WORKERS <= 0:
+        # PyMuPDF is not thread-safe: one parse at a time
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf")
+    # spawned workers import only this module's light dependencies, never the models
+    return ProcessPoolExecutor(max_workers=PIPELINE_PDF_WORKERS, mp_context=get_context("spawn"))
+
+
+parse_stage = Stage("parse", _pdf_executor, max(PIPELINE_PDF_WORKERS, 1))
+encode_stage = Stage(
+    "encode",
+    lambda: ThreadPoolExecutor(max_workers=PIPELINE_ENCODE_CONCURRENCY, thread_name_prefix="encode"),
+    PIPELINE_ENCODE_CONCURRENCY,
+)
+io_stage = Stage(
+    "io",
+    lambda: ThreadPoolExecutor(max_workers=PIPELINE_IO_CONCURRENCY, thread_name_prefix="io"),
+    PIPELINE_IO_CONCURRENCY,
+)
+
+STAGES = [parse_stage, encode_stage, io_stage]
+
+
+# --------------------------------
+# CPU-bound parsing (runs in the parse stage's processes)
+# --------------------------------
+def parse_case(file_bytes: bytes, details: bool = True) -> Dict[str, Any]:
+    """PDF text plus the regex-derived fields the endpoints need."""
+    text = extract_text_from_pdf_bytes(file_bytes)
+    parsed = {"text": text, "is_legal": is_legal_document(text)}
+
+    if details and parsed["is_legal"]:
+        complaint, defense = extract_complaint_defense(text)
+        parsed.update({
+            "case_number": extract_case_number(text),
+            "case_name": extract_case_name(text),
+            "complaint": complaint,
+            "defense": defense,
+        })
+    return parsed
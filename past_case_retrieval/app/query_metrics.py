@@ -0,0 +1,186 @@
+# Kept identical to LawStatKG/backend/app/query_metrics.py: each service is built from its own
+# directory, so the module is copied rather than shared. Change both together.
+import os
+import re
+import time
+import logging
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from neo4j import Query
+
+
+slow_logger = logging.getLogger("cypher.slow")
+
+SLOW_QUERY_MS = float(os.getenv("CYPHER_SLOW_QUERY_MS", "500"))
+# re-run slow *read* queries with PROFILE and log the plan (never writes)
+PROFILE_SLOW_QUERIES = os.getenv("CYPHER_PROFILE_SLOW", "false").lower() == "true"
+
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+# keywords, not property names or parameters that happen to be spelled the same
+_WRITE_RE = re.compile(r"(?<![.$])\b(CREATE|MERGE|SET|DELETE|REMOVE|DROP|LOAD\s+CSV|CALL\s+db\.create)\b", re.IGNORECASE)
+# comments, string literals and `quoted` names are blanked before matching
+_NON_CODE_RE = re.compile(r"//[^\n]*|/\*.*?\*/|'(?:\\.|[^'\\])*'|\"(?:\\.|[^\"\\])*\"|`[^`]*`", re.DOTALL)
+
+
+class _Stat:
+    def __init__(self):
+        self.count = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.available_after_ms = 0
+        self.consumed_after_ms = 0
+        self.slow = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def as_dict(self) -> Dict[str, Any]:
+        labels = [f"le_{b}" for b in LATENCY_BUCKETS_MS] + ["le_inf"]
+        n = max(self.count, 1)
+        return {
+            "count": self.count,
+            "rows": self.rows,
+            "slow": self.slow,
+            "mean_ms": round(self.total_ms / n, 2),
+            "max_ms": round(self.max_ms, 2),
+            "p50_ms": self._quantile(0.50),
+            "p95_ms": self._quantile(0.95),
+            "server_available_after_ms": round(self.available_after_ms / n, 2),
+            "server_consumed_after_ms": round(self.consumed_after_ms / n, 2),
+            "histogram": dict(zip(labels, self.buckets)),
+        }
+
+    def _quantile(self, q: float) -> Optional[float]:
+        # upper bucket bound containing the q-th observation
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for i, c in enumerate(self.buckets):
+            seen += c
+            if seen >= target:
+                return float(LATENCY_BUCKETS_MS[i]) if i < len(LATENCY_BUCKETS_MS) else round(self.max_ms, 2)
+        return round(self.max_ms, 2)
+
+
+class QueryMetrics:
+    """Per-query-name latency histograms, row counts and server timings."""
+
+    def __init__(self, slow_ms: float = SLOW_QUERY_MS, profile_slow: bool = PROFILE_SLOW_QUERIES):
+        self.slow_ms = slow_ms
+        self.profile_slow = profile_slow
+        self._stats: Dict[str, _Stat] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, elapsed_ms: float, rows: int, summary=None) -> bool:
+        available = getattr(summary, "result_available_after", None) or 0
+        consumed = getattr(summary, "result_consumed_after", None) or 0
+        is_slow = elapsed_ms >= self.slow_ms
+
+        with self._lock:
+            st = self._stats.setdefault(name, _Stat())
+            st.count += 1
+            st.rows += rows
+            st.total_ms += elapsed_ms
+            st.max_ms = max(st.max_ms, elapsed_ms)
+            st.available_after_ms += available
+            st.consumed_after_ms += consumed
+            st.buckets[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+            if is_slow:
+                st.slow += 1
+
+        if is_slow:
+            slow_logger.warning(
+                "slow cypher %s: %.1f ms, %d rows (server available_after=%s ms, consumed_after=%s ms)",
+                name, elapsed_ms, rows, available, consumed
+            )
+        return is_slow
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "slow_query_ms": self.slow_ms,
+                "queries": {name: st.as_dict() for name, st in sorted(self._stats.items())},
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def report(self) -> str:
+        lines = []
+        for name, st in self.snapshot()["queries"].items():
+            lines.append(
+                f"{name:<32} n={st['count']:<6} rows={st['rows']:<8} "
+                f"mean={st['mean_ms']}ms p95<={st['p95_ms']}ms max={st['max_ms']}ms"
+            )
+        return "\n".join(lines)
+
+    # -----------------------------
+    # Execution helpers
+    # -----------------------------
+    def run(self, runner, name: str, cypher, parameters: Optional[Dict[str, Any]] = None, **params) -> Tuple[List[Any], Any]:
+        """
+        Run on a session or transaction, fully consume the result and record it.
+        Returns (records, summary).
+        """
+        start = time.perf_counter()
+        result = runner.run(_as_query(cypher), parameters, **params)
+        records = list(result)
+        summary = result.consume()
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+        if self.record(name, elapsed_ms, len(records), summary) and self._should_profile(cypher):
+            self._log_profile(name, runner.run(_profile_query(cypher), parameters, **params).consume())
+        return records, summary
+
+    async def run_async(self, runner, name: str, cypher, parameters: Optional[Dict[str, Any]] = None, **params) -> Tuple[List[Any], Any]:
+        start = time.perf_counter()
+        result = await runner.run(_as_query(cypher), parameters, **params)
+        records = [r async for r in result]
+        summary = await result.consume()
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+        if self.record(name, elapsed_ms, len(records), summary) and self._should_profile(cypher):
+            profiled = await runner.run(_profile_query(cypher), parameters, **params)
+            self._log_profile(name, await profiled.consume())
+        return records, summary
+
+    def _should_profile(self, cypher) -> bool:
+        return self.profile_slow and not is_write(cypher)
+
+    def _log_profile(self, name: str, summary):
+        plan = getattr(summary, "profile", None)
+        if plan:
+            slow_logger.warning("PROFILE %s:\n%s", name, format_plan(plan))
+
+
+def is_write(cypher) -> bool:
+    return bool(_WRITE_RE.search(_NON_CODE_RE.sub(" ", _text(cypher))))
+
+
+def _text(cypher) -> str:
+    return cypher.text if isinstance(cypher, Query) else cypher
+
+
+def _as_query(cypher) -> Query:
+    return cypher if isinstance(cypher, Query) else Query(cypher)
+
+
+def _profile_query(cypher) -> Query:
+    return Query("PROFILE " + _text(cypher), timeout=getattr(cypher, "timeout", None))
+
+
+def format_plan(plan: Dict[str, Any], depth: int = 0) -> str:
+    args = plan.get("args") or {}
+    line = "  " * depth + (
+        f"{plan.get('operatorType')} rows={plan.get('rows')} dbHits={plan.get('dbHits')}"
+        f" {args.get('Details', '')}".rstrip()
+    )
+    children = [format_plan(c, depth + 1) for c in plan.get("children") or []]
+    return "\n".join([line] + children)
+
+
+metrics = QueryMetrics()
@@ -0,0 +1,93 @@
+import os
+import numpy as np
+
+from app.legalbert_classifier import (
+    REFERENCE,
+    classify_embeddings,
+    classify_text,
+    get_embeddings,
+    split_sentences,
+)
+from app.embedding_service import generate_embedding, generate_embeddings
+from app.model_registry import registry
+
+ROLES = ["facts", "issues", "arguments", "decisions"]
+
+# "split":  LegalBERT labels sentences, MiniLM embeds each role's joined text (two models)
+# "single": one encoder embeds every sentence once; labels and role vectors both come from it
+ROLE_ENCODER_MODE = os.getenv("ROLE_ENCODER_MODE", "split").lower()
+# encoder behind "single" mode: "minilm" keeps the 384-d role vectors already in the graph,
+# "legalbert" gives 768-d ones (stored cases and the facts vector index must be rebuilt)
+ROLE_ENCODER = os.getenv("ROLE_ENCODER", "minilm").lower()
+
+
+def _unit(v):
+    n = np.linalg.norm(v)
+    return v / n if n else v
+
+
+def _load_minilm_reference():
+    return np.stack([_unit(v) for v in generate_embeddings([REFERENCE[r] for r in ROLES])])
+
+
+registry.register("minilm_reference", _load_minilm_reference)
+
+
+def required_models():
+    """Registry names encode_roles() touches under the configured mode."""
+    if ROLE_ENCODER_MODE != "single":
+        return ["legalbert", "legalbert_reference", "minilm"]
+    if ROLE_ENCODER == "legalbert":
+        return ["legalbert", "legalbert_reference"]
+    return ["minilm", "minilm_reference"]
+
+
+def _encode_sentences(sentences):
+    """(sentence vectors, role label per sentence) from the configured single encoder."""
+    if ROLE_ENCODER == "legalbert":
+        vecs = get_embeddings(sentences)
+        return vecs, classify_embeddings(vecs)
+
+    vecs = generate_embeddings(sentences)
+    if not len(vecs):
+        return vecs, []
+    units = vecs / np.maximum(np.linalg.norm(vecs, axis=1, keepdims=True), 1e-12)
+    labels = [ROLES[j] for j in (units @ registry.get("minilm_reference").T).argmax(axis=1)]
+    return vecs, labels
+
+
+def _empty_role_embedding():
+    # what the split path stores for a role with no sentences
+    if ROLE_ENCODER == "legalbert":
+        return get_embeddings([""])[0]
+    return generate_embeddings([""])[0]
+
+
+def encode_roles(text):
+    """
+    Role-segmented sentences and one embedding per role for a case text.
+    Returns (roles, embeddings) in the shape store_case / hybrid_search expect.
+    """
+    if ROLE_ENCODER_MODE != "single":
+        roles = classify_text(text)
+        embeddings = {
+            r: generate_embedding(" ".join(roles[r]))
+            for r in ROLES
+        }
+        return roles, embeddings
+
+    sentences = split_sentences(text)
+    vecs, labels = _encode_sentences(sentences)
+
+    roles = {r: [] for r in ROLES}
+    members = {r: [] for r in ROLES}
+    for i, (sentence, role) in enumerate(zip(sentences, labels)):
+        roles[role].append(sentence)
+        members[role].append(i)
+
+    # role vector = mean of its sentence vectors (unit length, like MiniLM output)
+    embeddings = {
+        r: (_unit(vecs[members[r]].mean(axis=0)) if members[r] else _empty_role_embedding()).tolist()
+        for r in ROLES
+    }
+    return roles, embeddings
@@ -16,6 +16,19 @@ def case_exists(case_id: str) -> bool:
     result = db.query("""
     MATCH (c:Case {case_id:$id})
     RETURN c.case_id AS case_id
-    """, {"id": case_id})
+    """, {"id": case_id}, name="case_exists")
 
-    return len(result) > 0
\ No newline at end of file
+    return len(result) > 0
+
+
+# ----------------------------------------
+# Check if case exists with its PDF attached
+# ----------------------------------------
+def case_has_file(case_id: str) -> bool:
+    result = db.query("""
+    MATCH (c:Case {case_id:$id})
+    WHERE c.file_id IS NOT NULL
+    RETURN c.case_id AS case_id
+    """, {"id": case_id}, name="case_has_file")
+
+    return len(result) > 0